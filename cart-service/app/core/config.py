@@ -1,6 +1,6 @@
 import os
 import secrets
-from typing import Optional
+from typing import Literal, Optional
 from functools import lru_cache
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from yarl import URL
@@ -34,10 +34,44 @@ class Settings(BaseSettings):
 
     # Logging settings
     LOG_LEVEL: LogLevel = LogLevel.INFO
+    # JSON lines instead of text
+    LOG_JSON: bool = False
+    # Format and write records from a background thread, dropping records
+    # while LOG_QUEUE_SIZE of them are waiting
+    LOG_ENQUEUE: bool = True
+    LOG_QUEUE_SIZE: int = 10000
+    # Debug and info records let through per second and call site, with
+    # bursts of LOG_RATE_BURST (0 disables the limit)
+    LOG_RATE_LIMIT: float = 50.0
+    LOG_RATE_BURST: int = 100
+
+    # Tracing settings (TRACING_EXPORTER is none, console, file or otlp)
+    TRACING_EXPORTER: str = "none"
+    TRACING_SERVICE_NAME: str = "cart-service"
+    TRACING_SAMPLE_RATIO: float = 1.0
+    TRACING_FILE_PATH: str = "/tmp/cart-service-traces.jsonl"
+    TRACING_OTLP_ENDPOINT: str = "http://localhost:4318/v1/traces"
+
+    # Startup settings: each phase gets STARTUP_PHASE_TIMEOUT seconds per
+    # attempt and STARTUP_RETRIES more attempts, waiting STARTUP_RETRY_BACKOFF
+    # seconds before the first retry and twice as long before each next one,
+    # up to STARTUP_RETRY_BACKOFF_MAX
+    STARTUP_PHASE_TIMEOUT: float = 30.0
+    STARTUP_RETRIES: int = 5
+    STARTUP_RETRY_BACKOFF: float = 0.5
+    STARTUP_RETRY_BACKOFF_MAX: float = 10.0
+    # Seconds each /readyz dependency check may take
+    READINESS_TIMEOUT: float = 2.0
 
     # Price Service gRPC settings
     PRICE_SERVICE_GRPC_HOST: str = "localhost"
     PRICE_SERVICE_GRPC_PORT: int = 50051
+    # Cart prices are fetched with one GetPrices call per PRICE_BATCH_SIZE
+    # products, at most PRICE_FETCH_CONCURRENCY calls at once, each given
+    # PRICE_FETCH_TIMEOUT seconds
+    PRICE_BATCH_SIZE: int = 1000
+    PRICE_FETCH_CONCURRENCY: int = 4
+    PRICE_FETCH_TIMEOUT: float = 2.0
 
     # MongoDB settings
     MONGODB_SCHEME: str
@@ -47,6 +81,18 @@ class Settings(BaseSettings):
     MONGODB_PORT: Optional[int] = 27017
     MONGODB_DB: str
     MONGODB_URI: Optional[str] = None
+    # Client options; MONGODB_COMPRESSORS is a comma-separated list of zstd,
+    # snappy and zlib, in order of preference (zstd and snappy need the
+    # zstandard and python-snappy packages)
+    MONGODB_MAX_POOL_SIZE: int = 100
+    MONGODB_MIN_POOL_SIZE: int = 0
+    MONGODB_MAX_IDLE_TIME_MS: Optional[int] = None
+    MONGODB_COMPRESSORS: str = ""
+    MONGODB_READ_PREFERENCE: Literal[
+        "primary", "primaryPreferred", "secondary", "secondaryPreferred", "nearest"
+    ] = "primary"
+    # Log the plans of the hot queries at startup, flagging collection scans
+    MONGODB_QUERY_PLAN_REPORT: bool = True
 
     model_config = SettingsConfigDict(env_file=".env")
 
@@ -2,32 +2,72 @@ from loguru import logger
 from fastapi import FastAPI
 from motor.motor_asyncio import AsyncIOMotorClient
 from beanie import init_beanie
-from typing import AsyncGenerator
+from typing import Any, AsyncGenerator, Dict
 
 from app.core.config import settings
+from app.core.instrumentation import MongoCommandListener
+from app.core.query_plans import HotQuery, report_query_plans
 from app.models import Cart
 
+HOT_QUERIES = [
+    HotQuery("cart by user", Cart, {"user_id": 0}),
+]
+
+
+def mongo_client_options() -> Dict[str, Any]:
+    """MongoDB client pool, compression and read preference options."""
+    options: Dict[str, Any] = {
+        "maxPoolSize": settings.MONGODB_MAX_POOL_SIZE,
+        "minPoolSize": settings.MONGODB_MIN_POOL_SIZE,
+        "maxIdleTimeMS": settings.MONGODB_MAX_IDLE_TIME_MS,
+        "readPreference": settings.MONGODB_READ_PREFERENCE,
+    }
+    if settings.MONGODB_COMPRESSORS:
+        options["compressors"] = settings.MONGODB_COMPRESSORS
+    return options
+
 
 async def init_db(app: FastAPI) -> None:
     """
     Connect to MongoDB via Motor, initialize Beanie with our Document models.
 
+    Beanie creates the indexes the models declare and are missing, and fails
+    if one exists with other options.
+
     Args:
         app (FastAPI): FastAPI application instance.
     """
     client = AsyncIOMotorClient(
         settings.mongodb_url,
+        event_listeners=[MongoCommandListener()],
+        **mongo_client_options(),
     )
 
-    await init_beanie(
-        database=client.get_default_database(),
-        document_models=[Cart],  # list all your Document classes here
-    )
+    try:
+        await init_beanie(
+            database=client.get_default_database(),
+            document_models=[Cart],  # list all your Document classes here
+        )
+        if settings.MONGODB_QUERY_PLAN_REPORT:
+            await report_query_plans(HOT_QUERIES)
+    except BaseException:
+        client.close()
+        raise
 
     app.state.mongo_client = client
     logger.info("Connected to MongoDB.")
 
 
+async def check_db(app: FastAPI) -> None:
+    """
+    Ping MongoDB.
+
+    Args:
+        app (FastAPI): FastAPI application instance.
+    """
+    await app.state.mongo_client.admin.command("ping")
+
+
 async def close_db(app: FastAPI) -> None:
     """
     Closes database connection pool.
@@ -1,17 +1,40 @@
+import asyncio
+import time
+
 import grpc
+from fastapi import FastAPI
 from loguru import logger
 from functools import lru_cache
+from prometheus_client import Histogram
+from typing import Dict, List, Optional
 
 from app.core.config import settings
-from app.proto import price_pb2, price_pb2_grpc
+from app.core.instrumentation import GrpcClientMetricsInterceptor
+from app.core.tracing import GrpcClientTracingInterceptor
+from app.proto import inventory_pb2, inventory_pb2_grpc, price_pb2, price_pb2_grpc
+
+PRICE_FETCH_SIZE = Histogram(
+    "cart_price_fetch_products",
+    "Number of distinct products whose prices are fetched at once.",
+    buckets=(1, 2, 5, 10, 20, 50, 100, 200, 500, 1000),
+)
+PRICE_FETCH_DURATION = Histogram(
+    "cart_price_fetch_seconds",
+    "Time taken to fetch the prices of a cart, every batch included.",
+)
 
 
 class GrpcClient:
     def __init__(self):
         self._channel = grpc.aio.insecure_channel(
-            f"{settings.PRICE_SERVICE_GRPC_HOST}:{settings.PRICE_SERVICE_GRPC_PORT}"
+            f"{settings.PRICE_SERVICE_GRPC_HOST}:{settings.PRICE_SERVICE_GRPC_PORT}",
+            interceptors=[
+                GrpcClientTracingInterceptor(),
+                GrpcClientMetricsInterceptor(),
+            ],
         )
         self._price_stub = price_pb2_grpc.PriceServiceStub(self._channel)
+        self._inventory_stub = inventory_pb2_grpc.InventoryServiceStub(self._channel)
         logger.info("Connected to GRPC price service.")
 
     async def get_price(self, product_id: str) -> float:
@@ -26,7 +49,8 @@ class GrpcClient:
         """
         try:
             response = await self._price_stub.GetPrice(
-                price_pb2.GetPriceRequest(product_id=product_id)
+                price_pb2.PriceRequest(product_id=product_id),
+                timeout=settings.PRICE_FETCH_TIMEOUT,
             )
             return response.price
         except grpc.aio.AioRpcError as e:
@@ -35,6 +59,114 @@ class GrpcClient:
             )
             return None
 
+    async def _get_price_batch(
+        self, product_ids: List[str], limit: asyncio.Semaphore
+    ) -> Dict[str, float]:
+        async with limit:
+            try:
+                response = await self._price_stub.GetPrices(
+                    price_pb2.PricesRequest(product_ids=product_ids),
+                    timeout=settings.PRICE_FETCH_TIMEOUT,
+                )
+            except grpc.aio.AioRpcError as e:
+                logger.error(
+                    f"gRPC error while fetching the prices of {len(product_ids)} "
+                    f"products: {e.details()}"
+                )
+                return {}
+        return {price.product_id: price.price for price in response.prices}
+
+    async def get_prices(self, product_ids: List[str]) -> Dict[str, float]:
+        """
+        Fetch the prices of several products using gRPC.
+
+        The products are fetched with one GetPrices call per
+        `PRICE_BATCH_SIZE` of them, at most `PRICE_FETCH_CONCURRENCY` calls
+        at once, each bounded by `PRICE_FETCH_TIMEOUT` seconds.
+
+        Args:
+            product_ids (List[str]): The IDs of the products.
+
+        Returns:
+            Dict[str, float]: The prices by product ID. Products that do not
+                exist, or whose batch failed, are left out.
+        """
+        product_ids = list(dict.fromkeys(product_ids))
+        if not product_ids:
+            return {}
+
+        PRICE_FETCH_SIZE.observe(len(product_ids))
+        started = time.perf_counter()
+        limit = asyncio.Semaphore(settings.PRICE_FETCH_CONCURRENCY)
+        size = settings.PRICE_BATCH_SIZE
+        batches = await asyncio.gather(
+            *(
+                self._get_price_batch(product_ids[start : start + size], limit)
+                for start in range(0, len(product_ids), size)
+            )
+        )
+        PRICE_FETCH_DURATION.observe(time.perf_counter() - started)
+
+        prices: Dict[str, float] = {}
+        for batch in batches:
+            prices.update(batch)
+        return prices
+
+    async def reserve_stock(
+        self, quantities: Dict[str, int], ttl_seconds: int = 0
+    ) -> Optional[List[inventory_pb2.Reservation]]:
+        """
+        Reserve units of several products, all or nothing, using gRPC.
+
+        Args:
+            quantities (Dict[str, int]): Units to reserve by product ID.
+            ttl_seconds (int): Seconds before the units are released
+                automatically; 0 uses the product service default.
+
+        Returns:
+            Optional[List[inventory_pb2.Reservation]]: The reservations, or
+                None if they could not be made.
+        """
+        try:
+            response = await self._inventory_stub.Reserve(
+                inventory_pb2.ReserveRequest(
+                    items=[
+                        inventory_pb2.ReserveItem(
+                            product_id=product_id, quantity=quantity
+                        )
+                        for product_id, quantity in quantities.items()
+                    ],
+                    ttl_seconds=ttl_seconds,
+                )
+            )
+            return list(response.reservations)
+        except grpc.aio.AioRpcError as e:
+            logger.error(f"gRPC error while reserving stock: {e.details()}")
+            return None
+
+    async def release_reservations(self, reservation_ids: List[str]) -> List[str]:
+        """
+        Release stock reservations using gRPC.
+
+        Args:
+            reservation_ids (List[str]): The reservations to release.
+
+        Returns:
+            List[str]: The IDs of the reservations actually released.
+        """
+        try:
+            response = await self._inventory_stub.Release(
+                inventory_pb2.ReleaseRequest(reservation_ids=reservation_ids)
+            )
+            return list(response.reservation_ids)
+        except grpc.aio.AioRpcError as e:
+            logger.error(f"gRPC error while releasing reservations: {e.details()}")
+            return []
+
+    async def wait_until_ready(self):
+        """Wait until the GRPC channel is connected, connecting if needed."""
+        await self._channel.channel_ready()
+
     async def close(self):
         """Close the GRPC channel."""
         await self._channel.close()
@@ -44,3 +176,33 @@ class GrpcClient:
 def get_grpc_client() -> GrpcClient:
     """Get a singleton instance of the GRPC client."""
     return GrpcClient()
+
+
+async def init_grpc_client(app: FastAPI) -> None:
+    """
+    Create the GRPC client. The channel connects on first use.
+
+    Args:
+        app (FastAPI): FastAPI application instance.
+    """
+    get_grpc_client()
+
+
+async def check_grpc_client(app: FastAPI) -> None:
+    """
+    Wait until the GRPC channel is connected.
+
+    Args:
+        app (FastAPI): FastAPI application instance.
+    """
+    await get_grpc_client().wait_until_ready()
+
+
+async def close_grpc_client(app: FastAPI) -> None:
+    """
+    Close the GRPC channel.
+
+    Args:
+        app (FastAPI): FastAPI application instance.
+    """
+    await get_grpc_client().close()
@@ -0,0 +1,63 @@
+"""
+Latency metrics for every hop a request makes past the HTTP layer.
+
+The metric names are the same in every service, so one dashboard breaks
+down the p99 of any of them; each service only carries the integrations
+for the clients it uses.
+"""
+
+import time
+
+import grpc
+from prometheus_client import Histogram
+from pymongo import monitoring
+
+MONGODB_COMMAND_DURATION = Histogram(
+    "mongodb_command_duration_seconds",
+    "MongoDB command latency by command and result.",
+    ["command", "result"],
+)
+GRPC_CLIENT_DURATION = Histogram(
+    "grpc_client_handling_seconds",
+    "gRPC client call latency by method and status code.",
+    ["method", "code"],
+)
+
+
+class MongoCommandListener(monitoring.CommandListener):
+    """
+    Records the duration of every MongoDB command, as measured by the
+    driver. Pass it in `event_listeners` when creating the client.
+    """
+
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        pass
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        MONGODB_COMMAND_DURATION.labels(
+            command=event.command_name, result="ok"
+        ).observe(event.duration_micros / 1e6)
+
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        MONGODB_COMMAND_DURATION.labels(
+            command=event.command_name, result="error"
+        ).observe(event.duration_micros / 1e6)
+
+
+class GrpcClientMetricsInterceptor(grpc.aio.UnaryUnaryClientInterceptor):
+    """Times every unary call made on the channel, until its status is known."""
+
+    async def intercept_unary_unary(self, continuation, client_call_details, request):
+        method = client_call_details.method
+        if isinstance(method, bytes):
+            method = method.decode()
+        started = time.perf_counter()
+        call = await continuation(client_call_details, request)
+        try:
+            code = (await call.code()).name
+        except Exception:
+            code = "CANCELLED"
+        GRPC_CLIENT_DURATION.labels(method=method, code=code).observe(
+            time.perf_counter() - started
+        )
+        return call
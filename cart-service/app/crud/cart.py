@@ -31,14 +31,14 @@ async def add_item_to_cart(
 ) -> Optional[Cart]:
     cart = await get_or_create_cart(user_id)
 
-    grpc_client = get_grpc_client()
-    price = await grpc_client.get_price(product_id)
+    prices = await get_grpc_client().get_prices([product_id])
+    price = prices.get(product_id)
 
     if price is None:
         raise ValueError(f"Could not fetch price for product {product_id}")
 
     existing_item = next(
-        (item for item in cart.items if product_id == product_id), None
+        (item for item in cart.items if item.product_id == product_id), None
     )
 
     if existing_item:
@@ -81,10 +81,9 @@ async def update_item_quantity(
     if not item:
         return None
 
-    grpc_client = get_grpc_client()
-    price = await grpc_client.get_price(product_id)
-    if price is not None:
-        item.price = price
+    prices = await get_grpc_client().get_prices([product_id])
+    if product_id in prices:
+        item.price = prices[product_id]
 
     item.quantity = new_quantity
     cart.calculate_total_price()
@@ -104,14 +103,18 @@ async def clear_cart(user_id: str) -> Cart:
 async def refresh_cart(user_id: str) -> Optional[Cart]:
     """
     Refresh the cart by recalculating the total price and updating item prices.
+
+    The prices of every item are fetched at once. Items whose price could
+    not be fetched keep their previous price.
     """
     cart = await get_or_create_cart(user_id)
 
-    grpc_client = get_grpc_client()
+    prices = await get_grpc_client().get_prices(
+        [item.product_id for item in cart.items]
+    )
     for item in cart.items:
-        price = await grpc_client.get_price(item.product_id)
-        if price is not None:
-            item.price = price
+        if item.product_id in prices:
+            item.price = prices[item.product_id]
 
     cart.calculate_total_price()
     await cart.save()
@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+# Generated by the protocol buffer compiler.  DO NOT EDIT!
+# NO CHECKED-IN PROTOBUF GENCODE
+# source: inventory.proto
+# Protobuf Python Version: 6.31.0
+"""Generated protocol buffer code."""
+from google.protobuf import descriptor as _descriptor
+from google.protobuf import descriptor_pool as _descriptor_pool
+from google.protobuf import runtime_version as _runtime_version
+from google.protobuf import symbol_database as _symbol_database
+from google.protobuf.internal import builder as _builder
+_runtime_version.ValidateProtobufRuntimeVersion(
+    _runtime_version.Domain.PUBLIC,
+    6,
+    31,
+    0,
+    '',
+    'inventory.proto'
+)
+# @@protoc_insertion_point(imports)
+
+_sym_db = _symbol_database.Default()
+
+
+
+
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x0finventory.proto\x12\tinventory\"3\n\x0bReserveItem\x12\x12\n\nproduct_id\x18\x01 \x01(\t\x12\x10\n\x08quantity\x18\x02 \x01(\x05\"L\n\x0eReserveRequest\x12%\n\x05items\x18\x01 \x03(\x0b\x32\x16.inventory.ReserveItem\x12\x13\n\x0bttl_seconds\x18\x02 \x01(\x05\"_\n\x0bReservation\x12\x16\n\x0ereservation_id\x18\x01 \x01(\t\x12\x12\n\nproduct_id\x18\x02 \x01(\t\x12\x10\n\x08quantity\x18\x03 \x01(\x05\x12\x12\n\nexpires_at\x18\x04 \x01(\x03\"?\n\x0fReserveResponse\x12,\n\x0creservations\x18\x01 \x03(\x0b\x32\x16.inventory.Reservation\")\n\x0eReleaseRequest\x12\x17\n\x0freservation_ids\x18\x01 \x03(\t\"*\n\x0fReleaseResponse\x12\x17\n\x0freservation_ids\x18\x01 \x03(\t\"(\n\rCommitRequest\x12\x17\n\x0freservation_ids\x18\x01 \x03(\t\")\n\x0e\x43ommitResponse\x12\x17\n\x0freservation_ids\x18\x01 \x03(\t2\xd5\x01\n\x10InventoryService\x12@\n\x07Reserve\x12\x19.inventory.ReserveRequest\x1a\x1a.inventory.ReserveResponse\x12@\n\x07Release\x12\x19.inventory.ReleaseRequest\x1a\x1a.inventory.ReleaseResponse\x12=\n\x06\x43ommit\x12\x18.inventory.CommitRequest\x1a\x19.inventory.CommitResponseb\x06proto3')
+
+_globals = globals()
+_builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
+_builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'inventory_pb2', _globals)
+if not _descriptor._USE_C_DESCRIPTORS:
+  DESCRIPTOR._loaded_options = None
+  _globals['_RESERVEITEM']._serialized_start=30
+  _globals['_RESERVEITEM']._serialized_end=81
+  _globals['_RESERVEREQUEST']._serialized_start=83
+  _globals['_RESERVEREQUEST']._serialized_end=159
+  _globals['_RESERVATION']._serialized_start=161
+  _globals['_RESERVATION']._serialized_end=256
+  _globals['_RESERVERESPONSE']._serialized_start=258
+  _globals['_RESERVERESPONSE']._serialized_end=321
+  _globals['_RELEASEREQUEST']._serialized_start=323
+  _globals['_RELEASEREQUEST']._serialized_end=364
+  _globals['_RELEASERESPONSE']._serialized_start=366
+  _globals['_RELEASERESPONSE']._serialized_end=408
+  _globals['_COMMITREQUEST']._serialized_start=410
+  _globals['_COMMITREQUEST']._serialized_end=450
+  _globals['_COMMITRESPONSE']._serialized_start=452
+  _globals['_COMMITRESPONSE']._serialized_end=493
+  _globals['_INVENTORYSERVICE']._serialized_start=496
+  _globals['_INVENTORYSERVICE']._serialized_end=709
+# @@protoc_insertion_point(module_scope)
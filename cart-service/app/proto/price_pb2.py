@@ -24,7 +24,7 @@ _sym_db = _symbol_database.Default()
 
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x0bprice.proto\x12\x05price\"\"\n\x0cPriceRequest\x12\x12\n\nproduct_id\x18\x01 \x01(\t\"\x1e\n\rPriceResponse\x12\r\n\x05price\x18\x02 \x01(\x02\x32\x45\n\x0cPriceService\x12\x35\n\x08GetPrice\x12\x13.price.PriceRequest\x1a\x14.price.PriceResponseb\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x0bprice.proto\x12\x05price\"\"\n\x0cPriceRequest\x12\x12\n\nproduct_id\x18\x01 \x01(\t\"\x1e\n\rPriceResponse\x12\r\n\x05price\x18\x02 \x01(\x02\"$\n\rPricesRequest\x12\x13\n\x0bproduct_ids\x18\x01 \x03(\t\"1\n\x0cProductPrice\x12\x12\n\nproduct_id\x18\x01 \x01(\t\x12\r\n\x05price\x18\x02 \x01(\x02\"F\n\x0ePricesResponse\x12#\n\x06prices\x18\x01 \x03(\x0b\x32\x13.price.ProductPrice\x12\x0f\n\x07missing\x18\x02 \x03(\t\"<\n\x12WatchPricesRequest\x12\x11\n\tsubscribe\x18\x01 \x03(\t\x12\x13\n\x0bunsubscribe\x18\x02 \x03(\t\"A\n\x0bPriceUpdate\x12\x12\n\nproduct_id\x18\x01 \x01(\t\x12\r\n\x05price\x18\x02 \x01(\x02\x12\x0f\n\x07\x64\x65leted\x18\x03 \x01(\x08\x32\xc1\x01\n\x0cPriceService\x12\x35\n\x08GetPrice\x12\x13.price.PriceRequest\x1a\x14.price.PriceResponse\x12\x38\n\tGetPrices\x12\x14.price.PricesRequest\x1a\x15.price.PricesResponse\x12@\n\x0bWatchPrices\x12\x19.price.WatchPricesRequest\x1a\x12.price.PriceUpdate(\x01\x30\x01\x62\x06proto3')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
@@ -35,6 +35,16 @@ if not _descriptor._USE_C_DESCRIPTORS:
   _globals['_PRICEREQUEST']._serialized_end=56
   _globals['_PRICERESPONSE']._serialized_start=58
   _globals['_PRICERESPONSE']._serialized_end=88
-  _globals['_PRICESERVICE']._serialized_start=90
-  _globals['_PRICESERVICE']._serialized_end=159
+  _globals['_PRICESREQUEST']._serialized_start=90
+  _globals['_PRICESREQUEST']._serialized_end=126
+  _globals['_PRODUCTPRICE']._serialized_start=128
+  _globals['_PRODUCTPRICE']._serialized_end=177
+  _globals['_PRICESRESPONSE']._serialized_start=179
+  _globals['_PRICESRESPONSE']._serialized_end=249
+  _globals['_WATCHPRICESREQUEST']._serialized_start=251
+  _globals['_WATCHPRICESREQUEST']._serialized_end=311
+  _globals['_PRICEUPDATE']._serialized_start=313
+  _globals['_PRICEUPDATE']._serialized_end=378
+  _globals['_PRICESERVICE']._serialized_start=381
+  _globals['_PRICESERVICE']._serialized_end=574
 # @@protoc_insertion_point(module_scope)
@@ -1,6 +1,8 @@
+from google.protobuf.internal import containers as _containers
 from google.protobuf import descriptor as _descriptor
 from google.protobuf import message as _message
-from typing import ClassVar as _ClassVar, Optional as _Optional
+from collections.abc import Iterable as _Iterable, Mapping as _Mapping
+from typing import ClassVar as _ClassVar, Optional as _Optional, Union as _Union
 
 DESCRIPTOR: _descriptor.FileDescriptor
 
@@ -15,3 +17,43 @@ class PriceResponse(_message.Message):
     PRICE_FIELD_NUMBER: _ClassVar[int]
     price: float
     def __init__(self, price: _Optional[float] = ...) -> None: ...
+
+class PricesRequest(_message.Message):
+    __slots__ = ("product_ids",)
+    PRODUCT_IDS_FIELD_NUMBER: _ClassVar[int]
+    product_ids: _containers.RepeatedScalarFieldContainer[str]
+    def __init__(self, product_ids: _Optional[_Iterable[str]] = ...) -> None: ...
+
+class ProductPrice(_message.Message):
+    __slots__ = ("product_id", "price")
+    PRODUCT_ID_FIELD_NUMBER: _ClassVar[int]
+    PRICE_FIELD_NUMBER: _ClassVar[int]
+    product_id: str
+    price: float
+    def __init__(self, product_id: _Optional[str] = ..., price: _Optional[float] = ...) -> None: ...
+
+class PricesResponse(_message.Message):
+    __slots__ = ("prices", "missing")
+    PRICES_FIELD_NUMBER: _ClassVar[int]
+    MISSING_FIELD_NUMBER: _ClassVar[int]
+    prices: _containers.RepeatedCompositeFieldContainer[ProductPrice]
+    missing: _containers.RepeatedScalarFieldContainer[str]
+    def __init__(self, prices: _Optional[_Iterable[_Union[ProductPrice, _Mapping]]] = ..., missing: _Optional[_Iterable[str]] = ...) -> None: ...
+
+class WatchPricesRequest(_message.Message):
+    __slots__ = ("subscribe", "unsubscribe")
+    SUBSCRIBE_FIELD_NUMBER: _ClassVar[int]
+    UNSUBSCRIBE_FIELD_NUMBER: _ClassVar[int]
+    subscribe: _containers.RepeatedScalarFieldContainer[str]
+    unsubscribe: _containers.RepeatedScalarFieldContainer[str]
+    def __init__(self, subscribe: _Optional[_Iterable[str]] = ..., unsubscribe: _Optional[_Iterable[str]] = ...) -> None: ...
+
+class PriceUpdate(_message.Message):
+    __slots__ = ("product_id", "price", "deleted")
+    PRODUCT_ID_FIELD_NUMBER: _ClassVar[int]
+    PRICE_FIELD_NUMBER: _ClassVar[int]
+    DELETED_FIELD_NUMBER: _ClassVar[int]
+    product_id: str
+    price: float
+    deleted: bool
+    def __init__(self, product_id: _Optional[str] = ..., price: _Optional[float] = ..., deleted: bool = ...) -> None: ...
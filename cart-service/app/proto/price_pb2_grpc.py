@@ -43,6 +43,18 @@ class PriceServiceStub(object):
             response_deserializer=price__pb2.PriceResponse.FromString,
             _registered_method=True,
         )
+        self.GetPrices = channel.unary_unary(
+            "/price.PriceService/GetPrices",
+            request_serializer=price__pb2.PricesRequest.SerializeToString,
+            response_deserializer=price__pb2.PricesResponse.FromString,
+            _registered_method=True,
+        )
+        self.WatchPrices = channel.stream_stream(
+            "/price.PriceService/WatchPrices",
+            request_serializer=price__pb2.WatchPricesRequest.SerializeToString,
+            response_deserializer=price__pb2.PriceUpdate.FromString,
+            _registered_method=True,
+        )
 
 
 class PriceServiceServicer(object):
@@ -54,6 +66,20 @@ class PriceServiceServicer(object):
         context.set_details("Method not implemented!")
         raise NotImplementedError("Method not implemented!")
 
+    def GetPrices(self, request, context):
+        """Prices of several products in one call."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details("Method not implemented!")
+        raise NotImplementedError("Method not implemented!")
+
+    def WatchPrices(self, request_iterator, context):
+        """Send subscription changes, receive the current price of each newly
+        watched product followed by every change to a watched product.
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details("Method not implemented!")
+        raise NotImplementedError("Method not implemented!")
+
 
 def add_PriceServiceServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -62,6 +88,16 @@ def add_PriceServiceServicer_to_server(servicer, server):
             request_deserializer=price__pb2.PriceRequest.FromString,
             response_serializer=price__pb2.PriceResponse.SerializeToString,
         ),
+        "GetPrices": grpc.unary_unary_rpc_method_handler(
+            servicer.GetPrices,
+            request_deserializer=price__pb2.PricesRequest.FromString,
+            response_serializer=price__pb2.PricesResponse.SerializeToString,
+        ),
+        "WatchPrices": grpc.stream_stream_rpc_method_handler(
+            servicer.WatchPrices,
+            request_deserializer=price__pb2.WatchPricesRequest.FromString,
+            response_serializer=price__pb2.PriceUpdate.SerializeToString,
+        ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
         "price.PriceService", rpc_method_handlers
@@ -103,3 +139,63 @@ class PriceService(object):
             metadata,
             _registered_method=True,
         )
+
+    @staticmethod
+    def GetPrices(
+        request,
+        target,
+        options=(),
+        channel_credentials=None,
+        call_credentials=None,
+        insecure=False,
+        compression=None,
+        wait_for_ready=None,
+        timeout=None,
+        metadata=None,
+    ):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            "/price.PriceService/GetPrices",
+            price__pb2.PricesRequest.SerializeToString,
+            price__pb2.PricesResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True,
+        )
+
+    @staticmethod
+    def WatchPrices(
+        request_iterator,
+        target,
+        options=(),
+        channel_credentials=None,
+        call_credentials=None,
+        insecure=False,
+        compression=None,
+        wait_for_ready=None,
+        timeout=None,
+        metadata=None,
+    ):
+        return grpc.experimental.stream_stream(
+            request_iterator,
+            target,
+            "/price.PriceService/WatchPrices",
+            price__pb2.WatchPricesRequest.SerializeToString,
+            price__pb2.PriceUpdate.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True,
+        )
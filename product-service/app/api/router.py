@@ -1,5 +1,6 @@
 from fastapi import APIRouter
-from app.api.v1 import product
+from app.api.v1 import product, reservation
 
 v1_router = APIRouter()
 v1_router.include_router(product.router, prefix="/products", tags=["Products"])
+v1_router.include_router(reservation.router, prefix="/products", tags=["Reservations"])
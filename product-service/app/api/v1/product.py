@@ -1,53 +1,291 @@
-from aio_pika import Channel
-from fastapi import APIRouter, Depends, BackgroundTasks, HTTPException
+import os
+import tempfile
+from datetime import datetime
+from typing import AsyncIterator, List, Optional, Union
+
+import orjson
+from fastapi import (
+    APIRouter,
+    Depends,
+    BackgroundTasks,
+    Header,
+    HTTPException,
+    Query,
+    UploadFile,
+)
+from fastapi.responses import Response, StreamingResponse
 from redis.asyncio import Redis
 
-from app.schemas.product import ProductCreate, ProductUpdate, ProductRead
+from app.core.config import settings
+from app.core.pagination import encode_cursor, decode_cursor
+from app.core.responses import (
+    conditional_json_response,
+    etag_matches,
+    not_modified_response,
+    raw_json_response,
+)
+from app.schemas.product import (
+    ProductCreate,
+    ProductUpdate,
+    ProductRead,
+    ProductBatchRequest,
+    ProductBatchResponse,
+    ProductPage,
+    ProductBulkRequest,
+    ProductBulkResponse,
+    ProductImportReport,
+    ProductFacets,
+    dump_product_json,
+)
 from app.crud import product as product_crud
+from app.importer.importer import ImportFormat, ProductImporter, detect_format
 
 from app.redis.dependency import get_redis
-from app.redis.cache import set_product_cache, get_product_cache, delete_product_cache
-from app.rabbitmq.dependency import get_rabbit_channel
-from app.rabbitmq.publisher import publish_message
+from app.redis.stampede import get_or_load_product_cache
+from app.redis.cache import (
+    get_product_etag,
+    set_product_cache,
+    delete_product_cache,
+    delete_product_cache_many,
+    get_product_cache_many,
+    set_product_cache_many,
+)
+from app.redis.facets import get_facets
+from app.redis.prices import publish_price_changes
 
 router = APIRouter()
 
 
+async def _get_products_page(
+    after: str, limit: int, category: Optional[str] = None
+) -> ProductPage:
+    """
+    Fetch one keyset-paginated page, asking for one extra product to find
+    out whether another page follows.
+    """
+    try:
+        after_id = decode_cursor(after)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    products = await product_crud.get_products_after(
+        limit=limit + 1, after=after_id, category=category
+    )
+    next_cursor = None
+    if len(products) > limit:
+        products = products[:limit]
+        next_cursor = encode_cursor(products[-1].id)
+
+    return ProductPage(
+        products=[ProductRead.model_validate(product) for product in products],
+        next_cursor=next_cursor,
+    )
+
+
 @router.get("/", summary="Get all products")
-async def get_all_products(skip: int = 0, limit: int = 100) -> list[ProductRead]:
+async def get_all_products(
+    skip: int = 0,
+    limit: int = Query(100, gt=0),
+    after: Optional[str] = Query(
+        None, description="Pagination cursor; pass an empty value for the first page"
+    ),
+) -> Union[ProductPage, list[ProductRead]]:
     """
     Retrieve all products with pagination.
 
     - **skip**: Number of products to skip (default is 0).
     - **limit**: Maximum number of products to return (default is 100).
+    - **after**: Cursor returned as `next_cursor` by the previous page. When
+      given (even empty), cursor pagination is used and `skip` is ignored.
     """
+    if after is not None:
+        return await _get_products_page(after, limit)
+
     products = await product_crud.get_all_products(skip=skip, limit=limit)
     return products
 
 
-@router.get("/{product_id}", summary="Get product by ID")
+async def _get_products_batch(
+    product_ids: List[str],
+    background_tasks: BackgroundTasks,
+    redis: Redis,
+) -> Response:
+    """
+    Resolve a list of product IDs with one Redis MGET and, for the misses,
+    one Mongo `$in` query. Misses are written back to the cache in a single
+    pipeline after the response is sent.
+
+    The cache holds each product as it is sent to clients, so the response
+    body is spliced together from the cached payloads without parsing them.
+    """
+    if len(product_ids) > settings.PRODUCT_BATCH_MAX_SIZE:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {settings.PRODUCT_BATCH_MAX_SIZE} IDs can be requested at once",
+        )
+
+    unique_ids = list(dict.fromkeys(product_ids))
+    cached_products = await get_product_cache_many(redis, unique_ids)
+
+    found: dict[str, str] = {}
+    misses: List[str] = []
+    for product_id, cached_product in zip(unique_ids, cached_products):
+        if cached_product:
+            found[product_id] = cached_product
+        else:
+            misses.append(product_id)
+
+    if misses:
+        products = await product_crud.get_products_by_ids(misses)
+        to_cache: dict[str, str] = {}
+        for product in products:
+            to_cache[str(product.id)] = dump_product_json(product)
+        found.update(to_cache)
+        background_tasks.add_task(set_product_cache_many, redis, to_cache)
+
+    products_json = ",".join(found[i] for i in product_ids if i in found)
+    missing_json = orjson.dumps([i for i in unique_ids if i not in found]).decode()
+    return raw_json_response(
+        f'{{"products":[{products_json}],"missing":{missing_json}}}'
+    )
+
+
+@router.get(
+    "/batch",
+    summary="Get several products by ID",
+    response_model=ProductBatchResponse,
+)
+async def get_products_batch(
+    background_tasks: BackgroundTasks,
+    ids: List[str] = Query(..., description="Product IDs, repeated or comma separated"),
+    redis: Redis = Depends(get_redis),
+) -> Response:
+    """
+    Retrieve several products in one request, keeping the requested order.
+
+    - **ids**: The IDs of the products to retrieve, either repeated
+      (`?ids=a&ids=b`) or comma separated (`?ids=a,b`).
+    """
+    product_ids = [i for raw in ids for i in raw.split(",") if i]
+    return await _get_products_batch(product_ids, background_tasks, redis)
+
+
+@router.post(
+    "/batch",
+    summary="Get several products by ID",
+    response_model=ProductBatchResponse,
+)
+async def post_products_batch(
+    request: ProductBatchRequest,
+    background_tasks: BackgroundTasks,
+    redis: Redis = Depends(get_redis),
+) -> Response:
+    """
+    Retrieve several products in one request, keeping the requested order.
+    Use this variant for lists too long to fit in a query string.
+
+    - **request**: The IDs of the products to retrieve.
+    """
+    return await _get_products_batch(request.ids, background_tasks, redis)
+
+
+async def _export_ndjson(
+    batch_size: int, category: Optional[str], updated_since: Optional[datetime]
+) -> AsyncIterator[bytes]:
+    """Encode each batch of exported documents as newline-delimited JSON."""
+    async for documents in product_crud.iter_product_export(
+        batch_size, category=category, updated_since=updated_since
+    ):
+        yield b"".join(
+            orjson.dumps(
+                {"id": str(document.pop("_id")), **document},
+                option=orjson.OPT_NAIVE_UTC
+                | orjson.OPT_UTC_Z
+                | orjson.OPT_APPEND_NEWLINE,
+            )
+            for document in documents
+        )
+
+
+@router.get("/export", summary="Export the catalog as NDJSON")
+async def export_products(
+    category: Optional[str] = Query(None, description="Only export this category"),
+    updated_since: Optional[datetime] = Query(
+        None, description="Only export products updated at or after this time"
+    ),
+    batch_size: int = Query(
+        1000, gt=0, le=10000, description="Documents fetched per cursor batch"
+    ),
+) -> StreamingResponse:
+    """
+    Stream every product as one JSON object per line.
+
+    Products are read straight off a database cursor and written out batch by
+    batch, so the whole catalog is never held in memory.
+
+    - **category**: Only export products of this category.
+    - **updated_since**: Only export products updated at or after this time.
+    - **batch_size**: Number of products fetched per cursor batch.
+    """
+    return StreamingResponse(
+        _export_ndjson(batch_size, category, updated_since),
+        media_type="application/x-ndjson",
+    )
+
+
+@router.get("/facets", summary="Get product counts by category, tag and price band")
+async def get_product_facets(redis: Redis = Depends(get_redis)) -> ProductFacets:
+    """
+    Get the number of products in each category, with each tag and in each
+    price band.
+
+    The counts are kept up to date by the writes and recomputed from the
+    catalog periodically, so answering reads a few Redis hashes instead of
+    scanning the products.
+    """
+    return ProductFacets(**await get_facets(redis))
+
+
+async def _load_product(product_id: str) -> Optional[str]:
+    """Load a product from the database, serialized for the cache."""
+    product = await product_crud.get_product_by_id(product_id)
+    if not product:
+        return None
+    return dump_product_json(product)
+
+
+@router.get(
+    "/{product_id}",
+    summary="Get product by ID",
+    response_model=ProductRead,
+    responses={304: {"description": "The product has not changed"}},
+)
 async def get_product_by_id(
     product_id: str,
-    background_tasks: BackgroundTasks,
     redis: Redis = Depends(get_redis),
-) -> ProductRead:
+    if_none_match: Optional[str] = Header(None),
+) -> Response:
     """
     Retrieve a product by its ID.
 
+    The cached payload is sent as-is, without being parsed or re-validated,
+    together with its ETag. When `If-None-Match` matches the cached ETag, an
+    empty 304 is returned straight from the cache.
+
     - **product_id**: The ID of the product to retrieve.
     """
-    cached_product = await get_product_cache(redis, product_id)
-    if cached_product:
-        return ProductRead.model_validate_json(cached_product)
+    if if_none_match:
+        etag = await get_product_etag(redis, product_id)
+        if etag and etag_matches(if_none_match, etag):
+            return not_modified_response(etag)
 
-    product = await product_crud.get_product_by_id(product_id)
-    if not product:
+    cached_product = await get_or_load_product_cache(redis, product_id, _load_product)
+    if not cached_product:
         raise HTTPException(status_code=404, detail="Product not found")
 
-    background_tasks.add_task(
-        set_product_cache, redis, product_id, product.model_dump_json()
+    return conditional_json_response(
+        cached_product.data, if_none_match, cached_product.etag
     )
-    return product
 
 
 @router.post("/", summary="Create a new product")
@@ -55,35 +293,123 @@ async def create_product(
     product: ProductCreate,
     background_tasks: BackgroundTasks,
     redis: Redis = Depends(get_redis),
-    rabbit_channel: Channel = Depends(get_rabbit_channel),
 ) -> ProductRead:
     """
     Create a new product.
 
     - **product**: The product data to create.
     """
-    new_product = await product_crud.create_product(product)
+    new_product = await product_crud.create_product(product, redis)
 
     background_tasks.add_task(
-        set_product_cache, redis, new_product.id, new_product.model_dump_json()
+        set_product_cache,
+        redis,
+        new_product.id,
+        dump_product_json(new_product),
+        broadcast=True,
     )
     background_tasks.add_task(
-        publish_message,
-        rabbit_channel,
-        "product.created",
-        new_product.model_dump_json(),
+        publish_price_changes, redis, {str(new_product.id): new_product.price}
     )
 
     return new_product
 
 
+@router.post("/bulk", summary="Create, update and delete products in bulk")
+async def bulk_write_products(
+    request: ProductBulkRequest,
+    background_tasks: BackgroundTasks,
+    redis: Redis = Depends(get_redis),
+) -> ProductBulkResponse:
+    """
+    Apply many create, update and delete operations at once.
+
+    Operations are written in chunks of `PRODUCT_BULK_CHUNK_SIZE` with one
+    unordered `bulk_write` each, recording the product events of the chunk
+    in the outbox in the same transaction. The cache is updated per chunk,
+    in batches, after the response is sent.
+
+    - **request**: The operations to apply.
+    """
+    operations = request.operations
+    if len(operations) > settings.PRODUCT_BULK_MAX_SIZE:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {settings.PRODUCT_BULK_MAX_SIZE} operations can be sent at once",
+        )
+
+    results = []
+    chunk_size = settings.PRODUCT_BULK_CHUNK_SIZE
+    for offset in range(0, len(operations), chunk_size):
+        chunk_results, written = await product_crud.bulk_write_products(
+            operations[offset : offset + chunk_size], offset=offset, redis=redis
+        )
+        results.extend(chunk_results)
+
+        to_cache: dict[str, str] = {}
+        deleted_ids: List[str] = []
+        prices: dict[str, Optional[float]] = {}
+        for result in chunk_results:
+            if result.status in ("created", "updated"):
+                product = written[result.id]
+                to_cache[result.id] = dump_product_json(product)
+                prices[result.id] = product.price
+            elif result.status == "deleted":
+                deleted_ids.append(result.id)
+                prices[result.id] = None
+
+        background_tasks.add_task(
+            set_product_cache_many, redis, to_cache, broadcast=True
+        )
+        background_tasks.add_task(delete_product_cache_many, redis, deleted_ids)
+        background_tasks.add_task(publish_price_changes, redis, prices)
+
+    return ProductBulkResponse(results=results)
+
+
+@router.post("/import", summary="Import a product catalog")
+async def import_products(
+    file: UploadFile,
+    format: Optional[ImportFormat] = Query(
+        None, description="Input format; guessed from the file name when omitted"
+    ),
+    redis: Redis = Depends(get_redis),
+) -> ProductImportReport:
+    """
+    Import a CSV or NDJSON catalog, streaming it in validated chunks.
+
+    Rejected rows are written, with their row number and the reason, to an
+    NDJSON file under `PRODUCT_IMPORT_REJECTS_DIR` reported as `rejects_file`.
+    The `product.created` events of the imported products go through the
+    outbox and the facet counts are updated chunk by chunk.
+
+    - **file**: The catalog to import. CSV files need a header row; list
+      fields (`tags`, `images`) separate their values with `|`.
+    - **format**: Either `csv` or `ndjson`.
+    """
+    fmt = format or detect_format(file.filename)
+    with tempfile.NamedTemporaryFile(
+        "w",
+        dir=settings.PRODUCT_IMPORT_REJECTS_DIR,
+        prefix="product-import-",
+        suffix=".rejects.ndjson",
+        delete=False,
+    ) as rejects:
+        report = await ProductImporter(rejects, redis=redis).run(file.file, fmt)
+
+    if report.rejected:
+        report.rejects_file = rejects.name
+    else:
+        os.unlink(rejects.name)
+    return report
+
+
 @router.put("/{product_id}", summary="Update a product")
 async def update_product(
     product_id: str,
     product: ProductUpdate,
     background_tasks: BackgroundTasks,
     redis: Redis = Depends(get_redis),
-    rabbit: Channel = Depends(get_rabbit_channel),
 ) -> ProductRead:
     """
     Update an existing product.
@@ -91,19 +417,21 @@ async def update_product(
     - **product_id**: The ID of the product to update.
     - **product**: The updated product data.
     """
-    updated_product = await product_crud.update_product(product_id, product)
+    updated_product = await product_crud.update_product(product_id, product, redis)
     if not updated_product:
         raise HTTPException(status_code=404, detail="Product not found")
 
     background_tasks.add_task(
-        set_product_cache, redis, product_id, updated_product.model_dump_json()
-    )
-    background_tasks.add_task(
-        publish_message,
-        rabbit,
-        "product.updated",
-        updated_product.model_dump_json(),
+        set_product_cache,
+        redis,
+        product_id,
+        dump_product_json(updated_product),
+        broadcast=True,
     )
+    if product.price is not None:
+        background_tasks.add_task(
+            publish_price_changes, redis, {product_id: updated_product.price}
+        )
     return updated_product
 
 
@@ -112,39 +440,54 @@ async def delete_product(
     product_id: str,
     background_tasks: BackgroundTasks,
     redis: Redis = Depends(get_redis),
-    rabbit: Channel = Depends(get_rabbit_channel),
 ) -> ProductRead:
     """
     Delete a product by its ID.
 
     - **product_id**: The ID of the product to delete.
     """
-    deleted_product = await product_crud.delete_product(product_id)
+    deleted_product = await product_crud.delete_product(product_id, redis)
     if not deleted_product:
         raise HTTPException(status_code=404, detail="Product not found")
 
     background_tasks.add_task(delete_product_cache, redis, product_id)
-    background_tasks.add_task(
-        publish_message,
-        rabbit,
-        "product.deleted",
-        deleted_product.model_dump_json(),
-    )
+    background_tasks.add_task(publish_price_changes, redis, {product_id: None})
     return deleted_product
 
 
-@router.get("/category/{category}", summary="Get products by category")
+@router.get(
+    "/category/{category}",
+    summary="Get products by category",
+    response_model=Union[ProductPage, list[ProductRead]],
+    responses={304: {"description": "The page has not changed"}},
+)
 async def get_products_by_category(
-    category: str, skip: int = 0, limit: int = 100
-) -> list[ProductRead]:
+    category: str,
+    skip: int = 0,
+    limit: int = Query(100, gt=0),
+    after: Optional[str] = Query(
+        None, description="Pagination cursor; pass an empty value for the first page"
+    ),
+    if_none_match: Optional[str] = Header(None),
+) -> Response:
     """
     Retrieve products by category with pagination.
 
+    Pages carry an ETag computed from their body; when `If-None-Match`
+    matches it, an empty 304 is returned instead.
+
     - **category**: The category of products to retrieve.
     - **skip**: Number of products to skip (default is 0).
     - **limit**: Maximum number of products to return (default is 100).
+    - **after**: Cursor returned as `next_cursor` by the previous page. When
+      given (even empty), cursor pagination is used and `skip` is ignored.
     """
+    if after is not None:
+        page = await _get_products_page(after, limit, category=category)
+        return conditional_json_response(page.model_dump_json(), if_none_match)
+
     products = await product_crud.get_products_by_category(
         category, skip=skip, limit=limit
     )
-    return products
+    products_json = ",".join(dump_product_json(product) for product in products)
+    return conditional_json_response(f"[{products_json}]", if_none_match)
@@ -0,0 +1,148 @@
+from typing import Dict, List
+
+from fastapi import APIRouter, Depends, BackgroundTasks, HTTPException
+from redis.asyncio import Redis
+
+from app.core.config import settings
+from app.crud import reservation as reservation_crud
+from app.crud.reservation import InsufficientStockError, ProductNotFoundError
+from app.models.product import Product
+from app.redis.dependency import get_redis
+from app.redis.cache import delete_product_cache_many
+from app.schemas.reservation import (
+    ReservationCreate,
+    ReservationItem,
+    ReservationBatchCreate,
+    ReservationRelease,
+    ReservationBatchRelease,
+    ReservationRead,
+)
+
+router = APIRouter()
+
+
+def _invalidate_products(
+    background_tasks: BackgroundTasks, redis: Redis, products: Dict[str, Product]
+) -> None:
+    """
+    Drop the cached stock of the products after the response is sent.
+    Concurrent reservations finish in any order, so caching their snapshots
+    could leave an older quantity in place of a newer one.
+    """
+    background_tasks.add_task(delete_product_cache_many, redis, list(products))
+
+
+async def _reserve(
+    items: List[ReservationItem],
+    ttl_seconds: int | None,
+    background_tasks: BackgroundTasks,
+    redis: Redis,
+) -> List[ReservationRead]:
+    try:
+        reservations, products = await reservation_crud.reserve_stock(
+            items, ttl_seconds
+        )
+    except ProductNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except InsufficientStockError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+    _invalidate_products(background_tasks, redis, products)
+    return [ReservationRead.model_validate(r) for r in reservations]
+
+
+@router.post("/reservations", summary="Reserve stock of several products")
+async def reserve_products(
+    request: ReservationBatchCreate,
+    background_tasks: BackgroundTasks,
+    redis: Redis = Depends(get_redis),
+) -> List[ReservationRead]:
+    """
+    Reserve units of several products at once. Either every line is
+    reserved or none is.
+
+    - **request**: The products and quantities to reserve.
+    """
+    if len(request.items) > settings.RESERVATION_BATCH_MAX_SIZE:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {settings.RESERVATION_BATCH_MAX_SIZE} items can be reserved at once",
+        )
+    return await _reserve(request.items, request.ttl_seconds, background_tasks, redis)
+
+
+@router.post("/reservations/release", summary="Release several reservations")
+async def release_reservations(
+    request: ReservationBatchRelease,
+    background_tasks: BackgroundTasks,
+    redis: Redis = Depends(get_redis),
+) -> List[ReservationRead]:
+    """
+    Release reservations, returning their units to the products. Unknown or
+    already settled reservations are skipped.
+
+    - **request**: The reservations to release.
+    """
+    reservations, products = await reservation_crud.release_reservations(
+        request.reservation_ids
+    )
+    _invalidate_products(background_tasks, redis, products)
+    return [ReservationRead.model_validate(r) for r in reservations]
+
+
+@router.post("/reservations/commit", summary="Commit several reservations")
+async def commit_reservations(
+    request: ReservationBatchRelease,
+) -> List[ReservationRead]:
+    """
+    Make the sale of reserved units final, so they are not returned to the
+    products when the reservations expire. Unknown, expired or already
+    settled reservations are skipped.
+
+    - **request**: The reservations to commit.
+    """
+    reservations = await reservation_crud.commit_reservations(request.reservation_ids)
+    return [ReservationRead.model_validate(r) for r in reservations]
+
+
+@router.post("/{product_id}/reserve", summary="Reserve stock of a product")
+async def reserve_product(
+    product_id: str,
+    request: ReservationCreate,
+    background_tasks: BackgroundTasks,
+    redis: Redis = Depends(get_redis),
+) -> ReservationRead:
+    """
+    Reserve units of a product. The units are taken from its quantity
+    atomically and go back automatically when the reservation expires,
+    unless it is committed first.
+
+    - **product_id**: The ID of the product to reserve.
+    - **request**: The quantity and, optionally, how long to hold it.
+    """
+    item = ReservationItem(product_id=product_id, quantity=request.quantity)
+    reservations = await _reserve([item], request.ttl_seconds, background_tasks, redis)
+    return reservations[0]
+
+
+@router.post("/{product_id}/release", summary="Release a reservation")
+async def release_product(
+    product_id: str,
+    request: ReservationRelease,
+    background_tasks: BackgroundTasks,
+    redis: Redis = Depends(get_redis),
+) -> ReservationRead:
+    """
+    Release a reservation, returning its units to the product.
+
+    - **product_id**: The ID of the reserved product.
+    - **request**: The reservation to release.
+    """
+    reservations, products = await reservation_crud.release_reservations(
+        [request.reservation_id], product_id=product_id
+    )
+    if not reservations:
+        raise HTTPException(status_code=404, detail="Active reservation not found")
+
+    _invalidate_products(background_tasks, redis, products)
+    return ReservationRead.model_validate(reservations[0])
@@ -0,0 +1,274 @@
+import asyncio
+import time
+from contextlib import suppress
+from typing import Any, Dict, List, Optional
+from loguru import logger
+from fastapi import FastAPI
+from motor.motor_asyncio import AsyncIOMotorClientSession
+from prometheus_client import Counter, Gauge
+from pymongo.errors import OperationFailure
+from redis.asyncio import Redis
+
+from app.core.config import settings
+from app.crud import change_stream as change_stream_crud
+from app.crud import outbox as outbox_crud
+from app.models.product import Product
+from app.rabbitmq.events import (
+    ProductEvent,
+    product_created_event,
+    product_deleted_event,
+    product_updated_event,
+)
+from app.redis.cache import delete_product_cache_many, set_product_cache_many
+from app.redis.prices import publish_price_changes
+from app.schemas.product import dump_product_json
+
+CHANGE_STREAM_CHANGES = Counter(
+    "product_change_stream_changes_total",
+    "Product changes read from the change stream by operation.",
+    ["operation"],
+)
+CHANGE_STREAM_LAG = Gauge(
+    "product_change_stream_lag_seconds",
+    "Age of the last product change handled by the watcher.",
+)
+
+CHANGE_STREAM_LOCK = "product-change-stream"
+
+# Change events after which the stream is closed by the server.
+STREAM_END_OPERATIONS = {"drop", "rename", "dropDatabase", "invalidate"}
+
+# The server could not resume the stream: the oplog no longer holds the token.
+CHANGE_STREAM_HISTORY_LOST = 286
+
+PRODUCT_FIELDS = set(Product.model_fields) - {"id", "revision_id"}
+
+
+def _changed_fields(change: dict, document: Optional[dict]) -> Dict[str, Any]:
+    """
+    The new value of each product field an update or replace wrote. Fields
+    written by path, e.g. `tags.0`, and removed fields take their value in
+    the current document, or None once removed.
+    """
+    if change["operationType"] == "replace":
+        return {name: document.get(name) for name in PRODUCT_FIELDS}
+
+    description = change["updateDescription"]
+    updated = description.get("updatedFields", {})
+    names = {path.split(".")[0] for path in updated}
+    names.update(path.split(".")[0] for path in description.get("removedFields", []))
+    names.update(
+        truncated["field"].split(".")[0]
+        for truncated in description.get("truncatedArrays", [])
+    )
+    return {
+        name: updated[name] if name in updated else (document or {}).get(name)
+        for name in sorted(names & PRODUCT_FIELDS)
+    }
+
+
+def _change_event(change: dict) -> Optional[ProductEvent]:
+    """The product event describing a change, if it touched product fields."""
+    operation = change["operationType"]
+    product_id = str(change["documentKey"]["_id"])
+    if operation == "insert":
+        return product_created_event(Product.model_validate(change["fullDocument"]))
+    if operation == "delete":
+        return product_deleted_event(product_id)
+    changed = _changed_fields(change, change.get("fullDocument"))
+    return product_updated_event(product_id, changed) if changed else None
+
+
+async def apply_changes(
+    redis: Redis, changes: List[dict], resume_token: Dict[str, Any]
+) -> None:
+    """
+    Bring the cache up to date with a batch of product changes, then save
+    the resume token, along with the product events when the watcher
+    records them, in a single transaction.
+
+    Each product is refreshed or invalidated once per batch, with its latest
+    state, and the changed prices are announced to the price tables.
+
+    Args:
+        redis (Redis): The Redis client.
+        changes (List[dict]): The change events, in order.
+        resume_token (Dict[str, Any]): The token to resume after the batch.
+    """
+    latest: Dict[str, Optional[dict]] = {}
+    prices: Dict[str, Optional[float]] = {}
+    for change in changes:
+        product_id = str(change["documentKey"]["_id"])
+        document = change.get("fullDocument")
+        # With `updateLookup`, an update of a product deleted since carries
+        # no document.
+        latest[product_id] = None if change["operationType"] == "delete" else document
+        if document is None:
+            prices[product_id] = None
+        elif change["operationType"] != "update" or "price" in _changed_fields(
+            change, document
+        ):
+            prices[product_id] = document.get("price")
+
+    gone = [product_id for product_id, document in latest.items() if document is None]
+    if settings.CHANGE_STREAM_CACHE == "refresh":
+        await set_product_cache_many(
+            redis,
+            {
+                product_id: dump_product_json(Product.model_validate(document))
+                for product_id, document in latest.items()
+                if document is not None
+            },
+            broadcast=True,
+        )
+        await delete_product_cache_many(redis, gone)
+    else:
+        await delete_product_cache_many(redis, list(latest))
+    await publish_price_changes(redis, prices)
+
+    events = []
+    if outbox_crud.change_stream_records_events():
+        events = [event for change in changes if (event := _change_event(change))]
+
+    async def write(session: Optional[AsyncIOMotorClientSession]) -> None:
+        await outbox_crud.record_events(events, {}, session)
+        await change_stream_crud.save_resume_token(
+            Product.get_motor_collection().name, resume_token, session
+        )
+
+    await outbox_crud.run_in_transaction(write)
+
+    for change in changes:
+        CHANGE_STREAM_CHANGES.labels(operation=change["operationType"]).inc()
+    CHANGE_STREAM_LAG.set(max(0.0, time.time() - changes[-1]["clusterTime"].time))
+
+
+async def tail_products(redis: Redis, lock) -> None:
+    """
+    Follow the products collection from the saved resume token, or from now
+    if there is none, one batch at a time, while holding `lock`.
+
+    A batch ends after `CHANGE_STREAM_BATCH_SIZE` changes, or once no change
+    came for `CHANGE_STREAM_MAX_AWAIT_MS`. While no product changes, the
+    resume token is still saved every `CHANGE_STREAM_CHECKPOINT_INTERVAL`
+    seconds, so it does not fall out of the oplog.
+
+    Args:
+        redis (Redis): The Redis client.
+        lock: The Redis lock making this worker the active watcher.
+    """
+    collection = Product.get_motor_collection()
+    resume_token = await change_stream_crud.get_resume_token(collection.name)
+    try:
+        async with collection.watch(
+            full_document="updateLookup",
+            resume_after=resume_token,
+            batch_size=settings.CHANGE_STREAM_BATCH_SIZE,
+            max_await_time_ms=settings.CHANGE_STREAM_MAX_AWAIT_MS,
+        ) as stream:
+            logger.info("Watching the products collection for changes.")
+            saved_at = time.monotonic()
+            while True:
+                changes = []
+                ended = False
+                while len(changes) < settings.CHANGE_STREAM_BATCH_SIZE:
+                    change = await stream.try_next()
+                    if change is None:
+                        break
+                    if change["operationType"] in STREAM_END_OPERATIONS:
+                        ended = True
+                        break
+                    changes.append(change)
+
+                await lock.reacquire()
+                if changes:
+                    await apply_changes(redis, changes, changes[-1]["_id"])
+                    saved_at = time.monotonic()
+                elif (
+                    stream.resume_token
+                    and time.monotonic() - saved_at
+                    >= settings.CHANGE_STREAM_CHECKPOINT_INTERVAL
+                ):
+                    await change_stream_crud.save_resume_token(
+                        collection.name, stream.resume_token
+                    )
+                    saved_at = time.monotonic()
+
+                if ended:
+                    logger.warning(
+                        "The products collection was dropped or renamed, "
+                        "watching it again from now."
+                    )
+                    await change_stream_crud.delete_resume_token(collection.name)
+                    return
+    except OperationFailure as e:
+        if e.code != CHANGE_STREAM_HISTORY_LOST:
+            raise
+        logger.warning(
+            "The products change stream cannot resume, its token is no longer "
+            "in the oplog. Watching again from now: products changed meanwhile "
+            f"stay cached until they expire. ({e})"
+        )
+        await change_stream_crud.delete_resume_token(collection.name)
+
+
+async def watch_products(redis: Redis) -> None:
+    """
+    Keep the product cache, and the product events when enabled, in step
+    with every write to the products collection, until cancelled.
+
+    A Redis lock makes a single worker the active watcher. Changes are
+    handled at least once: a batch handled but whose resume token was not
+    saved yet is handled again after a crash, which only refreshes the
+    cache again, since the events are recorded with the token.
+
+    Args:
+        redis (Redis): The Redis client.
+    """
+    lock = redis.lock(
+        CHANGE_STREAM_LOCK, timeout=settings.CHANGE_STREAM_LOCK_TIMEOUT, blocking=False
+    )
+    try:
+        while True:
+            try:
+                if await lock.owned() or await lock.acquire():
+                    await tail_products(redis, lock)
+                    continue
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Product change stream watcher failed: {e}")
+            await asyncio.sleep(1)
+    finally:
+        # Hand the watcher over to another worker right away.
+        with suppress(Exception):
+            if await lock.owned():
+                await lock.release()
+
+
+async def init_change_stream_watcher(app: FastAPI) -> None:
+    """
+    Start the product change stream watcher, if enabled.
+
+    Args:
+        app (FastAPI): fastAPI application.
+    """
+    if not settings.CHANGE_STREAM_ENABLED:
+        return
+    app.state.change_stream_watcher = asyncio.create_task(
+        watch_products(app.state.redis)
+    )
+
+
+async def close_change_stream_watcher(app: FastAPI) -> None:
+    """
+    Stop the product change stream watcher.
+
+    Args:
+        app (FastAPI): fastAPI application.
+    """
+    if not hasattr(app.state, "change_stream_watcher"):
+        return
+    app.state.change_stream_watcher.cancel()
+    with suppress(asyncio.CancelledError):
+        await app.state.change_stream_watcher
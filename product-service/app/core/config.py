@@ -1,6 +1,6 @@
 import os
 import secrets
-from typing import Optional
+from typing import List, Literal, Optional
 from functools import lru_cache
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from yarl import URL
@@ -34,6 +34,34 @@ class Settings(BaseSettings):
 
     # Logging settings
     LOG_LEVEL: LogLevel = LogLevel.INFO
+    # JSON lines instead of text
+    LOG_JSON: bool = False
+    # Format and write records from a background thread, dropping records
+    # while LOG_QUEUE_SIZE of them are waiting
+    LOG_ENQUEUE: bool = True
+    LOG_QUEUE_SIZE: int = 10000
+    # Debug and info records let through per second and call site, with
+    # bursts of LOG_RATE_BURST (0 disables the limit)
+    LOG_RATE_LIMIT: float = 50.0
+    LOG_RATE_BURST: int = 100
+
+    # Tracing settings (TRACING_EXPORTER is none, console, file or otlp)
+    TRACING_EXPORTER: str = "none"
+    TRACING_SERVICE_NAME: str = "product-service"
+    TRACING_SAMPLE_RATIO: float = 1.0
+    TRACING_FILE_PATH: str = "/tmp/product-service-traces.jsonl"
+    TRACING_OTLP_ENDPOINT: str = "http://localhost:4318/v1/traces"
+
+    # Startup settings: each phase gets STARTUP_PHASE_TIMEOUT seconds per
+    # attempt and STARTUP_RETRIES more attempts, waiting STARTUP_RETRY_BACKOFF
+    # seconds before the first retry and twice as long before each next one,
+    # up to STARTUP_RETRY_BACKOFF_MAX
+    STARTUP_PHASE_TIMEOUT: float = 30.0
+    STARTUP_RETRIES: int = 5
+    STARTUP_RETRY_BACKOFF: float = 0.5
+    STARTUP_RETRY_BACKOFF_MAX: float = 10.0
+    # Seconds each /readyz dependency check may take
+    READINESS_TIMEOUT: float = 2.0
 
     # MongoDB settings
     MONGODB_SCHEME: str
@@ -43,6 +71,18 @@ class Settings(BaseSettings):
     MONGODB_PORT: Optional[int] = 27017
     MONGODB_DB: str
     MONGODB_URI: Optional[str] = None
+    # Client options; MONGODB_COMPRESSORS is a comma-separated list of zstd,
+    # snappy and zlib, in order of preference (zstd and snappy need the
+    # zstandard and python-snappy packages)
+    MONGODB_MAX_POOL_SIZE: int = 100
+    MONGODB_MIN_POOL_SIZE: int = 0
+    MONGODB_MAX_IDLE_TIME_MS: Optional[int] = None
+    MONGODB_COMPRESSORS: str = ""
+    MONGODB_READ_PREFERENCE: Literal[
+        "primary", "primaryPreferred", "secondary", "secondaryPreferred", "nearest"
+    ] = "primary"
+    # Log the plans of the hot queries at startup, flagging collection scans
+    MONGODB_QUERY_PLAN_REPORT: bool = True
 
     # Redis settings
     REDIS_URL: Optional[str] = None
@@ -51,6 +91,59 @@ class Settings(BaseSettings):
     REDIS_DB: int = 0
     REDIS_PASSWORD: Optional[str] = None
     REDIS_CACHE_EXPIRE: Optional[int] = 3600
+    REDIS_INVALIDATION_CHANNEL: str = "product-cache-invalidation"
+    REDIS_PRICE_CHANNEL: str = "product-price-changes"
+    REDIS_CACHE_LOCK_TIMEOUT: float = 5.0
+    REDIS_CACHE_LOCK_WAIT: float = 0.5
+    REDIS_CACHE_XFETCH_BETA: float = 1.0
+
+    # In-process cache settings (set LOCAL_CACHE_MAX_SIZE to 0 to disable)
+    LOCAL_CACHE_MAX_SIZE: int = 5000
+    LOCAL_CACHE_TTL: float = 30.0
+
+    # Product API settings
+    PRODUCT_BATCH_MAX_SIZE: int = 200
+    PRODUCT_BULK_MAX_SIZE: int = 10000
+    PRODUCT_BULK_CHUNK_SIZE: int = 1000
+    PRODUCT_IMPORT_CHUNK_SIZE: int = 1000
+    PRODUCT_IMPORT_CONCURRENCY: int = 4
+    PRODUCT_IMPORT_REJECTS_DIR: str = "/tmp"
+
+    # Product facets: upper bounds of the price bands (the last band has
+    # none), and seconds between full recomputes correcting the drift of the
+    # counts kept up to date by the writes
+    PRODUCT_FACET_PRICE_BANDS: List[float] = [10, 25, 50, 100, 250, 500, 1000]
+    PRODUCT_FACETS_RECOMPUTE_INTERVAL: float = 3600.0
+
+    # Stock reservation settings
+    RESERVATION_TTL: int = 900
+    RESERVATION_MAX_TTL: int = 86400
+    RESERVATION_RETENTION: int = 86400
+    RESERVATION_SWEEP_INTERVAL: float = 30.0
+    RESERVATION_SWEEP_BATCH_SIZE: int = 500
+    RESERVATION_BATCH_MAX_SIZE: int = 100
+
+    # Product event outbox settings (OUTBOX_TRANSACTIONS needs a replica set)
+    OUTBOX_TRANSACTIONS: bool = True
+    OUTBOX_RETENTION: int = 86400
+    OUTBOX_RELAY_INTERVAL: float = 0.5
+    OUTBOX_RELAY_BATCH_SIZE: int = 500
+    OUTBOX_RELAY_LOCK_TIMEOUT: float = 30.0
+
+    # Change stream watcher (needs a replica set): tails the products
+    # collection so the cache stays fresh whoever writes to it, in batches of
+    # up to CHANGE_STREAM_BATCH_SIZE changes. CHANGE_STREAM_CACHE is
+    # invalidate (drop the changed products) or refresh (rewrite them). With
+    # CHANGE_STREAM_EVENTS, the watcher records the events of every product
+    # write in the outbox, and the API handlers no longer do
+    CHANGE_STREAM_ENABLED: bool = False
+    CHANGE_STREAM_CACHE: Literal["invalidate", "refresh"] = "invalidate"
+    CHANGE_STREAM_EVENTS: bool = False
+    CHANGE_STREAM_BATCH_SIZE: int = 500
+    CHANGE_STREAM_MAX_AWAIT_MS: int = 200
+    # Seconds between saves of the resume token while no product changes
+    CHANGE_STREAM_CHECKPOINT_INTERVAL: float = 60.0
+    CHANGE_STREAM_LOCK_TIMEOUT: float = 30.0
 
     # RabbitMQ settings
     RABBITMQ_HOST: str = "localhost"
@@ -60,10 +153,30 @@ class Settings(BaseSettings):
     RABBITMQ_VHOST: str = "/"
     RABBITMQ_URI: Optional[str] = None
     RABBITMQ_EXCHANGE_NAME: str = "product_exchange"
+    # Product event encoding; `json` for consumers that cannot read protobuf
+    RABBITMQ_EVENT_FORMAT: Literal["protobuf", "json"] = "protobuf"
+    RABBITMQ_PUBLISH_MAX_IN_FLIGHT: int = 1000
+    RABBITMQ_PUBLISH_TIMEOUT: float = 10.0
+    # Set RABBITMQ_PUBLISH_BATCH_SIZE above 1 to send single publishes in batches
+    RABBITMQ_PUBLISH_BATCH_SIZE: int = 1
+    RABBITMQ_PUBLISH_BATCH_DELAY: float = 0.005
 
     # Price Service settings
     PRICE_SERVICE_GRPC_HOST: str = "localhost"
     PRICE_SERVICE_GRPC_PORT: int = 50052
+    # Run the gRPC server inside the HTTP app (dev); disable it when the
+    # standalone server (`python -m app.price_server`) is deployed instead.
+    PRICE_SERVICE_EMBEDDED: bool = True
+    PRICE_SERVICE_WORKERS: int = 0  # 0 means one process per CPU
+    PRICE_SERVICE_MAX_CONCURRENT_STREAMS: int = 1000
+    PRICE_SERVICE_MAX_CONCURRENT_RPCS: Optional[int] = None
+    PRICE_SERVICE_KEEPALIVE_TIME_MS: int = 30000
+    PRICE_SERVICE_KEEPALIVE_TIMEOUT_MS: int = 10000
+    PRICE_SERVICE_SHUTDOWN_GRACE: float = 5.0
+    PRICE_BATCH_MAX_SIZE: int = 1000
+    PRICE_WATCH_MAX_IDS: int = 1000
+    PRICE_TABLE_ENABLED: bool = True
+    PRICE_TABLE_LOAD_BATCH_SIZE: int = 10000
 
     model_config = SettingsConfigDict(env_file=".env")
 
@@ -1,32 +1,110 @@
+from datetime import datetime, timezone
+from typing import Any, Dict
 from loguru import logger
 from fastapi import FastAPI
 from motor.motor_asyncio import AsyncIOMotorClient
 from beanie import init_beanie
+from bson import ObjectId
 
 from app.core.config import settings
-from app.models import Product
+from app.core.instrumentation import MongoCommandListener
+from app.core.query_plans import HotQuery, report_query_plans
+from app.models import ChangeStreamCheckpoint, OutboxEvent, Product, Reservation
 
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
 
-async def init_db(app: FastAPI) -> None:
+HOT_QUERIES = [
+    HotQuery("product page", Product, {"_id": {"$gt": ObjectId()}}, {"_id": 1}),
+    HotQuery(
+        "category page",
+        Product,
+        {"category": "", "_id": {"$gt": ObjectId()}},
+        {"_id": 1},
+    ),
+    HotQuery("recent changes", Product, {"updated_at": {"$gte": EPOCH}}, {"_id": 1}),
+    HotQuery("price range", Product, {"price": {"$gte": 0, "$lte": 0}}),
+    HotQuery("tag", Product, {"tags": ""}),
+    HotQuery("pending outbox events", OutboxEvent, {"status": "pending"}, {"_id": 1}),
+    HotQuery(
+        "expired reservations",
+        Reservation,
+        {"status": "active", "expires_at": {"$lte": EPOCH}},
+    ),
+]
+
+
+def mongo_client_options() -> Dict[str, Any]:
+    """MongoDB client pool, compression and read preference options."""
+    options: Dict[str, Any] = {
+        "maxPoolSize": settings.MONGODB_MAX_POOL_SIZE,
+        "minPoolSize": settings.MONGODB_MIN_POOL_SIZE,
+        "maxIdleTimeMS": settings.MONGODB_MAX_IDLE_TIME_MS,
+        "readPreference": settings.MONGODB_READ_PREFERENCE,
+    }
+    if settings.MONGODB_COMPRESSORS:
+        options["compressors"] = settings.MONGODB_COMPRESSORS
+    return options
+
+
+async def connect_db() -> AsyncIOMotorClient:
     """
     Connect to MongoDB via Motor, initialize Beanie with our Document models.
 
-    Args:
-        app (FastAPI): FastAPI application instance.
+    Beanie creates the indexes the models declare and are missing, and fails
+    if one exists with other options.
+
+    Returns:
+        AsyncIOMotorClient: The connected client.
     """
     client = AsyncIOMotorClient(
         settings.mongodb_url,
+        event_listeners=[MongoCommandListener()],
+        # Read dates back as UTC-aware datetimes, so every endpoint and the
+        # export write them with the same `Z` suffix.
+        tz_aware=True,
+        tzinfo=timezone.utc,
+        **mongo_client_options(),
     )
 
-    await init_beanie(
-        database=client.get_default_database(),
-        document_models=[Product],  # list all your Document classes here
-    )
+    try:
+        await init_beanie(
+            database=client.get_default_database(),
+            document_models=[
+                Product,
+                Reservation,
+                OutboxEvent,
+                ChangeStreamCheckpoint,
+            ],  # list all your Document classes here
+        )
+        if settings.MONGODB_QUERY_PLAN_REPORT:
+            await report_query_plans(HOT_QUERIES)
+    except BaseException:
+        client.close()
+        raise
+    return client
 
-    app.state.mongo_client = client
+
+async def init_db(app: FastAPI) -> None:
+    """
+    Connect to MongoDB and store the client in the app state.
+
+    Args:
+        app (FastAPI): FastAPI application instance.
+    """
+    app.state.mongo_client = await connect_db()
     logger.info("Connected to MongoDB.")
 
 
+async def check_db(app: FastAPI) -> None:
+    """
+    Ping MongoDB.
+
+    Args:
+        app (FastAPI): FastAPI application instance.
+    """
+    await app.state.mongo_client.admin.command("ping")
+
+
 async def close_db(app: FastAPI) -> None:
     """
     Closes database connection pool.
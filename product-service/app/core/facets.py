@@ -0,0 +1,84 @@
+import asyncio
+import time
+from contextlib import suppress
+from loguru import logger
+from fastapi import FastAPI
+from prometheus_client import Gauge
+from redis.asyncio import Redis
+
+from app.core.config import settings
+from app.crud import product as product_crud
+from app.redis.facets import FACETS_RECOMPUTE_KEY, set_facets
+
+FACETS_RECOMPUTE_DURATION = Gauge(
+    "product_facets_recompute_seconds",
+    "Time the last full recompute of the product facet counts took.",
+)
+
+
+async def recompute_facets(redis: Redis) -> None:
+    """
+    Count the products of each facet value from the catalog and replace the
+    counts kept in Redis.
+
+    Args:
+        redis (Redis): The Redis client.
+    """
+    started_at = time.perf_counter()
+    await set_facets(redis, await product_crud.get_facet_counts())
+    duration = time.perf_counter() - started_at
+    FACETS_RECOMPUTE_DURATION.set(duration)
+    logger.info(f"Recomputed the product facets in {duration:.2f}s.")
+
+
+async def refresh_facets(redis: Redis) -> None:
+    """
+    Recompute the product facet counts every
+    `PRODUCT_FACETS_RECOMPUTE_INTERVAL` seconds, correcting the drift left
+    by writes whose count update failed or raced with a recompute. Every
+    worker may run this loop: the first one to set the recompute key does
+    the recompute for all of them.
+
+    Args:
+        redis (Redis): The Redis client.
+    """
+    interval = settings.PRODUCT_FACETS_RECOMPUTE_INTERVAL
+    while True:
+        try:
+            if await redis.set(
+                FACETS_RECOMPUTE_KEY, "1", nx=True, px=int(interval * 1000)
+            ):
+                try:
+                    await recompute_facets(redis)
+                except BaseException:
+                    # Let another worker retry instead of waiting an interval.
+                    with suppress(Exception):
+                        await redis.delete(FACETS_RECOMPUTE_KEY)
+                    raise
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"Product facets recompute failed: {e}")
+        await asyncio.sleep(min(interval, 60))
+
+
+async def init_facets_recompute(app: FastAPI) -> None:
+    """
+    Start the periodic product facets recompute.
+
+    Args:
+        app (FastAPI): fastAPI application.
+    """
+    app.state.facets_recompute = asyncio.create_task(refresh_facets(app.state.redis))
+
+
+async def close_facets_recompute(app: FastAPI) -> None:
+    """
+    Stop the periodic product facets recompute.
+
+    Args:
+        app (FastAPI): fastAPI application.
+    """
+    app.state.facets_recompute.cancel()
+    with suppress(asyncio.CancelledError):
+        await app.state.facets_recompute
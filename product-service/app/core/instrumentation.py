@@ -0,0 +1,182 @@
+"""
+Latency metrics for every hop a request makes past the HTTP layer.
+
+The metric names and the `observe` helper are the same in every service,
+so one dashboard breaks down the p99 of any of them; each service only
+carries the integrations for the clients it uses.
+"""
+
+import asyncio
+import inspect
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+import grpc
+from prometheus_client import Counter, Histogram
+from pymongo import monitoring
+from redis.asyncio import Redis
+from redis.asyncio.client import Pipeline
+
+MONGODB_COMMAND_DURATION = Histogram(
+    "mongodb_command_duration_seconds",
+    "MongoDB command latency by command and result.",
+    ["command", "result"],
+)
+REDIS_COMMAND_DURATION = Histogram(
+    "redis_command_duration_seconds",
+    "Redis command latency by command and result; pipelines count as one.",
+    ["command", "result"],
+)
+GRPC_SERVER_DURATION = Histogram(
+    "grpc_server_handling_seconds",
+    "gRPC server call latency by method and status code.",
+    ["method", "code"],
+)
+RABBITMQ_PUBLISH_DURATION = Histogram(
+    "rabbitmq_publish_duration_seconds",
+    "Time from publishing a message to its broker confirmation.",
+)
+CACHE_REQUESTS = Counter(
+    "product_cache_requests_total",
+    "Product cache lookups by tier and result.",
+    ["tier", "result"],
+)
+
+
+@contextmanager
+def observe(histogram: Histogram, **labels: str) -> Iterator[None]:
+    """
+    Time the block into `histogram`, labelled with `labels` plus a `result`
+    of `ok` or `error`.
+    """
+    started = time.perf_counter()
+    result = "error"
+    try:
+        yield
+        result = "ok"
+    finally:
+        histogram.labels(**labels, result=result).observe(time.perf_counter() - started)
+
+
+class MongoCommandListener(monitoring.CommandListener):
+    """
+    Records the duration of every MongoDB command, as measured by the
+    driver. Pass it in `event_listeners` when creating the client.
+    """
+
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        pass
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        MONGODB_COMMAND_DURATION.labels(
+            command=event.command_name, result="ok"
+        ).observe(event.duration_micros / 1e6)
+
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        MONGODB_COMMAND_DURATION.labels(
+            command=event.command_name, result="error"
+        ).observe(event.duration_micros / 1e6)
+
+
+class InstrumentedPipeline(Pipeline):
+    """A Redis pipeline timing each round trip."""
+
+    async def execute(self, raise_on_error: bool = True):
+        command = "MULTI" if self.is_transaction else "PIPELINE"
+        with observe(REDIS_COMMAND_DURATION, command=command):
+            return await super().execute(raise_on_error)
+
+
+class InstrumentedRedis(Redis):
+    """A Redis client timing every command and pipeline."""
+
+    async def execute_command(self, *args, **options):
+        with observe(REDIS_COMMAND_DURATION, command=str(args[0]).upper()):
+            return await super().execute_command(*args, **options)
+
+    def pipeline(
+        self, transaction: bool = True, shard_hint: Optional[str] = None
+    ) -> InstrumentedPipeline:
+        return InstrumentedPipeline(
+            self.connection_pool, self.response_callbacks, transaction, shard_hint
+        )
+
+
+_DEFAULT_CODES = {"ok": "OK", "cancelled": "CANCELLED", "error": "UNKNOWN"}
+
+
+def _status_code(context: grpc.aio.ServicerContext, outcome: str) -> str:
+    code = context.code()
+    if code is None:
+        return _DEFAULT_CODES[outcome]
+    return getattr(code, "name", str(code))
+
+
+class GrpcServerMetricsInterceptor(grpc.aio.ServerInterceptor):
+    """Times every call handled by the server, streams included."""
+
+    async def intercept_service(self, continuation, handler_call_details):
+        handler = await continuation(handler_call_details)
+        if handler is None:
+            return None
+        method = handler_call_details.method
+
+        def observe_call(context, started: float, outcome: str) -> None:
+            GRPC_SERVER_DURATION.labels(
+                method=method, code=_status_code(context, outcome)
+            ).observe(time.perf_counter() - started)
+
+        def wrap_unary(behavior):
+            async def wrapper(request, context):
+                started, outcome = time.perf_counter(), "error"
+                try:
+                    response = await behavior(request, context)
+                    outcome = "ok"
+                    return response
+                except asyncio.CancelledError:
+                    outcome = "cancelled"
+                    raise
+                finally:
+                    observe_call(context, started, outcome)
+
+            return wrapper
+
+        def wrap_stream(behavior):
+            async def wrapper(request, context):
+                started, outcome = time.perf_counter(), "error"
+                try:
+                    result = behavior(request, context)
+                    if inspect.isasyncgen(result):
+                        async for response in result:
+                            yield response
+                    else:
+                        await result
+                    outcome = "ok"
+                except (asyncio.CancelledError, GeneratorExit):
+                    outcome = "cancelled"
+                    raise
+                finally:
+                    observe_call(context, started, outcome)
+
+            return wrapper
+
+        options = {
+            "request_deserializer": handler.request_deserializer,
+            "response_serializer": handler.response_serializer,
+        }
+        if handler.unary_unary:
+            return grpc.unary_unary_rpc_method_handler(
+                wrap_unary(handler.unary_unary), **options
+            )
+        if handler.stream_unary:
+            return grpc.stream_unary_rpc_method_handler(
+                wrap_unary(handler.stream_unary), **options
+            )
+        if handler.unary_stream:
+            return grpc.unary_stream_rpc_method_handler(
+                wrap_stream(handler.unary_stream), **options
+            )
+        return grpc.stream_stream_rpc_method_handler(
+            wrap_stream(handler.stream_stream), **options
+        )
@@ -0,0 +1,146 @@
+import asyncio
+from contextlib import suppress
+from itertools import takewhile
+from aio_pika import DeliveryMode, Message
+from loguru import logger
+from fastapi import FastAPI
+from prometheus_client import Counter, Gauge
+from redis.asyncio import Redis
+
+from app.core.config import settings
+from app.crud import outbox as outbox_crud
+from app.rabbitmq.publisher import Publisher
+
+OUTBOX_PENDING = Gauge(
+    "outbox_pending_events",
+    "Product events recorded in the outbox and not published yet.",
+)
+OUTBOX_LAG = Gauge(
+    "outbox_lag_seconds",
+    "Age of the oldest product event not published yet.",
+)
+OUTBOX_RELAYED = Counter(
+    "outbox_relayed_events_total",
+    "Outbox events handed to RabbitMQ by outcome.",
+    ["result"],
+)
+
+OUTBOX_RELAY_LOCK = "product-outbox-relay"
+
+
+async def relay_batch(publisher: Publisher) -> int:
+    """
+    Publish one batch of pending outbox events and mark the confirmed ones
+    as published with a single update.
+
+    Only the events confirmed before the first failure are marked, so the
+    failed event goes out again before any event written after it. Events
+    confirmed after a failure are published again with it.
+
+    Returns:
+        int: The number of events marked as published, fewer than the
+            events read if any failed.
+    """
+    events = await outbox_crud.get_pending_events(settings.OUTBOX_RELAY_BATCH_SIZE)
+    if not events:
+        return 0
+
+    errors = await publisher.publish_many(
+        [
+            (
+                event.routing_key,
+                Message(
+                    body=event.payload,
+                    content_type=event.content_type,
+                    type=event.message_type,
+                    headers=event.headers,
+                    delivery_mode=DeliveryMode.PERSISTENT,
+                ),
+            )
+            for event in events
+        ],
+        return_exceptions=True,
+    )
+    confirmed = [
+        event.id
+        for event, _ in takewhile(lambda pair: pair[1] is None, zip(events, errors))
+    ]
+    await outbox_crud.mark_events_published(confirmed)
+
+    OUTBOX_RELAYED.labels(result="published").inc(len(confirmed))
+    failed = sum(error is not None for error in errors)
+    if failed:
+        OUTBOX_RELAYED.labels(result="failed").inc(failed)
+        logger.warning(
+            f"Failed to publish {failed} outbox events, will retry "
+            f"{len(events) - len(confirmed)} events from the first failure."
+        )
+    return len(confirmed)
+
+
+async def relay_outbox(redis: Redis, publisher: Publisher) -> None:
+    """
+    Publish the events recorded in the outbox, in write order, until
+    cancelled.
+
+    A Redis lock makes a single worker the active relay, so events are
+    neither published twice by concurrent relays nor reordered. Delivery is
+    at least once: an event confirmed by the broker but not yet marked as
+    published is sent again after a crash, and events confirmed after a
+    failed one are sent again with it. After a failure, the relay waits
+    `OUTBOX_RELAY_INTERVAL` seconds before retrying.
+
+    Args:
+        redis (Redis): The Redis client.
+        publisher (Publisher): The RabbitMQ publisher.
+    """
+    lock = redis.lock(
+        OUTBOX_RELAY_LOCK, timeout=settings.OUTBOX_RELAY_LOCK_TIMEOUT, blocking=False
+    )
+    try:
+        while True:
+            try:
+                if await lock.owned() or await lock.acquire():
+                    await lock.reacquire()
+                    # Keep going while full batches are published. After a
+                    # failure, wait for the next interval before retrying.
+                    batch_size = settings.OUTBOX_RELAY_BATCH_SIZE
+                    while await relay_batch(publisher) >= batch_size:
+                        await lock.reacquire()
+                    pending, lag = await outbox_crud.get_outbox_lag()
+                    OUTBOX_PENDING.set(pending)
+                    OUTBOX_LAG.set(lag)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Outbox relay failed: {e}")
+            await asyncio.sleep(settings.OUTBOX_RELAY_INTERVAL)
+    finally:
+        # Hand the relay over to another worker right away.
+        with suppress(Exception):
+            if await lock.owned():
+                await lock.release()
+
+
+async def init_outbox_relay(app: FastAPI) -> None:
+    """
+    Start the outbox relay.
+
+    Args:
+        app (FastAPI): fastAPI application.
+    """
+    app.state.outbox_relay = asyncio.create_task(
+        relay_outbox(app.state.redis, app.state.rmq_publisher)
+    )
+
+
+async def close_outbox_relay(app: FastAPI) -> None:
+    """
+    Stop the outbox relay.
+
+    Args:
+        app (FastAPI): fastAPI application.
+    """
+    app.state.outbox_relay.cancel()
+    with suppress(asyncio.CancelledError):
+        await app.state.outbox_relay
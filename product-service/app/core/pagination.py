@@ -0,0 +1,45 @@
+import base64
+import json
+from typing import Optional
+
+from beanie import PydanticObjectId
+from bson.errors import InvalidId
+
+
+def encode_cursor(last_id: PydanticObjectId) -> str:
+    """
+    Encode the position after a document into an opaque pagination cursor.
+
+    Args:
+        last_id (PydanticObjectId): The `_id` of the last document on a page.
+
+    Returns:
+        str: A URL-safe cursor token.
+    """
+    payload = json.dumps({"id": str(last_id)}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Optional[PydanticObjectId]:
+    """
+    Decode a pagination cursor produced by `encode_cursor`.
+
+    An empty cursor means "start from the beginning".
+
+    Args:
+        cursor (str): The cursor token.
+
+    Returns:
+        Optional[PydanticObjectId]: The `_id` to continue after, if any.
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return PydanticObjectId(payload["id"])
+    except (ValueError, KeyError, TypeError, InvalidId) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
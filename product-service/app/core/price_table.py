@@ -0,0 +1,126 @@
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from loguru import logger
+from prometheus_client import Counter, Gauge
+
+from app.core.config import settings
+from app.crud import product as product_crud
+
+PRICE_TABLE_LOOKUPS = Counter(
+    "price_table_lookups_total",
+    "In-memory price table lookups by result.",
+    ["result"],
+)
+
+
+class PriceTable:
+    """
+    Compact in-memory map of product ID to price, serving the price RPCs
+    without touching MongoDB.
+
+    Keys are the 12 raw bytes of the ObjectId rather than its 24 character
+    hex string, which shrinks each key object by about 40%. The table is
+    filled by a projected scan and kept current by the price change
+    channel; a lookup that misses falls back to MongoDB and fills the entry.
+    `version` counts the changes applied, so a fill can tell whether its
+    read may have raced with one.
+    """
+
+    __slots__ = ("_prices", "version")
+
+    def __init__(self):
+        self._prices: Dict[bytes, float] = {}
+        self.version = 0
+
+    def __len__(self) -> int:
+        return len(self._prices)
+
+    @staticmethod
+    def _key(product_id: str) -> Optional[bytes]:
+        if len(product_id) != 24:
+            return None
+        try:
+            return bytes.fromhex(product_id)
+        except ValueError:
+            return None
+
+    def get(self, product_id: str) -> Optional[float]:
+        """Return the price of a product, or None if it is not in the table."""
+        key = self._key(product_id)
+        price = self._prices.get(key) if key else None
+        PRICE_TABLE_LOOKUPS.labels(result="hit" if price is not None else "miss").inc()
+        return price
+
+    def get_many(
+        self, product_ids: Iterable[str]
+    ) -> Tuple[Dict[str, float], List[str]]:
+        """
+        Look up several products.
+
+        Returns:
+            Tuple[Dict[str, float], List[str]]: The prices found by product
+                ID, and the IDs that are not in the table.
+        """
+        found: Dict[str, float] = {}
+        missing: List[str] = []
+        for product_id in product_ids:
+            key = self._key(product_id)
+            price = self._prices.get(key) if key else None
+            if price is None:
+                missing.append(product_id)
+            else:
+                found[product_id] = price
+        PRICE_TABLE_LOOKUPS.labels(result="hit").inc(len(found))
+        PRICE_TABLE_LOOKUPS.labels(result="miss").inc(len(missing))
+        return found, missing
+
+    def apply(self, prices: Dict[str, Optional[float]]) -> None:
+        """Store new prices; None removes a deleted product."""
+        self.version += 1
+        for product_id, price in prices.items():
+            key = self._key(product_id)
+            if key is None:
+                continue
+            if price is None:
+                self._prices.pop(key, None)
+            else:
+                self._prices[key] = float(price)
+
+    def fill(self, prices: Dict[str, float], version: int) -> None:
+        """
+        Store prices read from MongoDB for lookups that missed, unless a
+        change was applied since `version` was taken: the read may predate
+        it, and the next miss reads the product again.
+        """
+        if version != self.version:
+            return
+        for product_id, price in prices.items():
+            key = self._key(product_id)
+            if key is not None:
+                self._prices[key] = float(price)
+
+    async def load(
+        self, batch_size: int = settings.PRICE_TABLE_LOAD_BATCH_SIZE
+    ) -> None:
+        """
+        Rebuild the table from a projected scan of the catalog and swap it in.
+        """
+        started = time.perf_counter()
+        prices: Dict[bytes, float] = {}
+        async for documents in product_crud.iter_product_prices(batch_size):
+            for document in documents:
+                prices[document["_id"].binary] = float(document["price"])
+        self._prices = prices
+        self.version += 1
+        logger.info(
+            f"Loaded {len(prices)} prices in {time.perf_counter() - started:.2f}s."
+        )
+
+
+price_table = PriceTable()
+
+Gauge(
+    "price_table_size",
+    "Number of products held in the in-memory price table.",
+).set_function(lambda: len(price_table))
@@ -0,0 +1,86 @@
+"""
+Startup report of the plans MongoDB picks for the hot queries.
+
+Each query is explained with the `queryPlanner` verbosity, which plans it
+without running it, and a warning is logged for every query whose winning
+plan scans the whole collection, e.g. because an index was not created.
+"""
+
+from typing import Any, Dict, List, NamedTuple, Optional, Type
+
+from beanie import Document
+from loguru import logger
+
+
+class HotQuery(NamedTuple):
+    """A query the service runs often, with placeholder values."""
+
+    name: str
+    document: Type[Document]
+    filter: Dict[str, Any]
+    sort: Optional[Dict[str, int]] = None
+    collation: Optional[Dict[str, Any]] = None
+
+
+def _plan_stages(plan: Any) -> List[str]:
+    """List the stages of a query plan, in whatever shape the server uses."""
+    if isinstance(plan, list):
+        return [stage for item in plan for stage in _plan_stages(item)]
+    if not isinstance(plan, dict):
+        return []
+    stages = [plan["stage"]] if "stage" in plan else []
+    for value in plan.values():
+        if isinstance(value, (dict, list)):
+            stages.extend(_plan_stages(value))
+    return stages
+
+
+async def explain(query: HotQuery) -> List[str]:
+    """
+    Plan a query without running it.
+
+    Args:
+        query (HotQuery): The query.
+
+    Returns:
+        List[str]: The stages of the winning plan, e.g. `IXSCAN`, `FETCH`.
+    """
+    collection = query.document.get_motor_collection()
+    find: Dict[str, Any] = {"find": collection.name, "filter": query.filter}
+    if query.sort:
+        find["sort"] = query.sort
+    if query.collation:
+        find["collation"] = query.collation
+    result = await collection.database.command(
+        {"explain": find, "verbosity": "queryPlanner"}
+    )
+    return _plan_stages(result["queryPlanner"]["winningPlan"])
+
+
+async def report_query_plans(queries: List[HotQuery]) -> List[str]:
+    """
+    Log the plan of each hot query, warning about collection scans.
+
+    Args:
+        queries (List[HotQuery]): The hot queries of the service.
+
+    Returns:
+        List[str]: The names of the queries scanning their collection.
+    """
+    scans = []
+    for query in queries:
+        try:
+            stages = await explain(query)
+        except Exception as e:
+            logger.warning(f"Could not explain the {query.name} query: {e}")
+            continue
+        if "COLLSCAN" in stages:
+            scans.append(query.name)
+            logger.warning(
+                f"The {query.name} query scans the whole "
+                f"{query.document.get_motor_collection().name} collection: "
+                f"{' <- '.join(stages)}"
+            )
+        else:
+            logger.info(f"The {query.name} query plan: {' <- '.join(stages)}")
+    return scans
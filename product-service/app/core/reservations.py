@@ -0,0 +1,59 @@
+import asyncio
+from contextlib import suppress
+from loguru import logger
+from fastapi import FastAPI
+from redis.asyncio import Redis
+
+from app.core.config import settings
+from app.crud import reservation as reservation_crud
+from app.redis.cache import delete_product_cache_many
+
+
+async def sweep_reservations(redis: Redis) -> None:
+    """
+    Periodically return the units of expired reservations to their products
+    and invalidate the affected cache entries. Every worker may run a sweeper:
+    each reservation is settled by a single conditional update.
+
+    Args:
+        redis (Redis): The Redis client.
+    """
+    while True:
+        try:
+            while True:
+                expired, products = await reservation_crud.expire_reservations()
+                if products:
+                    await delete_product_cache_many(redis, list(products))
+                if expired:
+                    logger.info(f"Expired {len(expired)} stock reservations.")
+                if len(expired) < settings.RESERVATION_SWEEP_BATCH_SIZE:
+                    break
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"Reservation sweep failed: {e}")
+        await asyncio.sleep(settings.RESERVATION_SWEEP_INTERVAL)
+
+
+async def init_reservation_sweeper(app: FastAPI) -> None:
+    """
+    Start the expired reservation sweeper.
+
+    Args:
+        app (FastAPI): fastAPI application.
+    """
+    app.state.reservation_sweeper = asyncio.create_task(
+        sweep_reservations(app.state.redis)
+    )
+
+
+async def close_reservation_sweeper(app: FastAPI) -> None:
+    """
+    Stop the expired reservation sweeper.
+
+    Args:
+        app (FastAPI): fastAPI application.
+    """
+    app.state.reservation_sweeper.cancel()
+    with suppress(asyncio.CancelledError):
+        await app.state.reservation_sweeper
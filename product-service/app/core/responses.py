@@ -0,0 +1,101 @@
+import hashlib
+from typing import Optional
+
+from fastapi import Response
+
+
+def compute_etag(payload: bytes) -> str:
+    """
+    Compute a strong ETag for a response body.
+
+    Args:
+        payload (bytes): The response body.
+
+    Returns:
+        str: The quoted ETag value.
+    """
+    return f'"{hashlib.blake2b(payload, digest_size=16).hexdigest()}"'
+
+
+def raw_json_response(payload: str | bytes, etag: Optional[str] = None) -> Response:
+    """
+    Send an already serialized JSON payload as-is, skipping response model
+    validation and re-encoding.
+
+    Args:
+        payload (str | bytes): The JSON body.
+        etag (Optional[str]): The ETag to send; computed from the body when
+            omitted.
+
+    Returns:
+        Response: The JSON response.
+    """
+    if isinstance(payload, str):
+        payload = payload.encode()
+    return Response(
+        content=payload,
+        media_type="application/json",
+        headers={"ETag": etag or compute_etag(payload)},
+    )
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Check an `If-None-Match` header against an ETag, using the weak
+    comparison RFC 9110 prescribes for it.
+
+    Args:
+        if_none_match (Optional[str]): The request header, if any.
+        etag (str): The current ETag of the resource.
+
+    Returns:
+        bool: True if the client already holds this representation.
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque
+        for candidate in if_none_match.split(",")
+    )
+
+
+def conditional_json_response(
+    payload: str | bytes,
+    if_none_match: Optional[str],
+    etag: Optional[str] = None,
+) -> Response:
+    """
+    Send an already serialized JSON payload with its ETag, or an empty 304
+    if the client's `If-None-Match` matches it.
+
+    Args:
+        payload (str | bytes): The JSON body.
+        if_none_match (Optional[str]): The request's `If-None-Match` header.
+        etag (Optional[str]): The ETag of the payload; computed from the body
+            when omitted.
+
+    Returns:
+        Response: The JSON or 304 response.
+    """
+    if isinstance(payload, str):
+        payload = payload.encode()
+    etag = etag or compute_etag(payload)
+    if etag_matches(if_none_match, etag):
+        return not_modified_response(etag)
+    return raw_json_response(payload, etag)
+
+
+def not_modified_response(etag: str) -> Response:
+    """
+    Build an empty 304 response for a representation the client holds.
+
+    Args:
+        etag (str): The ETag of the representation.
+
+    Returns:
+        Response: The 304 response.
+    """
+    return Response(status_code=304, headers={"ETag": etag})
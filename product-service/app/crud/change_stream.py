@@ -0,0 +1,35 @@
+from typing import Any, Dict, Optional
+
+from motor.motor_asyncio import AsyncIOMotorClientSession
+
+from app.models.change_stream import ChangeStreamCheckpoint
+
+
+async def get_resume_token(stream: str) -> Optional[Dict[str, Any]]:
+    """Retrieve the resume token saved for a change stream, if any."""
+    checkpoint = await ChangeStreamCheckpoint.get(stream)
+    return checkpoint.resume_token if checkpoint else None
+
+
+async def save_resume_token(
+    stream: str,
+    resume_token: Dict[str, Any],
+    session: Optional[AsyncIOMotorClientSession] = None,
+) -> None:
+    """
+    Save the resume token of a change stream, replacing the previous one.
+
+    Args:
+        stream (str): The name of the watched collection.
+        resume_token (Dict[str, Any]): The token of the last change handled.
+        session (Optional[AsyncIOMotorClientSession]): The transaction
+            recording the events of the changes.
+    """
+    await ChangeStreamCheckpoint(id=stream, resume_token=resume_token).save(
+        session=session
+    )
+
+
+async def delete_resume_token(stream: str) -> None:
+    """Forget the resume token of a change stream, so it restarts from now."""
+    await ChangeStreamCheckpoint.find_one(ChangeStreamCheckpoint.id == stream).delete()
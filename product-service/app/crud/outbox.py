@@ -0,0 +1,146 @@
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple, TypeVar
+
+from beanie import PydanticObjectId
+from motor.motor_asyncio import AsyncIOMotorClientSession
+from pymongo import ReadPreference
+
+from app.core.config import settings
+from app.core.tracing import trace_headers
+from app.models.outbox import OutboxEvent
+from app.rabbitmq.events import ProductEvent
+
+T = TypeVar("T")
+
+
+async def run_in_transaction(
+    callback: Callable[[Optional[AsyncIOMotorClientSession]], Awaitable[T]],
+) -> T:
+    """
+    Run `callback` inside a MongoDB transaction, so the writes it makes with
+    the session it is given either all commit or all roll back. Transient
+    transaction errors are retried, running `callback` again. Transactions
+    read from the primary whatever `MONGODB_READ_PREFERENCE` is.
+
+    With `OUTBOX_TRANSACTIONS` disabled (a standalone server cannot run
+    transactions), `callback` gets no session and its writes are applied
+    one after the other.
+
+    Args:
+        callback: The coroutine function making the writes.
+
+    Returns:
+        The result of `callback`.
+    """
+    if not settings.OUTBOX_TRANSACTIONS:
+        return await callback(None)
+
+    client = OutboxEvent.get_motor_collection().database.client
+    async with await client.start_session() as session:
+        return await session.with_transaction(
+            callback, read_preference=ReadPreference.PRIMARY
+        )
+
+
+def change_stream_records_events() -> bool:
+    """Whether the change stream watcher records the product events."""
+    return settings.CHANGE_STREAM_ENABLED and settings.CHANGE_STREAM_EVENTS
+
+
+async def add_events(
+    events: List[ProductEvent],
+    session: Optional[AsyncIOMotorClientSession] = None,
+) -> None:
+    """
+    Record the events of a product write, along with the trace context of
+    the request making it, so consumers continue its trace. Nothing is
+    recorded when the change stream watcher records the events instead.
+
+    Args:
+        events (List[ProductEvent]): The encoded events.
+        session (Optional[AsyncIOMotorClientSession]): The transaction of
+            the product write the events describe.
+    """
+    if change_stream_records_events():
+        return
+    await record_events(events, trace_headers(), session)
+
+
+async def record_events(
+    events: List[ProductEvent],
+    headers: Dict[str, str],
+    session: Optional[AsyncIOMotorClientSession] = None,
+) -> None:
+    """
+    Record product events to publish.
+
+    Args:
+        events (List[ProductEvent]): The encoded events.
+        headers (Dict[str, str]): Headers to publish the events with.
+        session (Optional[AsyncIOMotorClientSession]): The transaction the
+            events are recorded in.
+    """
+    if not events:
+        return
+    await OutboxEvent.insert_many(
+        [
+            OutboxEvent(
+                routing_key=event.routing_key,
+                message_type=event.message_type,
+                payload=event.body,
+                content_type=event.content_type,
+                headers=headers,
+            )
+            for event in events
+        ],
+        session=session,
+    )
+
+
+async def get_pending_events(limit: int) -> List[OutboxEvent]:
+    """Retrieve the oldest events not published yet, in write order."""
+    return (
+        await OutboxEvent.find({"status": "pending"})
+        .sort("+_id")
+        .limit(limit)
+        .to_list()
+    )
+
+
+async def mark_events_published(event_ids: List[PydanticObjectId]) -> None:
+    """Mark events as published with a single `update_many`."""
+    if not event_ids:
+        return
+    await OutboxEvent.get_motor_collection().update_many(
+        {"_id": {"$in": event_ids}},
+        {
+            "$set": {
+                "status": "published",
+                "published_at": datetime.now(timezone.utc),
+            }
+        },
+    )
+
+
+async def get_outbox_lag() -> Tuple[int, float]:
+    """
+    Measure the publishing backlog.
+
+    Returns:
+        Tuple[int, float]: The number of pending events and the age in
+            seconds of the oldest one.
+    """
+    collection = OutboxEvent.get_motor_collection()
+    pending = await collection.count_documents({"status": "pending"})
+    if not pending:
+        return 0, 0.0
+
+    oldest = await collection.find_one(
+        {"status": "pending"}, {"created_at": 1}, sort=[("_id", 1)]
+    )
+    if oldest is None:
+        return pending, 0.0
+    created_at = oldest["created_at"]
+    if created_at.tzinfo is None:
+        created_at = created_at.replace(tzinfo=timezone.utc)
+    return pending, (datetime.now(timezone.utc) - created_at).total_seconds()
@@ -1,6 +1,37 @@
-from typing import Optional, List
-from app.models.product import Product
-from app.schemas.product import ProductCreate, ProductUpdate
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, Optional, List, Set, Tuple, get_args
+from beanie import PydanticObjectId, UpdateResponse
+from beanie.odm.utils.dump import get_dict
+from bson.errors import InvalidId
+from loguru import logger
+from motor.motor_asyncio import AsyncIOMotorClientSession
+from pymongo import DeleteOne, InsertOne, UpdateOne
+from pymongo.errors import BulkWriteError
+from redis.asyncio import Redis
+
+from app.crud import outbox as outbox_crud
+from app.models.product import Product, stored_now
+from app.rabbitmq.events import (
+    ProductEvent,
+    product_created_event,
+    product_deleted_event,
+    product_updated_event,
+)
+from app.redis.facets import (
+    FACET_FIELDS,
+    FacetDelta,
+    apply_facet_delta,
+    facet_delta,
+    merge_facet_deltas,
+    price_bands,
+)
+from app.schemas.product import (
+    ProductCreate,
+    ProductUpdate,
+    ProductRead,
+    ProductBulkOperation,
+    ProductBulkResult,
+)
 
 
 async def get_all_products(skip: int, limit: int) -> List[Product]:
@@ -13,12 +44,96 @@ async def get_products_by_category(
     category: str, skip: int, limit: int
 ) -> List[Product]:
     """Retrieve products by category from the database."""
-    products = await Product.find_all(
+    products = await Product.find(
         Product.category == category, limit=limit, skip=skip
     ).to_list()
     return products
 
 
+async def get_products_after(
+    limit: int,
+    after: Optional[PydanticObjectId] = None,
+    category: Optional[str] = None,
+) -> List[Product]:
+    """
+    Retrieve a page of products ordered by `_id` using keyset pagination.
+
+    Instead of skipping documents, the query resumes with a range predicate
+    on `_id`, so every page costs the same regardless of its depth. Category
+    pages are served by the `category, _id` compound index.
+    """
+    filters = []
+    if category is not None:
+        filters.append(Product.category == category)
+    if after is not None:
+        filters.append(Product.id > after)
+
+    products = await Product.find(*filters).sort(+Product.id).limit(limit).to_list()
+    return products
+
+
+EXPORT_PROJECTION = {
+    "name": 1,
+    "description": 1,
+    "price": 1,
+    "category": 1,
+    "tags": 1,
+    "quantity": 1,
+    "images": 1,
+    "updated_at": 1,
+}
+
+
+async def iter_product_export(
+    batch_size: int,
+    category: Optional[str] = None,
+    updated_since: Optional[datetime] = None,
+) -> AsyncIterator[List[dict]]:
+    """
+    Stream the catalog as batches of raw documents, ordered by `_id`.
+
+    Documents come straight off a Motor cursor with a projection, skipping
+    Beanie model construction, so memory stays bounded by `batch_size`.
+    """
+    query: dict = {}
+    if category is not None:
+        query["category"] = category
+    if updated_since is not None:
+        query["updated_at"] = {"$gte": updated_since}
+
+    cursor = (
+        Product.get_motor_collection()
+        .find(query, EXPORT_PROJECTION)
+        .sort("_id", 1)
+        .batch_size(batch_size)
+    )
+    while documents := await cursor.to_list(length=batch_size):
+        yield documents
+
+
+def _object_ids(product_ids: List[str]) -> List[PydanticObjectId]:
+    """Parse product IDs, dropping the ones that are not valid ObjectIds."""
+    object_ids = []
+    for product_id in product_ids:
+        try:
+            object_ids.append(PydanticObjectId(product_id))
+        except (InvalidId, TypeError):
+            continue
+    return object_ids
+
+
+async def iter_product_prices(batch_size: int) -> AsyncIterator[List[dict]]:
+    """
+    Stream the `_id` and `price` of every product, in batches of raw
+    documents, with a projected scan.
+    """
+    cursor = (
+        Product.get_motor_collection().find({}, {"price": 1}).batch_size(batch_size)
+    )
+    while documents := await cursor.to_list(length=batch_size):
+        yield documents
+
+
 async def get_product_by_id(product_id: str) -> Optional[Product]:
     """Retrieve a product by its ID from the database."""
     product = await Product.get(product_id)
@@ -27,31 +142,438 @@ async def get_product_by_id(product_id: str) -> Optional[Product]:
     return product
 
 
-async def create_product(product: ProductCreate) -> Product:
-    """Create a new product in the database."""
-    new_product = Product(**product.model_dump())
-    await new_product.save()
+async def get_products_by_ids(product_ids: List[str]) -> List[Product]:
+    """
+    Retrieve several products by their IDs with a single `$in` query.
+
+    IDs that are not valid ObjectIds are ignored, so they simply come back
+    as missing. The returned list is in no particular order.
+    """
+    object_ids = _object_ids(product_ids)
+    if not object_ids:
+        return []
+
+    products = await Product.find({"_id": {"$in": object_ids}}).to_list()
+    return products
+
+
+async def get_prices_by_ids(product_ids: List[str]) -> Dict[str, float]:
+    """
+    Retrieve the prices of several products with a single `$in` query that
+    only reads the `price` field, skipping Beanie model construction.
+
+    IDs that are not valid ObjectIds or do not exist are left out.
+    """
+    object_ids = _object_ids(product_ids)
+    if not object_ids:
+        return {}
+
+    cursor = Product.get_motor_collection().find(
+        {"_id": {"$in": object_ids}}, {"price": 1}
+    )
+    return {str(document["_id"]): document["price"] async for document in cursor}
+
+
+async def get_facet_counts() -> Dict[str, Dict[str, int]]:
+    """
+    Count the products of each category, tag and price band with a single
+    aggregation scanning the whole collection.
+
+    Returns:
+        Dict[str, Dict[str, int]]: The product count of each value, by facet.
+    """
+    bands = price_bands()
+    pipeline = [
+        {
+            "$facet": {
+                "category": [
+                    {"$match": {"category": {"$ne": None}}},
+                    {"$group": {"_id": "$category", "count": {"$sum": 1}}},
+                ],
+                "tag": [
+                    # A tag listed twice on a product counts once.
+                    {"$project": {"tags": {"$setUnion": ["$tags", []]}}},
+                    {"$unwind": "$tags"},
+                    {"$group": {"_id": "$tags", "count": {"$sum": 1}}},
+                ],
+                "price_band": [
+                    {"$match": {"price": {"$ne": None}}},
+                    {
+                        "$bucket": {
+                            "groupBy": "$price",
+                            "boundaries": [lower for lower, _ in bands],
+                            "default": "above",
+                            "output": {"count": {"$sum": 1}},
+                        }
+                    },
+                ],
+            }
+        }
+    ]
+    [result] = await Product.get_motor_collection().aggregate(pipeline).to_list(1)
+
+    labels = {lower: label for lower, label in bands}
+    labels["above"] = bands[-1][1]
+    counts: Dict[str, Dict[str, int]] = {}
+    for facet, groups in result.items():
+        counts[facet] = {}
+        for group in groups:
+            value = labels[group["_id"]] if facet == "price_band" else group["_id"]
+            counts[facet][value] = counts[facet].get(value, 0) + group["count"]
+    return counts
+
+
+async def _update_facets(redis: Optional[Redis], delta: FacetDelta) -> None:
+    """
+    Apply the facet count changes of a committed write. A failure only
+    leaves the counts off until the next recompute, so it does not fail
+    the write.
+    """
+    if redis is None or not delta:
+        return
+    try:
+        await apply_facet_delta(redis, delta)
+    except Exception as e:
+        logger.warning(f"Could not update the product facets: {e}")
+
+
+async def create_product(
+    product: ProductCreate, redis: Optional[Redis] = None
+) -> Product:
+    """
+    Create a new product in the database, recording its `product.created`
+    event in the outbox in the same transaction. With `redis`, the product
+    is then added to the facet counts.
+    """
+
+    async def write(session: Optional[AsyncIOMotorClientSession]) -> Product:
+        new_product = Product(**product.model_dump())
+        await new_product.insert(session=session)
+        await outbox_crud.add_events([product_created_event(new_product)], session)
+        return new_product
+
+    new_product = await outbox_crud.run_in_transaction(write)
+    await _update_facets(
+        redis, facet_delta(None, new_product.model_dump(include=FACET_FIELDS))
+    )
     return new_product
 
 
-async def update_product(product_id: str, product: ProductUpdate) -> Optional[Product]:
-    """Update an existing product in the database."""
-    existing_product = await Product.get(product_id)
-    if not existing_product:
-        return None
+def _nullable(field_name: str) -> bool:
+    """Whether a product field may be cleared, i.e. `ProductRead` accepts None."""
+    return type(None) in get_args(ProductRead.model_fields[field_name].annotation)
 
-    for key, value in product.model_dump().items():
-        setattr(existing_product, key, value)
 
-    await existing_product.save()
-    return existing_product
+def _update_fields(product: ProductUpdate) -> dict:
+    """The fields to `$set` for a partial update."""
+    return {
+        key: value
+        for key, value in product.model_dump(exclude_unset=True).items()
+        if value is not None or _nullable(key)
+    }
 
 
-async def delete_product(product_id: str) -> Optional[Product]:
-    """Delete a product from the database."""
-    existing_product = await Product.get(product_id)
-    if not existing_product:
-        return None
+def _written_fields(product: Product, update_data: dict) -> Dict[str, Any]:
+    """The values of the fields an update wrote, as stored in `product`."""
+    return {name: getattr(product, name) for name in update_data}
+
+
+async def update_product(
+    product_id: str, product: ProductUpdate, redis: Optional[Redis] = None
+) -> Optional[Product]:
+    """
+    Partially update an existing product in the database.
+
+    Only the fields the client sent are written, with a single atomic
+    `find_one_and_update` that returns the updated document. Explicit nulls
+    are ignored for fields a product cannot leave empty. The
+    `product.updated` event, built from the returned document, is recorded
+    in the outbox in the same transaction. With `redis`, the facet counts
+    are then updated; when the update writes a facet field, the previous
+    values are read first, in the same transaction.
+    """
+    update_data = _update_fields(product)
+    if not update_data:
+        return await Product.get(product_id)
+    update_data["updated_at"] = stored_now()
+    delta: FacetDelta = {}
+
+    async def write(session: Optional[AsyncIOMotorClientSession]) -> Optional[Product]:
+        nonlocal delta
+        previous = None
+        if redis is not None and FACET_FIELDS & update_data.keys():
+            previous = await Product.get_motor_collection().find_one(
+                {"_id": PydanticObjectId(product_id)},
+                dict.fromkeys(FACET_FIELDS, 1),
+                session=session,
+            )
+        updated_product = await Product.find_one(
+            Product.id == PydanticObjectId(product_id), session=session
+        ).update(
+            {"$set": update_data},
+            session=session,
+            response_type=UpdateResponse.NEW_DOCUMENT,
+        )
+        if updated_product:
+            await outbox_crud.add_events(
+                [
+                    product_updated_event(
+                        product_id, _written_fields(updated_product, update_data)
+                    )
+                ],
+                session,
+            )
+            if previous is not None:
+                delta = facet_delta(
+                    previous, updated_product.model_dump(include=FACET_FIELDS)
+                )
+        return updated_product
+
+    updated_product = await outbox_crud.run_in_transaction(write)
+    await _update_facets(redis, delta)
+    return updated_product
+
+
+async def delete_product(
+    product_id: str, redis: Optional[Redis] = None
+) -> Optional[Product]:
+    """
+    Delete a product from the database, recording its `product.deleted`
+    event in the outbox in the same transaction. With `redis`, the product
+    is then removed from the facet counts.
+    """
+
+    async def write(session: Optional[AsyncIOMotorClientSession]) -> Optional[Product]:
+        existing_product = await Product.get(product_id, session=session)
+        if not existing_product:
+            return None
+
+        await existing_product.delete(session=session)
+        await outbox_crud.add_events([product_deleted_event(product_id)], session)
+        return existing_product
+
+    deleted_product = await outbox_crud.run_in_transaction(write)
+    if deleted_product:
+        await _update_facets(
+            redis, facet_delta(deleted_product.model_dump(include=FACET_FIELDS), None)
+        )
+    return deleted_product
+
+
+def _bulk_write_errors(
+    error: BulkWriteError, request_positions: List[int]
+) -> Dict[int, str]:
+    """Map the write errors of a `bulk_write` to operation positions."""
+    return {
+        request_positions[write_error["index"]]: write_error.get(
+            "errmsg", "Write failed"
+        )
+        for write_error in error.details.get("writeErrors", [])
+    }
+
+
+async def bulk_write_products(
+    operations: List[ProductBulkOperation],
+    offset: int = 0,
+    redis: Optional[Redis] = None,
+) -> Tuple[List[ProductBulkResult], Dict[str, Product]]:
+    """
+    Apply a chunk of create, update and delete operations with a single
+    unordered `bulk_write`.
+
+    Deletes are checked for existence with one `$in` query beforehand and
+    updated products are read back with one `$in` query afterwards, so every
+    operation gets its own result. Operations within a chunk are applied in
+    no particular order.
+
+    The events of the chunk are recorded in the outbox in the same
+    transaction as the writes. In a transaction, a failed write rolls back
+    the whole chunk and every operation in it is reported as an error.
+
+    With `redis`, the facet counts are updated once the chunk is written.
+    The previous facet fields of the deleted products, and of the updated
+    ones whose facets change, are read along with the existence check.
+
+    Args:
+        operations (List[ProductBulkOperation]): The operations to apply.
+        offset (int): Index of the first operation in the whole request.
+        redis (Optional[Redis]): The Redis client holding the facet counts.
+
+    Returns:
+        Tuple[List[ProductBulkResult], Dict[str, Product]]: One result per
+            operation, and the created or updated products by ID.
+    """
+    results: List[Optional[ProductBulkResult]] = [None] * len(operations)
+    requests = []
+    request_positions: List[int] = []
+    created: Dict[int, Product] = {}
+    updates: Dict[int, PydanticObjectId] = {}
+    changes: Dict[int, dict] = {}
+    deletes: Dict[int, PydanticObjectId] = {}
+
+    for position, operation in enumerate(operations):
+        if operation.op == "create":
+            product = Product(**operation.data.model_dump())
+            product.id = PydanticObjectId()
+            created[position] = product
+            requests.append(InsertOne(get_dict(product, to_db=True)))
+            request_positions.append(position)
+            continue
+
+        try:
+            object_id = PydanticObjectId(operation.id)
+        except (InvalidId, TypeError):
+            results[position] = ProductBulkResult(
+                index=offset + position,
+                op=operation.op,
+                id=operation.id,
+                status="not_found",
+            )
+            continue
+
+        if operation.op == "update":
+            updates[position] = object_id
+            update_data = _update_fields(operation.data)
+            if update_data:
+                update_data["updated_at"] = stored_now()
+                changes[position] = update_data
+                requests.append(UpdateOne({"_id": object_id}, {"$set": update_data}))
+                request_positions.append(position)
+        else:
+            deletes[position] = object_id
+            requests.append(DeleteOne({"_id": object_id}))
+            request_positions.append(position)
+
+    collection = Product.get_motor_collection()
+
+    def _bulk_product_id(position: int) -> str:
+        if position in created:
+            return str(created[position].id)
+        return str(updates.get(position) or deletes[position])
+
+    delta: FacetDelta = {}
+
+    async def write(
+        session: Optional[AsyncIOMotorClientSession],
+    ) -> Tuple[List[ProductBulkResult], Dict[str, Product]]:
+        nonlocal delta
+        lookups = list(deletes.values())
+        if redis is not None:
+            lookups += [
+                updates[position]
+                for position, change in changes.items()
+                if FACET_FIELDS & change.keys()
+            ]
+        previous: Dict[PydanticObjectId, dict] = {}
+        if lookups:
+            cursor = collection.find(
+                {"_id": {"$in": lookups}},
+                dict.fromkeys(FACET_FIELDS, 1),
+                session=session,
+            )
+            previous = {document["_id"]: document async for document in cursor}
+        existing_deletes = set(deletes.values()) & previous.keys()
+
+        errors: Dict[int, str] = {}
+        if requests:
+            try:
+                await collection.bulk_write(requests, ordered=False, session=session)
+            except BulkWriteError as e:
+                if session is not None:
+                    raise
+                errors = _bulk_write_errors(e, request_positions)
+
+        updated: Dict[PydanticObjectId, Product] = {}
+        if updates:
+            updated = {
+                product.id: product
+                for product in await Product.find(
+                    {"_id": {"$in": list(updates.values())}}, session=session
+                ).to_list()
+            }
+
+        chunk_results = list(results)
+        written: Dict[str, Product] = {}
+        events: List[ProductEvent] = []
+        deltas: List[FacetDelta] = []
+        counted_deletes: Set[PydanticObjectId] = set()
+        for position, operation in enumerate(operations):
+            if chunk_results[position] is not None:
+                continue
+
+            product_id = _bulk_product_id(position)
+            if operation.op == "create":
+                product, status = created[position], "created"
+            elif operation.op == "update":
+                product = updated.get(updates[position])
+                status = "updated" if product else "not_found"
+            else:
+                product = None
+                status = (
+                    "deleted" if deletes[position] in existing_deletes else "not_found"
+                )
+
+            if position in errors:
+                chunk_results[position] = ProductBulkResult(
+                    index=offset + position,
+                    op=operation.op,
+                    id=product_id,
+                    status="error",
+                    error=errors[position],
+                )
+                continue
+
+            if status == "created":
+                events.append(product_created_event(product))
+                deltas.append(
+                    facet_delta(None, product.model_dump(include=FACET_FIELDS))
+                )
+            elif status == "updated" and position in changes:
+                events.append(
+                    product_updated_event(
+                        product_id, _written_fields(product, changes[position])
+                    )
+                )
+                if updates[position] in previous:
+                    deltas.append(
+                        facet_delta(
+                            previous[updates[position]],
+                            product.model_dump(include=FACET_FIELDS),
+                        )
+                    )
+            elif status == "deleted":
+                events.append(product_deleted_event(product_id))
+                # A product deleted twice in the chunk is only counted out once.
+                if deletes[position] not in counted_deletes:
+                    counted_deletes.add(deletes[position])
+                    deltas.append(facet_delta(previous[deletes[position]], None))
+            if product is not None and status != "not_found":
+                written[product_id] = product
+            chunk_results[position] = ProductBulkResult(
+                index=offset + position, op=operation.op, id=product_id, status=status
+            )
+
+        await outbox_crud.add_events(events, session)
+        delta = merge_facet_deltas(*deltas)
+        return chunk_results, written
 
-    await existing_product.delete()
-    return existing_product
+    try:
+        chunk_results, written = await outbox_crud.run_in_transaction(write)
+    except BulkWriteError as e:
+        # A write error aborts the whole transaction: nothing in the chunk
+        # was applied.
+        errors = _bulk_write_errors(e, request_positions)
+        for position, operation in enumerate(operations):
+            if results[position] is None:
+                results[position] = ProductBulkResult(
+                    index=offset + position,
+                    op=operation.op,
+                    id=_bulk_product_id(position),
+                    status="error",
+                    error=errors.get(
+                        position, "Rolled back with the rest of the chunk"
+                    ),
+                )
+        return results, {}
+    await _update_facets(redis, delta)
+    return chunk_results, written
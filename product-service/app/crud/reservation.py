@@ -0,0 +1,317 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+
+from beanie import PydanticObjectId, UpdateResponse
+from bson.errors import InvalidId
+from motor.motor_asyncio import AsyncIOMotorClientSession
+
+from app.core.config import settings
+from app.crud import outbox as outbox_crud
+from app.models.product import Product, stored_now
+from app.models.reservation import Reservation, ReservationStatus
+from app.rabbitmq.events import product_updated_event
+from app.schemas.reservation import ReservationItem
+
+
+class ReservationError(Exception):
+    """Base class for reservation failures."""
+
+
+class ProductNotFoundError(ReservationError):
+    """Raised when a reserved product does not exist."""
+
+    def __init__(self, product_id: str):
+        super().__init__(f"Product {product_id} not found")
+        self.product_id = product_id
+
+
+class InsufficientStockError(ReservationError):
+    """Raised when a product does not have enough units left."""
+
+    def __init__(self, product_id: str):
+        super().__init__(f"Not enough stock for product {product_id}")
+        self.product_id = product_id
+
+
+def _object_id(value: str) -> Optional[PydanticObjectId]:
+    try:
+        return PydanticObjectId(value)
+    except (InvalidId, TypeError):
+        return None
+
+
+async def _write_stock(
+    product_id: PydanticObjectId,
+    delta: int,
+    session: Optional[AsyncIOMotorClientSession],
+) -> Optional[Product]:
+    """
+    Atomically add `delta` units to a product's quantity with a conditional
+    `$inc`. A negative delta only applies if at least that many units are
+    in stock, so concurrent reservations can never oversell. The
+    `product.updated` event carrying the new quantity is recorded in the
+    outbox with the same `session`.
+
+    Returns:
+        Optional[Product]: The updated product, or None if it does not exist
+            or has too few units.
+    """
+    query = {"_id": product_id}
+    if delta < 0:
+        query["quantity"] = {"$gte": -delta}
+    product = await Product.find_one(query, session=session).update(
+        {
+            "$inc": {"quantity": delta},
+            "$set": {"updated_at": stored_now()},
+        },
+        session=session,
+        response_type=UpdateResponse.NEW_DOCUMENT,
+    )
+    if product is not None:
+        await outbox_crud.add_events(
+            [
+                product_updated_event(
+                    str(product.id),
+                    {"quantity": product.quantity, "updated_at": product.updated_at},
+                )
+            ],
+            session,
+        )
+    return product
+
+
+async def _reserve_line(
+    product_id: PydanticObjectId, quantity: int, expires_at: datetime
+) -> Tuple[Optional[Reservation], Optional[Product]]:
+    """
+    Take `quantity` units of a product and record their reservation in one
+    transaction, so units are never taken without a record the sweeper can
+    expire.
+
+    Returns:
+        Tuple[Optional[Reservation], Optional[Product]]: The reservation and
+            the updated product, or Nones if the product does not exist or
+            has too few units.
+    """
+
+    async def write(
+        session: Optional[AsyncIOMotorClientSession],
+    ) -> Tuple[Optional[Reservation], Optional[Product]]:
+        product = await _write_stock(product_id, -quantity, session)
+        if product is None:
+            return None, None
+        reservation = Reservation(
+            product_id=product_id, quantity=quantity, expires_at=expires_at
+        )
+        try:
+            await reservation.insert(session=session)
+        except Exception:
+            # Without a transaction the units were already taken.
+            if session is None:
+                await _write_stock(product_id, quantity, None)
+            raise
+        return reservation, product
+
+    return await outbox_crud.run_in_transaction(write)
+
+
+async def reserve_stock(
+    items: List[ReservationItem], ttl_seconds: Optional[int] = None
+) -> Tuple[List[Reservation], Dict[str, Product]]:
+    """
+    Reserve units of one or more products, all or nothing.
+
+    Every line is taken concurrently, in its own transaction with a
+    conditional `$inc`, its reservation record and a `product.updated`
+    event with the new quantity. The reservations expire after
+    `ttl_seconds` (default `RESERVATION_TTL`). If any line fails, the lines
+    already reserved are released before raising.
+
+    Args:
+        items (List[ReservationItem]): The products and quantities to reserve.
+        ttl_seconds (Optional[int]): How long the units are held.
+
+    Returns:
+        Tuple[List[Reservation], Dict[str, Product]]: One reservation per
+            line, in order, and the updated products by ID.
+
+    Raises:
+        ProductNotFoundError: A product does not exist.
+        InsufficientStockError: A product has too few units left.
+    """
+    product_ids = []
+    for item in items:
+        product_id = _object_id(item.product_id)
+        if product_id is None:
+            raise ProductNotFoundError(item.product_id)
+        product_ids.append(product_id)
+
+    expires_at = datetime.now(timezone.utc) + timedelta(
+        seconds=ttl_seconds or settings.RESERVATION_TTL
+    )
+    lines = await asyncio.gather(
+        *(
+            _reserve_line(product_id, item.quantity, expires_at)
+            for product_id, item in zip(product_ids, items)
+        ),
+        return_exceptions=True,
+    )
+
+    failed = next(
+        (
+            i
+            for i, line in enumerate(lines)
+            if isinstance(line, BaseException) or line[0] is None
+        ),
+        None,
+    )
+    if failed is not None:
+        await asyncio.gather(
+            *(
+                _settle(line[0].id, "released")
+                for line in lines
+                if not isinstance(line, BaseException) and line[0] is not None
+            )
+        )
+        if isinstance(lines[failed], BaseException):
+            raise lines[failed]
+        if await Product.find_one({"_id": product_ids[failed]}):
+            raise InsufficientStockError(items[failed].product_id)
+        raise ProductNotFoundError(items[failed].product_id)
+
+    reservations = [reservation for reservation, _ in lines]
+    # With the same product on several lines, keep its last state.
+    products: Dict[str, Product] = {}
+    for _, product in lines:
+        current = products.get(str(product.id))
+        if current is None or product.quantity < current.quantity:
+            products[str(product.id)] = product
+    return reservations, products
+
+
+async def _settle(
+    reservation_id: PydanticObjectId,
+    status: ReservationStatus,
+    product_id: Optional[PydanticObjectId] = None,
+) -> Tuple[Optional[Reservation], Optional[Product]]:
+    """
+    Move an active reservation to its final `status`.
+
+    The status transition is a single conditional update, so however many
+    callers race to release or expire a reservation, its units go back to
+    the product exactly once. Committed units stay taken. The transition,
+    the returned units and their event are written in one transaction.
+    """
+    query = {"_id": reservation_id, "status": "active"}
+    if product_id is not None:
+        query["product_id"] = product_id
+    if status == "committed":
+        query["expires_at"] = {"$gt": datetime.now(timezone.utc)}
+
+    async def write(
+        session: Optional[AsyncIOMotorClientSession],
+    ) -> Tuple[Optional[Reservation], Optional[Product]]:
+        reservation = await Reservation.find_one(query, session=session).update(
+            {"$set": {"status": status}},
+            session=session,
+            response_type=UpdateResponse.NEW_DOCUMENT,
+        )
+        if reservation is None or status == "committed":
+            return reservation, None
+        product = await _write_stock(
+            reservation.product_id, reservation.quantity, session
+        )
+        return reservation, product
+
+    return await outbox_crud.run_in_transaction(write)
+
+
+async def _settle_many(
+    reservation_ids: List[PydanticObjectId],
+    status: ReservationStatus,
+    product_id: Optional[PydanticObjectId] = None,
+) -> Tuple[List[Reservation], Dict[str, Product]]:
+    settled = await asyncio.gather(
+        *(
+            _settle(reservation_id, status, product_id)
+            for reservation_id in dict.fromkeys(reservation_ids)
+        )
+    )
+
+    reservations: List[Reservation] = []
+    # With the same product in several reservations, keep its last state.
+    products: Dict[str, Product] = {}
+    for reservation, product in settled:
+        if reservation is not None:
+            reservations.append(reservation)
+        if product is not None:
+            current = products.get(str(product.id))
+            if current is None or product.quantity > current.quantity:
+                products[str(product.id)] = product
+    return reservations, products
+
+
+async def release_reservations(
+    reservation_ids: List[str], product_id: Optional[str] = None
+) -> Tuple[List[Reservation], Dict[str, Product]]:
+    """
+    Release active reservations, returning their units to the products.
+
+    Args:
+        reservation_ids (List[str]): The reservations to release. Unknown
+            or already settled ones are skipped.
+        product_id (Optional[str]): Only release reservations of this product.
+
+    Returns:
+        Tuple[List[Reservation], Dict[str, Product]]: The released
+            reservations and the updated products by ID.
+    """
+    object_ids = [oid for oid in map(_object_id, reservation_ids) if oid]
+    product_oid = None
+    if product_id is not None:
+        product_oid = _object_id(product_id)
+        if product_oid is None:
+            return [], {}
+    return await _settle_many(object_ids, "released", product_oid)
+
+
+async def commit_reservations(reservation_ids: List[str]) -> List[Reservation]:
+    """
+    Commit active, unexpired reservations, making the sale of their units
+    final.
+
+    Args:
+        reservation_ids (List[str]): The reservations to commit. Unknown,
+            expired or already settled ones are skipped.
+
+    Returns:
+        List[Reservation]: The committed reservations.
+    """
+    object_ids = [oid for oid in map(_object_id, reservation_ids) if oid]
+    reservations, _ = await _settle_many(object_ids, "committed")
+    return reservations
+
+
+async def expire_reservations(
+    limit: int = settings.RESERVATION_SWEEP_BATCH_SIZE,
+) -> Tuple[List[Reservation], Dict[str, Product]]:
+    """
+    Expire active reservations past their `expires_at`, returning their
+    units to the products.
+
+    Args:
+        limit (int): Maximum number of reservations to expire in one call.
+
+    Returns:
+        Tuple[List[Reservation], Dict[str, Product]]: The expired
+            reservations and the updated products by ID.
+    """
+    expired = (
+        await Reservation.find(
+            {"status": "active", "expires_at": {"$lte": datetime.now(timezone.utc)}}
+        )
+        .limit(limit)
+        .to_list()
+    )
+    return await _settle_many([reservation.id for reservation in expired], "expired")
@@ -0,0 +1,66 @@
+import argparse
+import asyncio
+
+from loguru import logger
+
+from app.core.config import settings
+from app.core.database import connect_db
+from app.core.logger import configure_logging
+from app.importer.importer import ProductImporter, detect_format
+from app.redis.lifespan import connect_redis
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m app.importer",
+        description="Import a product catalog from a CSV or NDJSON file.",
+    )
+    parser.add_argument("path", help="File to import")
+    parser.add_argument(
+        "--format",
+        choices=["csv", "ndjson"],
+        help="Input format (default: guessed from the file extension)",
+    )
+    parser.add_argument(
+        "--rejects",
+        help="Where to write rejected rows (default: <path>.rejects.ndjson)",
+    )
+    parser.add_argument(
+        "--chunk-size", type=int, default=settings.PRODUCT_IMPORT_CHUNK_SIZE
+    )
+    parser.add_argument(
+        "--concurrency", type=int, default=settings.PRODUCT_IMPORT_CONCURRENCY
+    )
+    return parser.parse_args()
+
+
+async def main() -> None:
+    args = parse_args()
+    fmt = args.format or detect_format(args.path)
+    rejects_path = args.rejects or f"{args.path}.rejects.ndjson"
+
+    client = await connect_db()
+    redis = connect_redis()
+    try:
+        with open(args.path, "rb") as stream, open(rejects_path, "w") as rejects:
+            importer = ProductImporter(
+                rejects,
+                chunk_size=args.chunk_size,
+                concurrency=args.concurrency,
+                redis=redis,
+            )
+            report = await importer.run(stream, fmt)
+    finally:
+        await redis.close()
+        client.close()
+
+    report.rejects_file = rejects_path
+    logger.info(
+        f"Imported {report.inserted}/{report.rows} rows in {report.seconds:.1f}s "
+        f"({report.rows_per_second:.0f} rows/s), {report.rejected} rejected."
+    )
+
+
+if __name__ == "__main__":
+    configure_logging()
+    asyncio.run(main())
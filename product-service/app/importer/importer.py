@@ -0,0 +1,264 @@
+import asyncio
+import codecs
+import csv
+import json
+import time
+from itertools import islice
+from typing import BinaryIO, Dict, Iterator, List, Literal, Optional, TextIO, Tuple
+
+from loguru import logger
+from motor.motor_asyncio import AsyncIOMotorClientSession
+from pydantic import ValidationError
+from pymongo.errors import BulkWriteError
+from redis.asyncio import Redis
+
+from app.core.config import settings
+from app.crud import outbox as outbox_crud
+from app.models.product import Product, stored_now
+from app.rabbitmq.events import product_created_event
+from app.redis.facets import apply_facet_delta, facet_delta, merge_facet_deltas
+from app.schemas.product import ProductCreate, ProductImportReport
+
+ImportFormat = Literal["csv", "ndjson"]
+
+# CSV cells holding several values separate them with this character.
+CSV_LIST_SEPARATOR = "|"
+CSV_LIST_FIELDS = ("tags", "images")
+
+# Log progress every this many rows.
+PROGRESS_EVERY = 100_000
+
+# Row number and either the parsed row or the reason it could not be parsed.
+ParsedRow = Tuple[int, dict | str]
+
+
+def _iter_csv(text: TextIO) -> Iterator[ParsedRow]:
+    """Parse CSV rows, dropping empty cells so schema defaults apply."""
+    reader = csv.DictReader(text)
+    for row_number, row in enumerate(reader, start=1):
+        row = {key: value for key, value in row.items() if key and value}
+        for field in CSV_LIST_FIELDS:
+            if field in row:
+                row[field] = [
+                    value for value in row[field].split(CSV_LIST_SEPARATOR) if value
+                ]
+        yield row_number, row
+
+
+def _iter_ndjson(text: TextIO) -> Iterator[ParsedRow]:
+    """Parse one JSON object per line, skipping blank lines."""
+    for row_number, line in enumerate(text, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield row_number, f"Invalid JSON: {e}"
+            continue
+        if not isinstance(row, dict):
+            yield row_number, "Expected a JSON object"
+            continue
+        yield row_number, row
+
+
+def _validate_chunk(
+    rows: Iterator[ParsedRow], chunk_size: int
+) -> Tuple[int, List[dict], List[Tuple[int, dict]], List[dict]]:
+    """
+    Read and validate the next `chunk_size` rows.
+
+    Returns:
+        The number of rows read, the documents to insert, their row numbers
+        with the raw rows, and the rejects.
+    """
+    documents: List[dict] = []
+    accepted: List[Tuple[int, dict]] = []
+    rejects: List[dict] = []
+    count = 0
+    now = stored_now()
+    for row_number, row in islice(rows, chunk_size):
+        count += 1
+        if isinstance(row, str):
+            rejects.append({"row": row_number, "error": row})
+            continue
+        try:
+            product = ProductCreate.model_validate(row)
+        except ValidationError as e:
+            rejects.append(
+                {"row": row_number, "error": e.errors(include_url=False), "data": row}
+            )
+            continue
+        documents.append({**product.model_dump(), "updated_at": now})
+        accepted.append((row_number, row))
+    return count, documents, accepted, rejects
+
+
+class ProductImporter:
+    """
+    Streaming catalog import.
+
+    The input is parsed and validated against `ProductCreate` one chunk at a
+    time in a worker thread, and each valid chunk goes in with an unordered
+    `insert_many`. At most `concurrency` inserts are in flight; once they are
+    all busy, parsing waits for one to finish, so memory stays bounded by
+    roughly `chunk_size * (concurrency + 1)` rows whatever the file size.
+
+    Each chunk records the `product.created` events of its products in the
+    outbox in the same transaction as the insert, and with `redis`, adds
+    them to the facet counts once committed. In a transaction, a failed
+    insert rolls back the chunk: the failed rows are rejected and the rest
+    of the chunk is inserted again.
+
+    Rows failing validation or insertion are written to `rejects` as
+    NDJSON, one `{"row", "error", "data"}` object per line.
+    """
+
+    def __init__(
+        self,
+        rejects: TextIO,
+        chunk_size: int = settings.PRODUCT_IMPORT_CHUNK_SIZE,
+        concurrency: int = settings.PRODUCT_IMPORT_CONCURRENCY,
+        redis: Optional[Redis] = None,
+    ):
+        self.rejects = rejects
+        self.chunk_size = chunk_size
+        self.concurrency = concurrency
+        self.redis = redis
+        self.report = ProductImportReport()
+
+    def _reject(self, rejects: List[dict]) -> None:
+        for reject in rejects:
+            self.rejects.write(json.dumps(reject, default=str) + "\n")
+        self.report.rejected += len(rejects)
+
+    def _reject_failed(
+        self, error: BulkWriteError, accepted: List[Tuple[int, dict]]
+    ) -> Dict[int, str]:
+        """Reject the rows an `insert_many` failed on, by their chunk index."""
+        failed = {
+            write_error["index"]: write_error.get("errmsg", "Insert failed")
+            for write_error in error.details.get("writeErrors", [])
+        }
+        self._reject(
+            [
+                {
+                    "row": accepted[index][0],
+                    "error": message,
+                    "data": accepted[index][1],
+                }
+                for index, message in failed.items()
+            ]
+        )
+        return failed
+
+    async def _insert(
+        self, documents: List[dict], accepted: List[Tuple[int, dict]]
+    ) -> None:
+        async def write(session: Optional[AsyncIOMotorClientSession]) -> List[dict]:
+            try:
+                await Product.get_motor_collection().insert_many(
+                    documents, ordered=False, session=session
+                )
+                inserted = documents
+            except BulkWriteError as e:
+                if session is not None:
+                    raise
+                failed = self._reject_failed(e, accepted)
+                inserted = [
+                    document
+                    for index, document in enumerate(documents)
+                    if index not in failed
+                ]
+            # insert_many sets the `_id` of each document.
+            await outbox_crud.add_events(
+                [
+                    product_created_event(Product.model_validate(document))
+                    for document in inserted
+                ],
+                session,
+            )
+            return inserted
+
+        inserted: List[dict] = []
+        while documents:
+            try:
+                inserted = await outbox_crud.run_in_transaction(write)
+                break
+            except BulkWriteError as e:
+                failed = self._reject_failed(e, accepted)
+                if not failed:
+                    raise
+                documents = [
+                    document
+                    for index, document in enumerate(documents)
+                    if index not in failed
+                ]
+                accepted = [
+                    row for index, row in enumerate(accepted) if index not in failed
+                ]
+
+        self.report.inserted += len(inserted)
+        if self.redis is not None:
+            delta = merge_facet_deltas(
+                *(facet_delta(None, document) for document in inserted)
+            )
+            try:
+                await apply_facet_delta(self.redis, delta)
+            except Exception as e:
+                logger.warning(f"Could not update the product facets: {e}")
+
+    async def run(self, stream: BinaryIO, fmt: ImportFormat) -> ProductImportReport:
+        """
+        Import every row of `stream`.
+
+        Args:
+            stream (BinaryIO): The file to import.
+            fmt (ImportFormat): Either "csv" or "ndjson".
+
+        Returns:
+            ProductImportReport: Counts, duration and throughput.
+        """
+        text = codecs.getreader("utf-8-sig")(stream)
+        rows = _iter_csv(text) if fmt == "csv" else _iter_ndjson(text)
+
+        slots = asyncio.Semaphore(self.concurrency)
+        inserts: List[asyncio.Task] = []
+        started = time.perf_counter()
+        next_progress = PROGRESS_EVERY
+        while True:
+            count, documents, accepted, rejects = await asyncio.to_thread(
+                _validate_chunk, rows, self.chunk_size
+            )
+            if not count:
+                break
+            self.report.rows += count
+            self._reject(rejects)
+            if not documents:
+                continue
+
+            await slots.acquire()
+            task = asyncio.create_task(self._insert(documents, accepted))
+            inserts.append(task)
+            task.add_done_callback(lambda _: slots.release())
+
+            if self.report.rows >= next_progress:
+                next_progress += PROGRESS_EVERY
+                elapsed = time.perf_counter() - started
+                logger.info(
+                    f"Read {self.report.rows} rows "
+                    f"({self.report.rows / elapsed:.0f} rows/s)."
+                )
+        await asyncio.gather(*inserts)
+
+        self.report.seconds = time.perf_counter() - started
+        self.report.rows_per_second = (
+            self.report.rows / self.report.seconds if self.report.seconds else 0.0
+        )
+        return self.report
+
+
+def detect_format(filename: str | None) -> ImportFormat:
+    """Guess the import format from a file name, defaulting to NDJSON."""
+    if filename and filename.lower().endswith(".csv"):
+        return "csv"
+    return "ndjson"
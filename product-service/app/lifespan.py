@@ -2,10 +2,58 @@ from typing import AsyncGenerator
 from fastapi import FastAPI
 from contextlib import asynccontextmanager
 
-from app.core.database import close_db, init_db
-from app.redis.lifespan import close_redis, init_redis
-from app.rabbitmq.lifespan import close_rabbitmq, init_rabbitmq
+from app.core.database import check_db, close_db, init_db
+from app.core.startup import Phase, close_phases, start_phases
+from app.redis.lifespan import check_redis, close_redis, init_redis
+from app.rabbitmq.lifespan import check_rabbitmq, close_rabbitmq, init_rabbitmq
 from app.proto.price_service import init_price_service, close_price_service
+from app.core.reservations import init_reservation_sweeper, close_reservation_sweeper
+from app.core.outbox import init_outbox_relay, close_outbox_relay
+from app.core.facets import init_facets_recompute, close_facets_recompute
+from app.core.change_stream import (
+    close_change_stream_watcher,
+    init_change_stream_watcher,
+)
+
+PHASES = [
+    Phase("mongodb", init_db, close_db, check=check_db),
+    Phase("redis", init_redis, close_redis, check=check_redis),
+    # Events wait in the outbox while RabbitMQ is down, so it is not required:
+    # the service starts without it and the outbox relay starts once it is up.
+    Phase(
+        "rabbitmq", init_rabbitmq, close_rabbitmq, check=check_rabbitmq, required=False
+    ),
+    Phase(
+        "outbox relay",
+        init_outbox_relay,
+        close_outbox_relay,
+        depends_on=("mongodb", "redis", "rabbitmq"),
+    ),
+    Phase(
+        "price service",
+        init_price_service,
+        close_price_service,
+        depends_on=("mongodb", "redis"),
+    ),
+    Phase(
+        "change stream watcher",
+        init_change_stream_watcher,
+        close_change_stream_watcher,
+        depends_on=("mongodb", "redis"),
+    ),
+    Phase(
+        "facets recompute",
+        init_facets_recompute,
+        close_facets_recompute,
+        depends_on=("mongodb", "redis"),
+    ),
+    Phase(
+        "reservation sweeper",
+        init_reservation_sweeper,
+        close_reservation_sweeper,
+        depends_on=("mongodb", "redis"),
+    ),
+]
 
 
 @asynccontextmanager
@@ -21,14 +69,8 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     Returns:
         function that actually performs actions.
     """
-    await init_db(app)
-    await init_redis(app)
-    await init_rabbitmq(app)
-    await init_price_service(app)
+    await start_phases(app, PHASES)
     try:
         yield
     finally:
-        await close_db(app)
-        await close_redis(app)
-        await close_rabbitmq(app)
-        await close_price_service(app)
+        await close_phases(app)
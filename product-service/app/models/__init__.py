@@ -1,3 +1,6 @@
 from app.models.product import Product
+from app.models.reservation import Reservation
+from app.models.outbox import OutboxEvent
+from app.models.change_stream import ChangeStreamCheckpoint
 
-__all__ = ["Product"]
+__all__ = ["Product", "Reservation", "OutboxEvent", "ChangeStreamCheckpoint"]
@@ -0,0 +1,18 @@
+from datetime import datetime, timezone
+from typing import Any, Dict
+from pydantic import Field
+from beanie import Document
+
+
+class ChangeStreamCheckpoint(Document):
+    id: str = Field(..., description="Name of the watched collection")
+    resume_token: Dict[str, Any] = Field(
+        ..., description="Token of the last change handled"
+    )
+    updated_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc),
+        description="When the token was saved",
+    )
+
+    class Settings:
+        name = "change_stream_checkpoints"
@@ -0,0 +1,42 @@
+from datetime import datetime, timezone
+from typing import Dict, Literal, Optional
+from pydantic import Field
+from beanie import Document, PydanticObjectId
+from pymongo import ASCENDING, IndexModel
+
+from app.core.config import settings
+
+OutboxStatus = Literal["pending", "published"]
+
+
+class OutboxEvent(Document):
+    routing_key: str = Field(..., description="Routing key of the event")
+    message_type: Optional[str] = Field(None, description="Type of the event")
+    payload: bytes = Field(..., description="Encoded event")
+    content_type: str = Field("application/json", description="Event encoding")
+    headers: Dict[str, str] = Field(
+        default_factory=dict, description="Trace context of the write"
+    )
+    status: OutboxStatus = Field("pending", description="Delivery state")
+    created_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc),
+        description="Creation timestamp",
+    )
+    published_at: Optional[datetime] = Field(
+        None, description="When the broker confirmed the event"
+    )
+
+    class Settings:
+        name = "outbox"
+        indexes = [
+            # Reads the pending events in write order.
+            IndexModel([("status", ASCENDING), ("_id", ASCENDING)]),
+            # Lets MongoDB delete events once they are published.
+            IndexModel(
+                [("published_at", ASCENDING)],
+                expireAfterSeconds=settings.OUTBOX_RETENTION,
+            ),
+        ]
+
+    class Config:
+        json_encoders = {PydanticObjectId: str}
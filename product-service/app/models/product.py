@@ -1,6 +1,17 @@
+from datetime import datetime, timezone
 from typing import Optional, List
 from pydantic import Field
 from beanie import Document, PydanticObjectId
+from pymongo import ASCENDING, IndexModel
+
+
+def stored_now() -> datetime:
+    """
+    The current UTC time at the millisecond precision MongoDB stores, so a
+    product returned or cached on write matches the one read back later.
+    """
+    now = datetime.now(timezone.utc)
+    return now.replace(microsecond=now.microsecond // 1000 * 1000)
 
 
 class Product(Document):
@@ -15,6 +26,22 @@ class Product(Document):
     images: Optional[List[str]] = Field(
         default_factory=list, description="List of image URLs for the product"
     )
+    updated_at: datetime = Field(
+        default_factory=stored_now,
+        description="Last update timestamp",
+    )
+
+    class Settings:
+        indexes = [
+            # Serves category pages in `_id` order.
+            IndexModel([("category", ASCENDING), ("_id", ASCENDING)]),
+            # Serves exports of recent changes and sorting by recency.
+            IndexModel([("updated_at", ASCENDING)]),
+            # Serves price ranges and sorting by price.
+            IndexModel([("price", ASCENDING)]),
+            # Multikey index serving tag lookups.
+            IndexModel([("tags", ASCENDING)]),
+        ]
 
     class Config:
         json_encoders = {PydanticObjectId: str}
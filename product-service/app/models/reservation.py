@@ -0,0 +1,37 @@
+from datetime import datetime, timezone
+from typing import Literal
+from pydantic import Field
+from beanie import Document, PydanticObjectId
+from pymongo import ASCENDING, IndexModel
+
+from app.core.config import settings
+
+ReservationStatus = Literal["active", "released", "committed", "expired"]
+
+
+class Reservation(Document):
+    product_id: PydanticObjectId = Field(..., description="The reserved product")
+    quantity: int = Field(..., description="Number of units held")
+    status: ReservationStatus = Field("active", description="Reservation state")
+    created_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc),
+        description="Creation timestamp",
+    )
+    expires_at: datetime = Field(
+        ..., description="When the held units go back to the product"
+    )
+
+    class Settings:
+        name = "reservations"
+        indexes = [
+            # Finds the active reservations past their expiry.
+            IndexModel([("status", ASCENDING), ("expires_at", ASCENDING)]),
+            # Lets MongoDB delete old records once they are settled.
+            IndexModel(
+                [("expires_at", ASCENDING)],
+                expireAfterSeconds=settings.RESERVATION_RETENTION,
+            ),
+        ]
+
+    class Config:
+        json_encoders = {PydanticObjectId: str}
@@ -0,0 +1,111 @@
+"""
+Standalone price gRPC server.
+
+Runs the price, inventory and health gRPC services outside the HTTP app, in
+one or more processes sharing a port through SO_REUSEPORT, so price lookups
+neither compete with HTTP traffic for the event loop nor stay on one core.
+Each process has its own MongoDB and Redis clients and its own price table.
+
+Usage:
+    python -m app.price_server [--workers N]
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import signal
+from contextlib import suppress
+
+from loguru import logger
+
+from app.core.config import settings
+from app.core.database import connect_db
+from app.core.logger import configure_logging
+from app.core.tracing import configure_tracing
+from app.proto.price_service import create_grpc_server
+from app.redis.lifespan import connect_redis
+from app.redis.prices import listen_for_price_changes
+
+
+async def serve() -> None:
+    """Run one server process until it receives SIGTERM or SIGINT."""
+    mongo_client = await connect_db()
+    redis = connect_redis()
+    price_listener = asyncio.create_task(listen_for_price_changes(redis))
+    server, health_servicer = await create_grpc_server(redis)
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(signum, stop.set)
+
+    await server.start()
+    logger.info(
+        f"Price Service gRPC worker {os.getpid()} listening on "
+        f"{settings.PRICE_SERVICE_GRPC_HOST}:{settings.PRICE_SERVICE_GRPC_PORT}"
+    )
+    try:
+        await stop.wait()
+    finally:
+        await health_servicer.enter_graceful_shutdown()
+        await server.stop(settings.PRICE_SERVICE_SHUTDOWN_GRACE)
+        price_listener.cancel()
+        with suppress(asyncio.CancelledError):
+            await price_listener
+        await redis.close()
+        mongo_client.close()
+        logger.info(f"Price Service gRPC worker {os.getpid()} stopped.")
+
+
+def run_worker() -> None:
+    """Entry point of a server process."""
+    configure_logging()
+    configure_tracing()
+    asyncio.run(serve())
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m app.price_server",
+        description="Run the price gRPC server in one or more processes.",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=settings.PRICE_SERVICE_WORKERS,
+        help="Number of server processes (default: one per CPU)",
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    workers = args.workers or os.cpu_count() or 1
+    if workers == 1:
+        run_worker()
+        return
+
+    # gRPC does not survive fork(), so every worker starts from a fresh
+    # interpreter and binds the port itself.
+    context = multiprocessing.get_context("spawn")
+    processes = [
+        context.Process(target=run_worker, name=f"price-server-{i}")
+        for i in range(workers)
+    ]
+    for process in processes:
+        process.start()
+
+    def stop_workers(signum, frame):
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+
+    signal.signal(signal.SIGTERM, stop_workers)
+    signal.signal(signal.SIGINT, stop_workers)
+    for process in processes:
+        process.join()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+# Generated by the gRPC Python protocol compiler plugin. DO NOT EDIT!
+"""Client and server classes corresponding to protobuf-defined services."""
+import grpc
+import warnings
+
+from app.proto import inventory_pb2 as inventory__pb2
+
+GRPC_GENERATED_VERSION = "1.73.0"
+GRPC_VERSION = grpc.__version__
+_version_not_supported = False
+
+try:
+    from grpc._utilities import first_version_is_lower
+
+    _version_not_supported = first_version_is_lower(
+        GRPC_VERSION, GRPC_GENERATED_VERSION
+    )
+except ImportError:
+    _version_not_supported = True
+
+if _version_not_supported:
+    raise RuntimeError(
+        f"The grpc package installed is at version {GRPC_VERSION},"
+        + f" but the generated code in inventory_pb2_grpc.py depends on"
+        + f" grpcio>={GRPC_GENERATED_VERSION}."
+        + f" Please upgrade your grpc module to grpcio>={GRPC_GENERATED_VERSION}"
+        + f" or downgrade your generated code using grpcio-tools<={GRPC_VERSION}."
+    )
+
+
+class InventoryServiceStub(object):
+    """Missing associated documentation comment in .proto file."""
+
+    def __init__(self, channel):
+        """Constructor.
+
+        Args:
+            channel: A grpc.Channel.
+        """
+        self.Reserve = channel.unary_unary(
+            "/inventory.InventoryService/Reserve",
+            request_serializer=inventory__pb2.ReserveRequest.SerializeToString,
+            response_deserializer=inventory__pb2.ReserveResponse.FromString,
+            _registered_method=True,
+        )
+        self.Release = channel.unary_unary(
+            "/inventory.InventoryService/Release",
+            request_serializer=inventory__pb2.ReleaseRequest.SerializeToString,
+            response_deserializer=inventory__pb2.ReleaseResponse.FromString,
+            _registered_method=True,
+        )
+        self.Commit = channel.unary_unary(
+            "/inventory.InventoryService/Commit",
+            request_serializer=inventory__pb2.CommitRequest.SerializeToString,
+            response_deserializer=inventory__pb2.CommitResponse.FromString,
+            _registered_method=True,
+        )
+
+
+class InventoryServiceServicer(object):
+    """Missing associated documentation comment in .proto file."""
+
+    def Reserve(self, request, context):
+        """Reserve units of one or more products, all or nothing."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details("Method not implemented!")
+        raise NotImplementedError("Method not implemented!")
+
+    def Release(self, request, context):
+        """Release reservations, returning their units to the products."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details("Method not implemented!")
+        raise NotImplementedError("Method not implemented!")
+
+    def Commit(self, request, context):
+        """Make the sale of reserved units final."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details("Method not implemented!")
+        raise NotImplementedError("Method not implemented!")
+
+
+def add_InventoryServiceServicer_to_server(servicer, server):
+    rpc_method_handlers = {
+        "Reserve": grpc.unary_unary_rpc_method_handler(
+            servicer.Reserve,
+            request_deserializer=inventory__pb2.ReserveRequest.FromString,
+            response_serializer=inventory__pb2.ReserveResponse.SerializeToString,
+        ),
+        "Release": grpc.unary_unary_rpc_method_handler(
+            servicer.Release,
+            request_deserializer=inventory__pb2.ReleaseRequest.FromString,
+            response_serializer=inventory__pb2.ReleaseResponse.SerializeToString,
+        ),
+        "Commit": grpc.unary_unary_rpc_method_handler(
+            servicer.Commit,
+            request_deserializer=inventory__pb2.CommitRequest.FromString,
+            response_serializer=inventory__pb2.CommitResponse.SerializeToString,
+        ),
+    }
+    generic_handler = grpc.method_handlers_generic_handler(
+        "inventory.InventoryService", rpc_method_handlers
+    )
+    server.add_generic_rpc_handlers((generic_handler,))
+    server.add_registered_method_handlers(
+        "inventory.InventoryService", rpc_method_handlers
+    )
+
+
+# This class is part of an EXPERIMENTAL API.
+class InventoryService(object):
+    """Missing associated documentation comment in .proto file."""
+
+    @staticmethod
+    def Reserve(
+        request,
+        target,
+        options=(),
+        channel_credentials=None,
+        call_credentials=None,
+        insecure=False,
+        compression=None,
+        wait_for_ready=None,
+        timeout=None,
+        metadata=None,
+    ):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            "/inventory.InventoryService/Reserve",
+            inventory__pb2.ReserveRequest.SerializeToString,
+            inventory__pb2.ReserveResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True,
+        )
+
+    @staticmethod
+    def Release(
+        request,
+        target,
+        options=(),
+        channel_credentials=None,
+        call_credentials=None,
+        insecure=False,
+        compression=None,
+        wait_for_ready=None,
+        timeout=None,
+        metadata=None,
+    ):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            "/inventory.InventoryService/Release",
+            inventory__pb2.ReleaseRequest.SerializeToString,
+            inventory__pb2.ReleaseResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True,
+        )
+
+    @staticmethod
+    def Commit(
+        request,
+        target,
+        options=(),
+        channel_credentials=None,
+        call_credentials=None,
+        insecure=False,
+        compression=None,
+        wait_for_ready=None,
+        timeout=None,
+        metadata=None,
+    ):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            "/inventory.InventoryService/Commit",
+            inventory__pb2.CommitRequest.SerializeToString,
+            inventory__pb2.CommitResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True,
+        )
@@ -0,0 +1,94 @@
+from typing import Dict
+
+import grpc
+from redis.asyncio import Redis
+
+from app.core.config import settings
+from app.crud import reservation as reservation_crud
+from app.crud.reservation import InsufficientStockError, ProductNotFoundError
+from app.models.product import Product
+from app.models.reservation import Reservation
+from app.proto import inventory_pb2, inventory_pb2_grpc
+from app.redis.cache import delete_product_cache_many
+from app.schemas.reservation import ReservationItem
+
+
+def _to_message(reservation: Reservation) -> inventory_pb2.Reservation:
+    return inventory_pb2.Reservation(
+        reservation_id=str(reservation.id),
+        product_id=str(reservation.product_id),
+        quantity=reservation.quantity,
+        expires_at=int(reservation.expires_at.timestamp()),
+    )
+
+
+class InventoryService(inventory_pb2_grpc.InventoryServiceServicer):
+    """Stock reservations over gRPC, sharing the HTTP API's CRUD layer."""
+
+    def __init__(self, redis: Redis):
+        self.redis = redis
+
+    async def _invalidate_products(self, products: Dict[str, Product]) -> None:
+        # Snapshots of concurrent reservations could be cached out of order.
+        await delete_product_cache_many(self.redis, list(products))
+
+    async def Reserve(self, request, context):
+        """
+        Handle the Reserve request: reserve every item or none.
+        """
+        if not 0 < len(request.items) <= settings.RESERVATION_BATCH_MAX_SIZE:
+            await context.abort(
+                grpc.StatusCode.INVALID_ARGUMENT,
+                f"Between 1 and {settings.RESERVATION_BATCH_MAX_SIZE} items "
+                "can be reserved at once.",
+            )
+        if any(item.quantity <= 0 for item in request.items):
+            await context.abort(
+                grpc.StatusCode.INVALID_ARGUMENT, "Quantities must be positive."
+            )
+        if not 0 <= request.ttl_seconds <= settings.RESERVATION_MAX_TTL:
+            await context.abort(
+                grpc.StatusCode.INVALID_ARGUMENT,
+                f"ttl_seconds must be at most {settings.RESERVATION_MAX_TTL}.",
+            )
+
+        items = [
+            ReservationItem(product_id=item.product_id, quantity=item.quantity)
+            for item in request.items
+        ]
+        try:
+            reservations, products = await reservation_crud.reserve_stock(
+                items, request.ttl_seconds or None
+            )
+        except ProductNotFoundError as e:
+            await context.abort(grpc.StatusCode.NOT_FOUND, str(e))
+        except InsufficientStockError as e:
+            await context.abort(grpc.StatusCode.FAILED_PRECONDITION, str(e))
+
+        await self._invalidate_products(products)
+        return inventory_pb2.ReserveResponse(
+            reservations=[_to_message(r) for r in reservations]
+        )
+
+    async def Release(self, request, context):
+        """
+        Handle the Release request and return the released reservation IDs.
+        """
+        reservations, products = await reservation_crud.release_reservations(
+            list(request.reservation_ids)
+        )
+        await self._invalidate_products(products)
+        return inventory_pb2.ReleaseResponse(
+            reservation_ids=[str(r.id) for r in reservations]
+        )
+
+    async def Commit(self, request, context):
+        """
+        Handle the Commit request and return the committed reservation IDs.
+        """
+        reservations = await reservation_crud.commit_reservations(
+            list(request.reservation_ids)
+        )
+        return inventory_pb2.CommitResponse(
+            reservation_ids=[str(r.id) for r in reservations]
+        )
@@ -1,45 +1,209 @@
 import asyncio
+from typing import Dict, List, Tuple
+
 import grpc
 from fastapi import FastAPI
+from grpc_health.v1 import health, health_pb2, health_pb2_grpc
+from redis.asyncio import Redis
 from contextlib import suppress
 from loguru import logger
 
 from app.core.config import settings
-from app.proto import price_pb2, price_pb2_grpc
+from app.core.instrumentation import GrpcServerMetricsInterceptor
+from app.core.price_table import price_table
+from app.core.tracing import GrpcServerTracingInterceptor
+from app.proto import inventory_pb2_grpc, price_pb2, price_pb2_grpc
+from app.proto.inventory_service import InventoryService
 from app.crud import product as product_crud
+from app.redis.prices import listen_for_price_changes, price_watchers
 
 
 class PriceService(price_pb2_grpc.PriceServiceServicer):
+    async def _get_prices(self, product_ids: List[str]) -> Dict[str, float]:
+        """
+        Look prices up in the in-memory table, reading only the misses from
+        MongoDB (with one `$in` query) and storing them in the table unless a
+        price change arrived meanwhile.
+        """
+        if not settings.PRICE_TABLE_ENABLED:
+            return await product_crud.get_prices_by_ids(product_ids)
+
+        prices, missing = price_table.get_many(product_ids)
+        if missing:
+            version = price_table.version
+            loaded = await product_crud.get_prices_by_ids(missing)
+            price_table.fill(loaded, version)
+            prices.update(loaded)
+        return prices
+
     async def GetPrice(self, request, context):
         """
         Handle the GetPrice request and return a response.
         """
-        product = await product_crud.get_product_by_id(request.product_id)
-        if not product:
+        prices = await self._get_prices([request.product_id])
+        price = prices.get(request.product_id)
+        if price is None:
             context.set_code(grpc.StatusCode.NOT_FOUND)
             context.set_details(f"Product with ID {request.product_id} not found.")
             return price_pb2.PriceResponse()
 
-        price = product.price
         return price_pb2.PriceResponse(price=price)
 
+    async def GetPrices(self, request, context):
+        """
+        Handle the GetPrices request from the price table, with a single
+        `$in` query for the misses.
+        """
+        if len(request.product_ids) > settings.PRICE_BATCH_MAX_SIZE:
+            await context.abort(
+                grpc.StatusCode.INVALID_ARGUMENT,
+                f"At most {settings.PRICE_BATCH_MAX_SIZE} prices can be requested "
+                "at once.",
+            )
+
+        product_ids = list(dict.fromkeys(request.product_ids))
+        prices = await self._get_prices(product_ids)
+        return price_pb2.PricesResponse(
+            prices=[
+                price_pb2.ProductPrice(product_id=product_id, price=prices[product_id])
+                for product_id in product_ids
+                if product_id in prices
+            ],
+            missing=[
+                product_id for product_id in product_ids if product_id not in prices
+            ],
+        )
+
+    async def WatchPrices(self, request_iterator, context):
+        """
+        Handle the WatchPrices stream: apply subscription changes as they
+        arrive and push the price of every newly watched product, then each
+        change to a watched product.
+        """
+        watch = price_watchers.watch()
+
+        async def read_requests():
+            async for request in request_iterator:
+                watch.unsubscribe(request.unsubscribe)
+                if (
+                    len(watch.product_ids) + len(request.subscribe)
+                    > settings.PRICE_WATCH_MAX_IDS
+                ):
+                    raise ValueError(
+                        f"At most {settings.PRICE_WATCH_MAX_IDS} products can be "
+                        "watched at once."
+                    )
+                added = watch.subscribe(request.subscribe)
+                if added:
+                    prices = await self._get_prices(added)
+                    for product_id in added:
+                        watch.push(product_id, prices.get(product_id))
+
+        reader = asyncio.create_task(read_requests())
+        try:
+            while True:
+                updates = asyncio.ensure_future(watch.next())
+                if not reader.done():
+                    await asyncio.wait(
+                        {updates, reader}, return_when=asyncio.FIRST_COMPLETED
+                    )
+                # The client may half-close its side and keep watching, so
+                # only a failed reader ends the stream.
+                if reader.done() and reader.exception():
+                    updates.cancel()
+                    if isinstance(reader.exception(), ValueError):
+                        await context.abort(
+                            grpc.StatusCode.RESOURCE_EXHAUSTED,
+                            str(reader.exception()),
+                        )
+                    raise reader.exception()
 
-async def serve_grpc():
-    server = grpc.aio.server()
+                for product_id, price in (await updates).items():
+                    if product_id not in watch.product_ids:
+                        continue
+                    yield price_pb2.PriceUpdate(
+                        product_id=product_id,
+                        price=price or 0.0,
+                        deleted=price is None,
+                    )
+        finally:
+            reader.cancel()
+            watch.close()
+
+
+def grpc_server_options() -> List[Tuple[str, int]]:
+    """Channel arguments for the price gRPC server, from the settings."""
+    return [
+        # Lets several server processes bind the same port.
+        ("grpc.so_reuseport", 1),
+        ("grpc.max_concurrent_streams", settings.PRICE_SERVICE_MAX_CONCURRENT_STREAMS),
+        ("grpc.keepalive_time_ms", settings.PRICE_SERVICE_KEEPALIVE_TIME_MS),
+        ("grpc.keepalive_timeout_ms", settings.PRICE_SERVICE_KEEPALIVE_TIMEOUT_MS),
+        ("grpc.keepalive_permit_without_calls", 1),
+        ("grpc.http2.min_ping_interval_without_data_ms", 10000),
+    ]
+
+
+async def create_grpc_server(
+    redis: Redis,
+) -> Tuple[grpc.aio.Server, health.aio.HealthServicer]:
+    """
+    Create the gRPC server with the price, inventory and health services,
+    bound to `PRICE_SERVICE_GRPC_HOST:PRICE_SERVICE_GRPC_PORT`.
+
+    Args:
+        redis (Redis): The Redis client.
+
+    Returns:
+        Tuple[grpc.aio.Server, health.aio.HealthServicer]: The server, not
+            started yet, and its health servicer.
+    """
+    server = grpc.aio.server(
+        interceptors=[GrpcServerTracingInterceptor(), GrpcServerMetricsInterceptor()],
+        options=grpc_server_options(),
+        maximum_concurrent_rpcs=settings.PRICE_SERVICE_MAX_CONCURRENT_RPCS,
+    )
     price_pb2_grpc.add_PriceServiceServicer_to_server(PriceService(), server)
+    inventory_pb2_grpc.add_InventoryServiceServicer_to_server(
+        InventoryService(redis), server
+    )
+
+    health_servicer = health.aio.HealthServicer()
+    health_pb2_grpc.add_HealthServicer_to_server(health_servicer, server)
+    for service in ("", "price.PriceService", "inventory.InventoryService"):
+        await health_servicer.set(service, health_pb2.HealthCheckResponse.SERVING)
+
     port = settings.PRICE_SERVICE_GRPC_PORT
     host = settings.PRICE_SERVICE_GRPC_HOST
     server.add_insecure_port(f"{host}:{port}")
-    logger.info(f"Starting Price Service gRPC server on {host}:{port}")
+    return server, health_servicer
+
+
+async def serve_grpc(app: FastAPI):
+    server, health_servicer = await create_grpc_server(app.state.redis)
+    logger.info(
+        f"Starting Price Service gRPC server on "
+        f"{settings.PRICE_SERVICE_GRPC_HOST}:{settings.PRICE_SERVICE_GRPC_PORT}"
+    )
     await server.start()
-    await server.wait_for_termination()
+    try:
+        await server.wait_for_termination()
+    finally:
+        await health_servicer.enter_graceful_shutdown()
+        await server.stop(settings.PRICE_SERVICE_SHUTDOWN_GRACE)
 
 
 async def init_price_service(app: FastAPI):
     """
-    Initialize the Price Service gRPC server.
+    Initialize the Price Service gRPC server, unless it runs standalone.
     """
-    app.state.grpc_server = asyncio.create_task(serve_grpc())
+    if not settings.PRICE_SERVICE_EMBEDDED:
+        logger.info("Price Service gRPC server runs standalone, not embedding it.")
+        return
+    app.state.price_listener = asyncio.create_task(
+        listen_for_price_changes(app.state.redis)
+    )
+    app.state.grpc_server = asyncio.create_task(serve_grpc(app))
 
 
 async def close_price_service(app: FastAPI):
@@ -50,3 +214,7 @@ async def close_price_service(app: FastAPI):
         app.state.grpc_server.cancel()
         with suppress(asyncio.CancelledError):
             await app.state.grpc_server
+    if hasattr(app.state, "price_listener"):
+        app.state.price_listener.cancel()
+        with suppress(asyncio.CancelledError):
+            await app.state.price_listener
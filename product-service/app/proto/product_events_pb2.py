@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+# Generated by the protocol buffer compiler.  DO NOT EDIT!
+# NO CHECKED-IN PROTOBUF GENCODE
+# source: product_events.proto
+# Protobuf Python Version: 6.31.0
+"""Generated protocol buffer code."""
+from google.protobuf import descriptor as _descriptor
+from google.protobuf import descriptor_pool as _descriptor_pool
+from google.protobuf import runtime_version as _runtime_version
+from google.protobuf import symbol_database as _symbol_database
+from google.protobuf.internal import builder as _builder
+_runtime_version.ValidateProtobufRuntimeVersion(
+    _runtime_version.Domain.PUBLIC,
+    6,
+    31,
+    0,
+    '',
+    'product_events.proto'
+)
+# @@protoc_insertion_point(imports)
+
+_sym_db = _symbol_database.Default()
+
+
+from google.protobuf import timestamp_pb2 as google_dot_protobuf_dot_timestamp__pb2
+
+
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x14product_events.proto\x12\x11product_events.v1\x1a\x1fgoogle/protobuf/timestamp.proto\"\x8f\x02\n\x07Product\x12\n\n\x02id\x18\x01 \x01(\t\x12\x11\n\x04name\x18\x02 \x01(\tH\x00\x88\x01\x01\x12\x18\n\x0b\x64\x65scription\x18\x03 \x01(\tH\x01\x88\x01\x01\x12\x12\n\x05price\x18\x04 \x01(\x01H\x02\x88\x01\x01\x12\x15\n\x08\x63\x61tegory\x18\x05 \x01(\tH\x03\x88\x01\x01\x12\x0c\n\x04tags\x18\x06 \x03(\t\x12\x15\n\x08quantity\x18\x07 \x01(\x03H\x04\x88\x01\x01\x12\x0e\n\x06images\x18\x08 \x03(\t\x12.\n\nupdated_at\x18\t \x01(\x0b\x32\x1a.google.protobuf.TimestampB\x07\n\x05_nameB\x0e\n\x0c_descriptionB\x08\n\x06_priceB\x0b\n\t_categoryB\x0b\n\t_quantity\"=\n\x0eProductCreated\x12+\n\x07product\x18\x01 \x01(\x0b\x32\x1a.product_events.v1.Product\"N\n\x0eProductUpdated\x12+\n\x07product\x18\x01 \x01(\x0b\x32\x1a.product_events.v1.Product\x12\x0f\n\x07\x63hanged\x18\x02 \x03(\t\"\x1c\n\x0eProductDeleted\x12\n\n\x02id\x18\x01 \x01(\tb\x06proto3')
+
+_globals = globals()
+_builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
+_builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'product_events_pb2', _globals)
+if not _descriptor._USE_C_DESCRIPTORS:
+  DESCRIPTOR._loaded_options = None
+  _globals['_PRODUCT']._serialized_start=77
+  _globals['_PRODUCT']._serialized_end=348
+  _globals['_PRODUCTCREATED']._serialized_start=350
+  _globals['_PRODUCTCREATED']._serialized_end=411
+  _globals['_PRODUCTUPDATED']._serialized_start=413
+  _globals['_PRODUCTUPDATED']._serialized_end=491
+  _globals['_PRODUCTDELETED']._serialized_start=493
+  _globals['_PRODUCTDELETED']._serialized_end=521
+# @@protoc_insertion_point(module_scope)
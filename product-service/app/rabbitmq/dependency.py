@@ -2,8 +2,14 @@ from collections.abc import AsyncGenerator
 from fastapi import Request
 from aio_pika import Channel
 
+from app.rabbitmq.publisher import Publisher
+
 
 async def get_rabbit_channel(request: Request) -> AsyncGenerator[Channel, None]:
     pool = request.app.state.rmq_channel_pool
     async with pool.acquire() as channel:
         yield channel
+
+
+def get_publisher(request: Request) -> Publisher:
+    return request.app.state.rmq_publisher
@@ -0,0 +1,83 @@
+from typing import Any, Dict, NamedTuple
+
+import orjson
+from google.protobuf.message import Message as ProtoMessage
+
+from app.core.config import settings
+from app.models.product import Product
+from app.proto import product_events_pb2
+
+PROTOBUF_CONTENT_TYPE = "application/x-protobuf"
+JSON_CONTENT_TYPE = "application/json"
+
+
+class ProductEvent(NamedTuple):
+    """An encoded product event, ready to be recorded in the outbox."""
+
+    routing_key: str
+    message_type: str
+    body: bytes
+    content_type: str
+
+
+def _product_message(
+    product_id: str, fields: Dict[str, Any]
+) -> product_events_pb2.Product:
+    """Fill a protobuf `Product` with `fields`, leaving None values unset."""
+    message = product_events_pb2.Product(id=product_id)
+    for name, value in fields.items():
+        if value is None:
+            continue
+        if name == "updated_at":
+            message.updated_at.FromDatetime(value)
+        elif name in ("tags", "images"):
+            getattr(message, name).extend(value)
+        else:
+            setattr(message, name, value)
+    return message
+
+
+def _encode(routing_key: str, message: ProtoMessage, document: dict) -> ProductEvent:
+    """
+    Encode an event as protobuf, or as JSON when `RABBITMQ_EVENT_FORMAT` is
+    `json` (for consumers that only read JSON).
+    """
+    message_type = message.DESCRIPTOR.full_name
+    if settings.RABBITMQ_EVENT_FORMAT == "json":
+        body = orjson.dumps(document, option=orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z)
+        return ProductEvent(routing_key, message_type, body, JSON_CONTENT_TYPE)
+    return ProductEvent(
+        routing_key, message_type, message.SerializeToString(), PROTOBUF_CONTENT_TYPE
+    )
+
+
+def product_created_event(product: Product) -> ProductEvent:
+    """A `product.created` event carrying the full product."""
+    product_id = str(product.id)
+    fields = product.model_dump(exclude={"id", "revision_id"})
+    message = product_events_pb2.ProductCreated(
+        product=_product_message(product_id, fields)
+    )
+    return _encode("product.created", message, {"id": product_id, **fields})
+
+
+def product_updated_event(product_id: str, changed: Dict[str, Any]) -> ProductEvent:
+    """
+    A `product.updated` event carrying only the fields an update wrote.
+
+    Args:
+        product_id (str): The ID of the updated product.
+        changed (Dict[str, Any]): The new value of each written field.
+    """
+    product_id = str(product_id)
+    message = product_events_pb2.ProductUpdated(
+        product=_product_message(product_id, changed), changed=list(changed)
+    )
+    return _encode("product.updated", message, {"id": product_id, **changed})
+
+
+def product_deleted_event(product_id: str) -> ProductEvent:
+    """A `product.deleted` event carrying only the product ID."""
+    product_id = str(product_id)
+    message = product_events_pb2.ProductDeleted(id=product_id)
+    return _encode("product.deleted", message, {"id": product_id})
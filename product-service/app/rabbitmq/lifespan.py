@@ -2,15 +2,17 @@ from loguru import logger
 import aio_pika
 from fastapi import FastAPI
 from aio_pika import Channel
+from aio_pika.connection import make_url
 from aio_pika.abc import AbstractChannel, AbstractRobustConnection
 from aio_pika.pool import Pool
 
 from app.core.config import settings
+from app.rabbitmq.publisher import Publisher
 
 
 async def init_rabbitmq(app: FastAPI) -> None:
     """
-    Initialize rabbitmq pools.
+    Initialize rabbitmq pools and open a first channel.
 
     Args:
         app (FastAPI): FastAPI application instance.
@@ -23,7 +25,15 @@ async def init_rabbitmq(app: FastAPI) -> None:
         Returns:
             AbstractRobustConnection: An instance of AbstractRobustConnection,
         """
-        return await aio_pika.connect_robust(str(settings.rabbitmq_url))
+        connection = aio_pika.RobustConnection(make_url(str(settings.rabbitmq_url)))
+        try:
+            await connection.connect()
+        except BaseException:
+            # A robust connection keeps reconnecting in the background until
+            # it is closed, even when its first attempt fails.
+            await connection.close()
+            raise
+        return connection
 
     async def get_channel() -> AbstractChannel:
         """
@@ -34,16 +44,39 @@ async def init_rabbitmq(app: FastAPI) -> None:
             AbstractChannel: An instance of AbstractChannel, the connected channel.
         """
         async with connection_pool.acquire() as connection:
-            return await connection.channel()
+            return await connection.channel(publisher_confirms=True)
 
     connection_pool: Pool[AbstractRobustConnection] = Pool(get_connection)
     channel_pool: Pool[Channel] = Pool(get_channel)
+    # The pools connect lazily: open a channel now so that a broker that is
+    # down fails this phase and goes through its retries.
+    try:
+        async with channel_pool.acquire():
+            pass
+    except BaseException:
+        await channel_pool.close()
+        await connection_pool.close()
+        raise
 
     app.state.rmq_pool = connection_pool
     app.state.rmq_channel_pool = channel_pool
+    app.state.rmq_publisher = Publisher(channel_pool)
+    app.state.rmq_publisher.start()
     logger.info("Connected to RabbitMQ.")
 
 
+async def check_rabbitmq(app: FastAPI) -> None:
+    """
+    Check a pooled channel to RabbitMQ is open, connecting if there is none.
+
+    Args:
+        app (FastAPI): FastAPI application instance.
+    """
+    async with app.state.rmq_channel_pool.acquire() as channel:
+        if channel.is_closed:
+            raise ConnectionError("RabbitMQ channel is closed.")
+
+
 async def close_rabbitmq(app: FastAPI) -> None:
     """
     Close all connection and pools.
@@ -51,6 +84,7 @@ async def close_rabbitmq(app: FastAPI) -> None:
     Args:
         app (FastAPI): FastAPI application instance.
     """
+    await app.state.rmq_publisher.close()
     await app.state.rmq_channel_pool.close()
     await app.state.rmq_pool.close()
     logger.info("Closed RabbitMQ connections.")
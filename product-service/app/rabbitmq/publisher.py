@@ -1,13 +1,229 @@
-from aio_pika import Channel, Message, ExchangeType
+import asyncio
+import time
+from typing import List, Optional, Set, Tuple, Union
+from weakref import WeakKeyDictionary
+
+from aio_pika import DeliveryMode, ExchangeType, Message
+from aio_pika.abc import AbstractChannel, AbstractExchange
+from aio_pika.pool import Pool
+from loguru import logger
+from prometheus_client import Counter, Gauge
 
 from app.core.config import settings
+from app.core.instrumentation import RABBITMQ_PUBLISH_DURATION
+from app.core.tracing import trace_headers
+
+PUBLISH_UNCONFIRMED = Gauge(
+    "rabbitmq_publish_unconfirmed",
+    "Messages published and waiting for their broker confirmation.",
+)
+PUBLISHED_MESSAGES = Counter(
+    "rabbitmq_published_messages_total",
+    "Published messages by outcome.",
+    ["result"],
+)
+
+Body = Union[str, bytes, Message]
 
 
-async def publish_message(channel: Channel, routing_key: str, message: str) -> None:
-    """Publish a message to a RabbitMQ exchange."""
-    exchange = await channel.declare_exchange(
-        settings.RABBITMQ_EXCHANGE_NAME,
-        type=ExchangeType.DIRECT,
-        durable=True,
+def _as_message(body: Body) -> Message:
+    """
+    Wrap a message body in a persistent message carrying the trace context
+    of the caller. Done when publishing is requested, since batched messages
+    are sent from another task.
+    """
+    if isinstance(body, Message):
+        return body
+    if isinstance(body, str):
+        body = body.encode()
+    return Message(
+        body=body, headers=trace_headers(), delivery_mode=DeliveryMode.PERSISTENT
     )
-    await exchange.publish(Message(body=message.encode()), routing_key=routing_key)
+
+
+class Publisher:
+    """
+    Publishes messages to the product exchange with publisher confirms.
+
+    The exchange is declared once per pooled channel and cached, instead of
+    on every publish. Messages sent together are pipelined on one channel
+    and their confirms awaited together, with at most
+    `RABBITMQ_PUBLISH_MAX_IN_FLIGHT` messages unconfirmed at any time.
+
+    When `RABBITMQ_PUBLISH_BATCH_SIZE` is above 1, single publishes are also
+    queued and sent in batches of up to that many messages, waiting at most
+    `RABBITMQ_PUBLISH_BATCH_DELAY` seconds for a batch to fill.
+    """
+
+    def __init__(
+        self,
+        channel_pool: Pool[AbstractChannel],
+        exchange_name: str = settings.RABBITMQ_EXCHANGE_NAME,
+        max_in_flight: int = settings.RABBITMQ_PUBLISH_MAX_IN_FLIGHT,
+        batch_size: int = settings.RABBITMQ_PUBLISH_BATCH_SIZE,
+        batch_delay: float = settings.RABBITMQ_PUBLISH_BATCH_DELAY,
+    ):
+        self._channel_pool = channel_pool
+        self._exchange_name = exchange_name
+        self._exchanges: WeakKeyDictionary[AbstractChannel, AbstractExchange] = (
+            WeakKeyDictionary()
+        )
+        self._in_flight = asyncio.Semaphore(max_in_flight)
+        self._batch_size = batch_size
+        self._batch_delay = batch_delay
+        self._queue: Optional[asyncio.Queue] = None
+        self._flusher: Optional[asyncio.Task] = None
+        self._batches: Set[asyncio.Task] = set()
+
+    async def _get_exchange(self, channel: AbstractChannel) -> AbstractExchange:
+        exchange = self._exchanges.get(channel)
+        if exchange is None:
+            exchange = await channel.declare_exchange(
+                self._exchange_name,
+                type=ExchangeType.TOPIC,
+                durable=True,
+            )
+            self._exchanges[channel] = exchange
+        return exchange
+
+    async def _send(
+        self, exchange: AbstractExchange, routing_key: str, message: Message
+    ) -> None:
+        async with self._in_flight:
+            PUBLISH_UNCONFIRMED.inc()
+            started = time.perf_counter()
+            try:
+                await exchange.publish(
+                    message,
+                    routing_key=routing_key,
+                    timeout=settings.RABBITMQ_PUBLISH_TIMEOUT,
+                )
+            except Exception:
+                PUBLISHED_MESSAGES.labels(result="failed").inc()
+                raise
+            finally:
+                PUBLISH_UNCONFIRMED.dec()
+        RABBITMQ_PUBLISH_DURATION.observe(time.perf_counter() - started)
+        PUBLISHED_MESSAGES.labels(result="confirmed").inc()
+
+    async def _send_many(
+        self, messages: List[Tuple[str, Message]]
+    ) -> List[Optional[BaseException]]:
+        async with self._channel_pool.acquire() as channel:
+            exchange = await self._get_exchange(channel)
+            return await asyncio.gather(
+                *(self._send(exchange, rk, message) for rk, message in messages),
+                return_exceptions=True,
+            )
+
+    async def publish(self, routing_key: str, message: Body) -> None:
+        """
+        Publish a message and wait for the broker to confirm it.
+
+        Args:
+            routing_key (str): The routing key of the message.
+            message (Union[str, bytes, Message]): The message body, or a
+                message with its own properties.
+        """
+        if self._queue is None:
+            await self.publish_many([(routing_key, message)])
+            return
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((routing_key, _as_message(message), future))
+        await future
+
+    async def publish_many(
+        self, messages: List[Tuple[str, Body]], return_exceptions: bool = False
+    ) -> List[Optional[BaseException]]:
+        """
+        Publish several messages, pipelined on one channel, and wait for the
+        broker to confirm all of them.
+
+        Args:
+            messages (List[Tuple[str, Union[str, bytes, Message]]]): Pairs of
+                routing key and message body or message.
+            return_exceptions (bool): Return the publish failures instead of
+                raising the first one.
+
+        Returns:
+            List[Optional[BaseException]]: The failure of each message, in
+                order, or None for the confirmed ones.
+
+        Raises:
+            Exception: Unless `return_exceptions` is set, the first publish
+                failure, once every message has been either confirmed or
+                rejected.
+        """
+        if not messages:
+            return []
+        errors = await self._send_many(
+            [(routing_key, _as_message(body)) for routing_key, body in messages]
+        )
+        if not return_exceptions:
+            error = next((e for e in errors if e is not None), None)
+            if error is not None:
+                raise error
+        return errors
+
+    async def _flush(self, batch: list) -> None:
+        try:
+            errors = await self._send_many([(rk, message) for rk, message, _ in batch])
+        except Exception as e:
+            errors = [e] * len(batch)
+        for (_, _, future), error in zip(batch, errors):
+            if future.done():
+                continue
+            if error is None:
+                future.set_result(None)
+            else:
+                future.set_exception(error)
+
+    def _start_flush(self, batch: list) -> None:
+        task = asyncio.create_task(self._flush(batch))
+        self._batches.add(task)
+        task.add_done_callback(self._batches.discard)
+
+    async def _collect_batches(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self._batch_delay
+            while len(batch) < self._batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                    continue
+                except asyncio.QueueEmpty:
+                    pass
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            self._start_flush(batch)
+
+    def start(self) -> None:
+        """Start batching single publishes, if enabled."""
+        if self._batch_size > 1 and self._flusher is None:
+            self._queue = asyncio.Queue()
+            self._flusher = asyncio.create_task(self._collect_batches())
+
+    async def close(self) -> None:
+        """Publish the queued messages and wait for every pending confirm."""
+        if self._flusher is not None:
+            self._flusher.cancel()
+            try:
+                await self._flusher
+            except asyncio.CancelledError:
+                pass
+            self._flusher = None
+            pending = []
+            while not self._queue.empty():
+                pending.append(self._queue.get_nowait())
+            self._queue = None
+            if pending:
+                self._start_flush(pending)
+        if self._batches:
+            await asyncio.gather(*self._batches, return_exceptions=True)
+        logger.info("RabbitMQ publisher closed.")
@@ -1,6 +1,95 @@
+import asyncio
+import json
+import os
+import socket
+import time
+from collections import OrderedDict
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
 from loguru import logger
+from prometheus_client import Gauge
 from redis.asyncio import Redis
 from app.core.config import settings
+from app.core.instrumentation import CACHE_REQUESTS
+from app.core.responses import compute_etag
+
+# Identifies this worker process in invalidation messages, so it can skip
+# the ones it published itself.
+INSTANCE_ID = f"{socket.gethostname()}:{os.getpid()}"
+
+# Bumped whenever the cached payload format changes, so entries written by
+# older releases are never served.
+PRODUCT_CACHE_VERSION = 2
+
+
+class CachedProduct(NamedTuple):
+    """A cached product payload and the ETag computed from it."""
+
+    data: str
+    etag: str
+
+    @classmethod
+    def from_data(cls, data: str) -> "CachedProduct":
+        return cls(data, compute_etag(data.encode()))
+
+
+class LocalCache:
+    """
+    Bounded in-process LRU cache whose entries expire after a TTL.
+
+    It sits in front of Redis for the hottest products. Entries are kept
+    coherent across workers by the invalidation messages published on
+    `settings.REDIS_INVALIDATION_CHANNEL`; the TTL bounds staleness if a
+    message is ever missed.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[str, Tuple[float, CachedProduct]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: str) -> Optional[CachedProduct]:
+        """Return the value for `key`, or None if it is missing or expired."""
+        item = self._data.get(key)
+        if item is None:
+            return None
+        expires_at, value = item
+        if expires_at < time.monotonic():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: CachedProduct) -> None:
+        """Store `value` under `key`, evicting the least recently used entries."""
+        if self.maxsize <= 0:
+            return
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        """Remove `key` if present."""
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        self._data.clear()
+
+
+local_product_cache = LocalCache(
+    maxsize=settings.LOCAL_CACHE_MAX_SIZE,
+    ttl=settings.LOCAL_CACHE_TTL,
+)
+
+Gauge(
+    "product_local_cache_size",
+    "Number of products held in the in-process cache.",
+).set_function(lambda: len(local_product_cache))
 
 
 def get_product_cache_key(product_id: str) -> str:
@@ -13,49 +102,299 @@ def get_product_cache_key(product_id: str) -> str:
     Returns:
         str: The cache key for the product.
     """
-    return f"product:{product_id}"
+    return f"product:v{PRODUCT_CACHE_VERSION}:{product_id}"
 
 
-async def set_product_cache(redis: Redis, product_id: str, product_data: dict) -> None:
+def get_product_etag_key(product_id: str) -> str:
+    """
+    Generate the key holding the ETag of a cached product. It is written and
+    expired together with the product, so conditional requests can be
+    answered without fetching the payload.
+
+    Args:
+        product_id (str): The ID of the product.
+
+    Returns:
+        str: The ETag key for the product.
+    """
+    return f"{get_product_cache_key(product_id)}:etag"
+
+
+async def publish_product_invalidation(redis: Redis, *product_ids: str) -> None:
+    """
+    Tell every worker to drop its in-process copy of the given products.
+
+    Args:
+        redis (Redis): The Redis client.
+        product_ids (str): The IDs of the products that changed.
+    """
+    if not product_ids:
+        return
+    message = json.dumps(
+        {"origin": INSTANCE_ID, "ids": [str(product_id) for product_id in product_ids]}
+    )
+    await redis.publish(settings.REDIS_INVALIDATION_CHANNEL, message)
+
+
+async def listen_for_invalidations(redis: Redis) -> None:
+    """
+    Subscribe to the invalidation channel and evict changed products from the
+    in-process cache. Reconnects with backoff, flushing the local tier since
+    messages may have been missed while disconnected.
+
+    Args:
+        redis (Redis): The Redis client.
+    """
+    backoff = 1
+    while True:
+        pubsub = redis.pubsub(ignore_subscribe_messages=True)
+        try:
+            await pubsub.subscribe(settings.REDIS_INVALIDATION_CHANNEL)
+            local_product_cache.clear()
+            backoff = 1
+            async for message in pubsub.listen():
+                payload = json.loads(message["data"])
+                if payload.get("origin") == INSTANCE_ID:
+                    continue
+                for product_id in payload.get("ids", []):
+                    local_product_cache.delete(product_id)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"Cache invalidation listener failed, retrying: {e}")
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, 30)
+        finally:
+            await pubsub.aclose()
+
+
+async def set_product_cache(
+    redis: Redis, product_id: str, product_data: str, broadcast: bool = False
+) -> None:
     """
     Set the cache for a product.
 
     Args:
         redis (Redis): The Redis client.
         product_id (str): The ID of the product.
-        product_data (dict): The product data to cache.
+        product_data (str): The product as sent to clients (`ProductRead`
+            JSON), so cache hits can be served without re-serializing.
+        broadcast (bool): Invalidate the product in the other workers'
+            in-process caches. Set it when the product has changed.
     """
+    product_id = str(product_id)
     cache_key = get_product_cache_key(product_id)
-    await redis.set(cache_key, product_data, ex=settings.REDIS_CACHE_EXPIRE)
-    logger.info(f"Product {product_id} cached with key {cache_key}.")
+    cached = CachedProduct.from_data(product_data)
+    # MULTI/EXEC, so concurrent writers never leave one payload with the
+    # ETag of another.
+    async with redis.pipeline(transaction=True) as pipe:
+        pipe.set(cache_key, cached.data, ex=settings.REDIS_CACHE_EXPIRE)
+        pipe.set(
+            get_product_etag_key(product_id),
+            cached.etag,
+            ex=settings.REDIS_CACHE_EXPIRE,
+        )
+        await pipe.execute()
+    local_product_cache.set(product_id, cached)
+    if broadcast:
+        await publish_product_invalidation(redis, product_id)
+    logger.debug(f"Product {product_id} cached with key {cache_key}.")
 
 
-async def get_product_cache(redis: Redis, product_id: str) -> dict | None:
+async def get_product_cache_entry(
+    redis: Redis, product_id: str
+) -> Tuple[Optional[CachedProduct], Optional[float]]:
     """
-    Get the cached product data.
+    Get the cached product together with its remaining Redis TTL.
+
+    The in-process tier is checked first; its hits carry no TTL. On the
+    Redis tier, the payload, its ETag and the PTTL are fetched in one
+    pipelined round trip.
 
     Args:
         redis (Redis): The Redis client.
         product_id (str): The ID of the product.
 
     Returns:
-        dict | None: The cached product data or None if not found.
+        Tuple[Optional[CachedProduct], Optional[float]]: The cached product
+            (or None if not found) and the seconds left before the Redis key
+            expires (or None if unknown).
     """
+    cached = local_product_cache.get(product_id)
+    if cached:
+        CACHE_REQUESTS.labels(tier="local", result="hit").inc()
+        return cached, None
+    CACHE_REQUESTS.labels(tier="local", result="miss").inc()
+
     cache_key = get_product_cache_key(product_id)
-    cached_data = await redis.get(cache_key)
+    async with redis.pipeline(transaction=False) as pipe:
+        pipe.mget(cache_key, get_product_etag_key(product_id))
+        pipe.pttl(cache_key)
+        (cached_data, etag), ttl_ms = await pipe.execute()
+
     if cached_data:
-        return cached_data
-    return None
+        CACHE_REQUESTS.labels(tier="redis", result="hit").inc()
+        cached = (
+            CachedProduct(cached_data, etag)
+            if etag
+            else CachedProduct.from_data(cached_data)
+        )
+        local_product_cache.set(product_id, cached)
+        return cached, (ttl_ms / 1000 if ttl_ms >= 0 else None)
+    CACHE_REQUESTS.labels(tier="redis", result="miss").inc()
+    return None, None
+
+
+async def get_product_cache(redis: Redis, product_id: str) -> str | None:
+    """
+    Get the cached product data, from the in-process tier first, then Redis.
+
+    Args:
+        redis (Redis): The Redis client.
+        product_id (str): The ID of the product.
+
+    Returns:
+        str | None: The cached product data or None if not found.
+    """
+    cached, _ = await get_product_cache_entry(redis, product_id)
+    return cached.data if cached else None
+
+
+async def get_product_etag(redis: Redis, product_id: str) -> Optional[str]:
+    """
+    Get the ETag of a cached product without fetching its payload.
+
+    Args:
+        redis (Redis): The Redis client.
+        product_id (str): The ID of the product.
+
+    Returns:
+        Optional[str]: The ETag, or None if the product is not cached.
+    """
+    cached = local_product_cache.get(product_id)
+    if cached:
+        CACHE_REQUESTS.labels(tier="local", result="hit").inc()
+        return cached.etag
+    CACHE_REQUESTS.labels(tier="local", result="miss").inc()
+
+    etag = await redis.get(get_product_etag_key(product_id))
+    CACHE_REQUESTS.labels(tier="redis", result="hit" if etag else "miss").inc()
+    return etag
+
+
+async def get_product_cache_many(
+    redis: Redis, product_ids: List[str]
+) -> List[Optional[str]]:
+    """
+    Get the cached product data for several products. Products missing from
+    the in-process tier are fetched from Redis in a single MGET.
+
+    Args:
+        redis (Redis): The Redis client.
+        product_ids (List[str]): The IDs of the products.
+
+    Returns:
+        List[Optional[str]]: The cached product data, aligned with
+            ``product_ids``; ``None`` for every cache miss.
+    """
+    results = [
+        cached.data if (cached := local_product_cache.get(product_id)) else None
+        for product_id in product_ids
+    ]
+    remote_ids = [pid for pid, data in zip(product_ids, results) if not data]
+
+    local_hits = len(product_ids) - len(remote_ids)
+    CACHE_REQUESTS.labels(tier="local", result="hit").inc(local_hits)
+    CACHE_REQUESTS.labels(tier="local", result="miss").inc(len(remote_ids))
+    if not remote_ids:
+        return results
+
+    cache_keys = [get_product_cache_key(product_id) for product_id in remote_ids]
+    remote_data = dict(zip(remote_ids, await redis.mget(cache_keys)))
+    for product_id, cached_data in remote_data.items():
+        if cached_data:
+            local_product_cache.set(product_id, CachedProduct.from_data(cached_data))
+
+    redis_hits = sum(1 for cached_data in remote_data.values() if cached_data)
+    CACHE_REQUESTS.labels(tier="redis", result="hit").inc(redis_hits)
+    CACHE_REQUESTS.labels(tier="redis", result="miss").inc(
+        len(remote_data) - redis_hits
+    )
+    return [data or remote_data.get(pid) for pid, data in zip(product_ids, results)]
+
+
+async def set_product_cache_many(
+    redis: Redis, products: Dict[str, str], broadcast: bool = False
+) -> None:
+    """
+    Set the cache for several products in a single MULTI/EXEC round trip,
+    so each payload is always stored with its own ETag.
+
+    Args:
+        redis (Redis): The Redis client.
+        products (Dict[str, str]): Mapping of product ID to product data.
+        broadcast (bool): Invalidate the products in the other workers'
+            in-process caches. Set it when the products have changed.
+    """
+    if not products:
+        return
+    entries = {
+        product_id: CachedProduct.from_data(product_data)
+        for product_id, product_data in products.items()
+    }
+    async with redis.pipeline(transaction=True) as pipe:
+        for product_id, cached in entries.items():
+            pipe.set(
+                get_product_cache_key(product_id),
+                cached.data,
+                ex=settings.REDIS_CACHE_EXPIRE,
+            )
+            pipe.set(
+                get_product_etag_key(product_id),
+                cached.etag,
+                ex=settings.REDIS_CACHE_EXPIRE,
+            )
+        await pipe.execute()
+    for product_id, cached in entries.items():
+        local_product_cache.set(product_id, cached)
+    if broadcast:
+        await publish_product_invalidation(redis, *products)
+    logger.debug(f"Cached {len(products)} products.")
+
+
+async def delete_product_cache_many(redis: Redis, product_ids: List[str]) -> None:
+    """
+    Delete the cached product data for several products from Redis, in one
+    round trip, and from every worker's in-process cache.
+
+    Args:
+        redis (Redis): The Redis client.
+        product_ids (List[str]): The IDs of the products.
+    """
+    if not product_ids:
+        return
+    await redis.delete(
+        *(get_product_cache_key(product_id) for product_id in product_ids),
+        *(get_product_etag_key(product_id) for product_id in product_ids),
+    )
+    for product_id in product_ids:
+        local_product_cache.delete(product_id)
+    await publish_product_invalidation(redis, *product_ids)
+    logger.debug(f"Deleted {len(product_ids)} products from the cache.")
 
 
 async def delete_product_cache(redis: Redis, product_id: str) -> None:
     """
-    Delete the cached product data.
+    Delete the cached product data from Redis and from every worker's
+    in-process cache.
 
     Args:
         redis (Redis): The Redis client.
         product_id (str): The ID of the product.
     """
+    product_id = str(product_id)
     cache_key = get_product_cache_key(product_id)
-    await redis.delete(cache_key)
-    logger.info(f"Product {product_id} cache deleted with key {cache_key}.")
+    await redis.delete(cache_key, get_product_etag_key(product_id))
+    local_product_cache.delete(product_id)
+    await publish_product_invalidation(redis, product_id)
+    logger.debug(f"Product {product_id} cache deleted with key {cache_key}.")
@@ -0,0 +1,159 @@
+from bisect import bisect_right
+from collections import Counter
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+from redis.asyncio import Redis
+
+from app.core.config import settings
+
+# Product fields the facets are computed from.
+FACET_FIELDS = {"category", "tags", "price"}
+FACETS = ("category", "tag", "price_band")
+
+# Set while the facets are fresh; whoever sets it recomputes them.
+FACETS_RECOMPUTE_KEY = "product-facets:recompute"
+
+# Changes to apply to the facet counts, by (facet, value).
+FacetDelta = Dict[Tuple[str, str], int]
+
+
+def get_facet_key(facet: str) -> str:
+    """
+    Generate the key of the hash holding the product count of each value of
+    a facet.
+
+    Args:
+        facet (str): One of `FACETS`.
+
+    Returns:
+        str: The hash key.
+    """
+    return f"product-facets:{facet}"
+
+
+def price_bands() -> List[Tuple[float, str]]:
+    """The lower bound and the label of each price band, in price order."""
+    bounds = [0.0, *settings.PRODUCT_FACET_PRICE_BANDS]
+    bands = [
+        (lower, f"{lower:g}-{upper:g}") for lower, upper in zip(bounds, bounds[1:])
+    ]
+    bands.append((bounds[-1], f"{bounds[-1]:g}+"))
+    return bands
+
+
+def get_price_band(price: float) -> str:
+    """The label of the price band `price` falls in."""
+    return price_bands()[bisect_right(settings.PRODUCT_FACET_PRICE_BANDS, price)][1]
+
+
+def product_facets(product: Optional[Mapping[str, Any]]) -> List[Tuple[str, str]]:
+    """
+    The facet values of a product: its category, each of its tags and its
+    price band.
+
+    Args:
+        product (Optional[Mapping[str, Any]]): The `FACET_FIELDS` of the
+            product, or None when there is no product.
+    """
+    if product is None:
+        return []
+    facets = [("tag", tag) for tag in set(product.get("tags") or [])]
+    if product.get("category") is not None:
+        facets.append(("category", product["category"]))
+    if product.get("price") is not None:
+        facets.append(("price_band", get_price_band(product["price"])))
+    return facets
+
+
+def facet_delta(
+    old: Optional[Mapping[str, Any]], new: Optional[Mapping[str, Any]]
+) -> FacetDelta:
+    """
+    The facet count changes of a product write.
+
+    Args:
+        old (Optional[Mapping[str, Any]]): The product before the write, or
+            None for a creation.
+        new (Optional[Mapping[str, Any]]): The product after the write, or
+            None for a deletion.
+
+    Returns:
+        FacetDelta: The non-zero count changes.
+    """
+    delta: Counter = Counter()
+    delta.subtract(product_facets(old))
+    delta.update(product_facets(new))
+    return {key: count for key, count in delta.items() if count}
+
+
+def merge_facet_deltas(*deltas: FacetDelta) -> FacetDelta:
+    """Add up the facet deltas of several writes."""
+    total: Counter = Counter()
+    for delta in deltas:
+        total.update(delta)
+    return {key: count for key, count in total.items() if count}
+
+
+async def apply_facet_delta(redis: Redis, delta: FacetDelta) -> None:
+    """
+    Apply facet count changes in a single pipelined round trip.
+
+    Args:
+        redis (Redis): The Redis client.
+        delta (FacetDelta): The count changes.
+    """
+    if not delta:
+        return
+    async with redis.pipeline(transaction=False) as pipe:
+        for (facet, value), count in delta.items():
+            pipe.hincrby(get_facet_key(facet), value, count)
+        await pipe.execute()
+
+
+async def set_facets(redis: Redis, counts: Dict[str, Dict[str, int]]) -> None:
+    """
+    Replace every facet count at once, in a MULTI/EXEC transaction.
+
+    Args:
+        redis (Redis): The Redis client.
+        counts (Dict[str, Dict[str, int]]): The product count of each value,
+            by facet.
+    """
+    async with redis.pipeline(transaction=True) as pipe:
+        for facet in FACETS:
+            pipe.delete(get_facet_key(facet))
+            if counts.get(facet):
+                pipe.hset(get_facet_key(facet), mapping=counts[facet])
+        await pipe.execute()
+
+
+async def get_facets(redis: Redis) -> Dict[str, Dict[str, int]]:
+    """
+    Get the product count of each value of every facet in one round trip.
+    Values no product has any more are left out.
+
+    Args:
+        redis (Redis): The Redis client.
+
+    Returns:
+        Dict[str, Dict[str, int]]: The counts by facet. Categories and tags
+            come by decreasing count, price bands in price order.
+    """
+    async with redis.pipeline(transaction=False) as pipe:
+        for facet in FACETS:
+            pipe.hgetall(get_facet_key(facet))
+        hashes = await pipe.execute()
+
+    facets = {}
+    for facet, values in zip(FACETS, hashes):
+        counts = {value: int(count) for value, count in values.items()}
+        counts = {value: count for value, count in counts.items() if count > 0}
+        if facet == "price_band":
+            facets[facet] = {
+                band: counts[band] for _, band in price_bands() if band in counts
+            }
+        else:
+            facets[facet] = dict(
+                sorted(counts.items(), key=lambda item: (-item[1], item[0]))
+            )
+    return facets
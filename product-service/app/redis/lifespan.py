@@ -1,8 +1,25 @@
+import asyncio
+from contextlib import suppress
 from loguru import logger
 from fastapi import FastAPI
 from redis.asyncio import Redis
 
 from app.core.config import settings
+from app.core.instrumentation import InstrumentedRedis
+from app.redis.cache import listen_for_invalidations
+
+
+def connect_redis() -> Redis:
+    """
+    Creates the Redis client.
+
+    Returns:
+        Redis: The Redis client.
+    """
+    return InstrumentedRedis.from_url(
+        str(settings.redis_url),
+        decode_responses=True,
+    )
 
 
 async def init_redis(app: FastAPI) -> None:
@@ -12,14 +29,29 @@ async def init_redis(app: FastAPI) -> None:
     Args:
         app (FastAPI): fastAPI application.
     """
-    redis = Redis.from_url(
-        str(settings.redis_url),
-        decode_responses=True,
-    )
+    redis = connect_redis()
+    try:
+        await redis.ping()
+    except BaseException:
+        await redis.close()
+        raise
     app.state.redis = redis
+    app.state.cache_invalidation_listener = asyncio.create_task(
+        listen_for_invalidations(redis)
+    )
     logger.info("Connected to Redis.")
 
 
+async def check_redis(app: FastAPI) -> None:
+    """
+    Ping Redis.
+
+    Args:
+        app (FastAPI): fastAPI application.
+    """
+    await app.state.redis.ping()
+
+
 async def close_redis(app: FastAPI) -> None:
     """
     Closes Redis client.
@@ -27,5 +59,8 @@ async def close_redis(app: FastAPI) -> None:
     Args:
         app (FastAPI): fastAPI application.
     """
+    app.state.cache_invalidation_listener.cancel()
+    with suppress(asyncio.CancelledError):
+        await app.state.cache_invalidation_listener
     await app.state.redis.close()
     logger.info("Closed Redis connection.")
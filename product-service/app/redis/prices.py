@@ -0,0 +1,148 @@
+import asyncio
+import json
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set
+
+from loguru import logger
+from redis.asyncio import Redis
+
+from app.core.config import settings
+from app.core.price_table import price_table
+
+
+async def publish_price_changes(
+    redis: Redis, prices: Dict[str, Optional[float]]
+) -> None:
+    """
+    Announce new product prices to every worker.
+
+    Args:
+        redis (Redis): The Redis client.
+        prices (Dict[str, Optional[float]]): The new price by product ID;
+            None for a deleted product.
+    """
+    if not prices:
+        return
+    await redis.publish(
+        settings.REDIS_PRICE_CHANNEL,
+        json.dumps({str(product_id): price for product_id, price in prices.items()}),
+    )
+
+
+class PriceWatch:
+    """
+    The price updates pending for one subscriber.
+
+    Updates are coalesced per product: a slow subscriber only ever receives
+    the latest price of each product, so its backlog is bounded by the
+    number of products it watches.
+    """
+
+    def __init__(self, watchers: "PriceWatchers"):
+        self._watchers = watchers
+        self.product_ids: Set[str] = set()
+        self._pending: Dict[str, Optional[float]] = {}
+        self._ready = asyncio.Event()
+
+    def subscribe(self, product_ids: Iterable[str]) -> List[str]:
+        """Watch more products, returning the ones that were not watched yet."""
+        added = [
+            pid for pid in dict.fromkeys(product_ids) if pid not in self.product_ids
+        ]
+        self.product_ids.update(added)
+        self._watchers._add(self, added)
+        return added
+
+    def unsubscribe(self, product_ids: Iterable[str]) -> None:
+        """Stop watching products and drop their pending updates."""
+        removed = [pid for pid in product_ids if pid in self.product_ids]
+        self.product_ids.difference_update(removed)
+        for product_id in removed:
+            self._pending.pop(product_id, None)
+        self._watchers._remove(self, removed)
+
+    def push(self, product_id: str, price: Optional[float]) -> None:
+        """Queue a price update, replacing any pending one for the product."""
+        self._pending[product_id] = price
+        self._ready.set()
+
+    async def next(self) -> Dict[str, Optional[float]]:
+        """Wait for and return every pending update."""
+        while not self._pending:
+            self._ready.clear()
+            await self._ready.wait()
+        pending, self._pending = self._pending, {}
+        return pending
+
+    def close(self) -> None:
+        """Stop watching everything."""
+        self.unsubscribe(list(self.product_ids))
+
+
+class PriceWatchers:
+    """In-process registry of price subscribers, indexed by product ID."""
+
+    def __init__(self):
+        self._by_product: Dict[str, Set[PriceWatch]] = defaultdict(set)
+
+    def watch(self) -> PriceWatch:
+        """Create a new, empty subscription."""
+        return PriceWatch(self)
+
+    def _add(self, watch: PriceWatch, product_ids: List[str]) -> None:
+        for product_id in product_ids:
+            self._by_product[product_id].add(watch)
+
+    def _remove(self, watch: PriceWatch, product_ids: List[str]) -> None:
+        for product_id in product_ids:
+            watches = self._by_product.get(product_id)
+            if watches is None:
+                continue
+            watches.discard(watch)
+            if not watches:
+                del self._by_product[product_id]
+
+    def dispatch(self, prices: Dict[str, Optional[float]]) -> None:
+        """Hand price changes to the subscribers watching those products."""
+        for product_id, price in prices.items():
+            for watch in self._by_product.get(product_id, ()):
+                watch.push(product_id, price)
+
+
+price_watchers = PriceWatchers()
+
+
+async def listen_for_price_changes(redis: Redis) -> None:
+    """
+    Subscribe to the price channel and dispatch every change to the
+    in-memory price table and the local price subscribers. Reconnects with
+    backoff.
+
+    The price table is (re)loaded right after each subscription, while
+    incoming changes queue up on the connection: changes made during the
+    scan are applied after it, so none are lost.
+
+    Args:
+        redis (Redis): The Redis client.
+    """
+    backoff = 1
+    while True:
+        pubsub = redis.pubsub(ignore_subscribe_messages=True)
+        try:
+            await pubsub.subscribe(settings.REDIS_PRICE_CHANNEL)
+            if settings.PRICE_TABLE_ENABLED:
+                await price_table.load()
+            backoff = 1
+            async for message in pubsub.listen():
+                prices = json.loads(message["data"])
+                if settings.PRICE_TABLE_ENABLED:
+                    price_table.apply(prices)
+                price_watchers.dispatch(prices)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"Price change listener failed, retrying: {e}")
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, 30)
+        finally:
+            await pubsub.aclose()
@@ -0,0 +1,173 @@
+import asyncio
+import math
+import random
+import time
+from typing import Awaitable, Callable, Dict, Optional, Set
+
+from loguru import logger
+from prometheus_client import Counter
+from redis.asyncio import Redis
+
+from app.core.config import settings
+from app.redis.cache import (
+    CachedProduct,
+    get_product_cache_key,
+    get_product_cache_entry,
+    set_product_cache,
+)
+
+ProductLoader = Callable[[str], Awaitable[Optional[str]]]
+
+PRODUCT_CACHE_LOADS = Counter(
+    "product_cache_loads_total",
+    "Product cache recomputations by reason.",
+    ["reason"],
+)
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls for the same key into a single in-flight call.
+
+    The first caller starts the work; everyone arriving while it runs awaits
+    the same result. Waiters are shielded, so a cancelled request does not
+    cancel the shared call.
+    """
+
+    def __init__(self):
+        self._calls: Dict[str, asyncio.Task] = {}
+
+    async def do(self, key: str, fn: Callable[[], Awaitable]):
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda _: self._calls.pop(key, None))
+        return await asyncio.shield(task)
+
+
+_product_loads = SingleFlight()
+_refresh_tasks: Set[asyncio.Task] = set()
+
+# Exponentially weighted average of how long a product load takes, used as
+# the recompute cost ("delta") in the XFetch early expiration check.
+_load_duration = 0.05
+
+
+def _should_refresh_early(ttl: Optional[float]) -> bool:
+    """
+    Decide whether to recompute a cached product before it expires, following
+    the XFetch algorithm (Vattani et al., "Optimal Probabilistic Cache
+    Stampede Prevention"). The closer the key is to expiring, and the more
+    expensive it is to load, the more likely a refresh becomes.
+    """
+    if ttl is None:
+        return False
+    beta = settings.REDIS_CACHE_XFETCH_BETA
+    return -_load_duration * beta * math.log(1.0 - random.random()) >= ttl
+
+
+def _refresh_lock(redis: Redis, product_id: str):
+    """Short Redis lock letting a single worker recompute a product at a time."""
+    return redis.lock(
+        f"{get_product_cache_key(product_id)}:lock",
+        timeout=settings.REDIS_CACHE_LOCK_TIMEOUT,
+        blocking=False,
+        thread_local=False,
+        raise_on_release_error=False,
+    )
+
+
+async def _load_and_cache(
+    redis: Redis, product_id: str, loader: ProductLoader
+) -> Optional[CachedProduct]:
+    """Run the loader, time it, and store its result in the cache."""
+    global _load_duration
+
+    started = time.perf_counter()
+    product_data = await loader(product_id)
+    _load_duration = 0.8 * _load_duration + 0.2 * (time.perf_counter() - started)
+
+    if not product_data:
+        return None
+    await set_product_cache(redis, product_id, product_data)
+    return CachedProduct.from_data(product_data)
+
+
+async def _refresh(redis: Redis, product_id: str, loader: ProductLoader) -> None:
+    """Recompute a product that is about to expire, if no one else is."""
+    lock = _refresh_lock(redis, product_id)
+    # Runs as a fire-and-forget task: log every failure, including Redis
+    # errors taking or releasing the lock, instead of letting it escape.
+    try:
+        if not await lock.acquire():
+            return
+        try:
+            PRODUCT_CACHE_LOADS.labels(reason="early").inc()
+            await _load_and_cache(redis, product_id, loader)
+        finally:
+            await lock.release()
+    except Exception as e:
+        logger.warning(f"Early refresh of product {product_id} failed: {e}")
+
+
+async def _load_on_miss(
+    redis: Redis, product_id: str, loader: ProductLoader
+) -> Optional[CachedProduct]:
+    """
+    Load a product missing from the cache. If another worker holds the lock
+    it is already loading the product, so poll the cache for its result for
+    up to `REDIS_CACHE_LOCK_WAIT` seconds before loading it ourselves.
+    """
+    lock = _refresh_lock(redis, product_id)
+    if await lock.acquire():
+        try:
+            PRODUCT_CACHE_LOADS.labels(reason="miss").inc()
+            return await _load_and_cache(redis, product_id, loader)
+        finally:
+            await lock.release()
+
+    deadline = time.monotonic() + settings.REDIS_CACHE_LOCK_WAIT
+    while time.monotonic() < deadline:
+        await asyncio.sleep(0.05)
+        cached, _ = await get_product_cache_entry(redis, product_id)
+        if cached:
+            return cached
+
+    PRODUCT_CACHE_LOADS.labels(reason="lock_timeout").inc()
+    return await _load_and_cache(redis, product_id, loader)
+
+
+async def get_or_load_product_cache(
+    redis: Redis, product_id: str, loader: ProductLoader
+) -> Optional[CachedProduct]:
+    """
+    Get a product from the cache, loading it on a miss with stampede
+    protection.
+
+    Within a worker, concurrent misses for the same product share one load.
+    Across workers, a short Redis lock elects a single loader, and hot keys
+    are refreshed in the background shortly before they expire (XFetch), so
+    readers keep being served from the cache.
+
+    Args:
+        redis (Redis): The Redis client.
+        product_id (str): The ID of the product.
+        loader (ProductLoader): Coroutine returning the serialized product,
+            or None if it does not exist.
+
+    Returns:
+        Optional[CachedProduct]: The serialized product and its ETag, or None
+            if it does not exist.
+    """
+    cached, ttl = await get_product_cache_entry(redis, product_id)
+    if cached:
+        if _should_refresh_early(ttl):
+            task = asyncio.create_task(_refresh(redis, product_id, loader))
+            _refresh_tasks.add(task)
+            task.add_done_callback(_refresh_tasks.discard)
+        return cached
+
+    return await _product_loads.do(
+        product_id, lambda: _load_on_miss(redis, product_id, loader)
+    )
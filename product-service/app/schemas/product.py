@@ -1,4 +1,5 @@
-from typing import Optional, List
+from datetime import datetime
+from typing import Annotated, Dict, Literal, Optional, List, Union
 from pydantic import BaseModel, Field
 from beanie import PydanticObjectId
 
@@ -64,12 +65,118 @@ class ProductRead(BaseModel):
     images: List[str] = Field(
         default_factory=list, description="List of image URLs for the product"
     )
+    updated_at: Optional[datetime] = Field(None, description="Last update timestamp")
 
     class Config:
         json_encoders = {PydanticObjectId: str}
         from_attributes = True
 
 
+class ProductBatchRequest(BaseModel):
+    """Schema for requesting several products at once"""
+
+    ids: List[str] = Field(
+        ..., description="IDs of the products to retrieve", min_length=1
+    )
+
+
+class ProductBatchResponse(BaseModel):
+    """Schema for the response of a batch product lookup"""
+
+    products: List[ProductRead] = Field(
+        default_factory=list,
+        description="Products found, in the order they were requested",
+    )
+    missing: List[str] = Field(
+        default_factory=list, description="Requested IDs that were not found"
+    )
+
+
+class ProductBulkCreate(BaseModel):
+    """Bulk operation creating a product"""
+
+    op: Literal["create"] = "create"
+    data: ProductCreate = Field(..., description="The product to create")
+
+
+class ProductBulkUpdate(BaseModel):
+    """Bulk operation updating a product"""
+
+    op: Literal["update"] = "update"
+    id: str = Field(..., description="ID of the product to update")
+    data: ProductUpdate = Field(..., description="The fields to update")
+
+
+class ProductBulkDelete(BaseModel):
+    """Bulk operation deleting a product"""
+
+    op: Literal["delete"] = "delete"
+    id: str = Field(..., description="ID of the product to delete")
+
+
+ProductBulkOperation = Annotated[
+    Union[ProductBulkCreate, ProductBulkUpdate, ProductBulkDelete],
+    Field(discriminator="op"),
+]
+
+
+class ProductBulkRequest(BaseModel):
+    """Schema for a batch of product writes"""
+
+    operations: List[ProductBulkOperation] = Field(
+        ..., description="Operations to apply", min_length=1
+    )
+
+
+class ProductBulkResult(BaseModel):
+    """Outcome of a single bulk operation"""
+
+    index: int = Field(..., description="Position of the operation in the request")
+    op: Literal["create", "update", "delete"] = Field(
+        ..., description="The operation type"
+    )
+    id: Optional[str] = Field(None, description="ID of the affected product")
+    status: Literal["created", "updated", "deleted", "not_found", "error"] = Field(
+        ..., description="Outcome of the operation"
+    )
+    error: Optional[str] = Field(None, description="Error message, if any")
+
+
+class ProductBulkResponse(BaseModel):
+    """Schema for the response of a bulk write"""
+
+    results: List[ProductBulkResult] = Field(
+        default_factory=list, description="One result per operation, in order"
+    )
+
+
+class ProductImportReport(BaseModel):
+    """Summary of a catalog import"""
+
+    rows: int = Field(0, description="Number of rows read")
+    inserted: int = Field(0, description="Number of products inserted")
+    rejected: int = Field(0, description="Number of rows rejected")
+    seconds: float = Field(0.0, description="Duration of the import in seconds")
+    rows_per_second: float = Field(0.0, description="Import throughput")
+    rejects_file: Optional[str] = Field(
+        None, description="Where the rejected rows were written"
+    )
+
+
+class ProductFacets(BaseModel):
+    """Schema for the product counts of the category page filters"""
+
+    category: Dict[str, int] = Field(
+        default_factory=dict, description="Number of products by category"
+    )
+    tag: Dict[str, int] = Field(
+        default_factory=dict, description="Number of products by tag"
+    )
+    price_band: Dict[str, int] = Field(
+        default_factory=dict, description="Number of products by price band"
+    )
+
+
 class ProductDelete(BaseModel):
     """Schema for deleting a product"""
 
@@ -88,6 +195,17 @@ class ProductList(BaseModel):
     skip: int = Field(0, description="Number of products to skip for pagination")
 
 
+class ProductPage(BaseModel):
+    """Schema for a page of products fetched with cursor pagination"""
+
+    products: List[ProductRead] = Field(
+        default_factory=list, description="List of products"
+    )
+    next_cursor: Optional[str] = Field(
+        None, description="Cursor for the next page, or null on the last page"
+    )
+
+
 class ProductListResponse(BaseModel):
     """Schema for the response of a product list"""
 
@@ -100,3 +218,19 @@ class ProductListResponse(BaseModel):
     class Config:
         json_encoders = {PydanticObjectId: str}
         from_attributes = True
+
+
+def dump_product_json(product) -> str:
+    """
+    Serialize a product document exactly as the API returns it.
+
+    This is the payload stored in the product cache, so cache hits can be
+    written to the client as-is.
+
+    Args:
+        product (Product): The product document.
+
+    Returns:
+        str: The product as `ProductRead` JSON.
+    """
+    return ProductRead.model_validate(product).model_dump_json()
@@ -0,0 +1,72 @@
+from datetime import datetime
+from typing import List, Optional
+from pydantic import BaseModel, Field
+from beanie import PydanticObjectId
+
+from app.core.config import settings
+from app.models.reservation import ReservationStatus
+
+
+class ReservationCreate(BaseModel):
+    """Schema for reserving units of a single product"""
+
+    quantity: int = Field(..., description="Number of units to reserve", gt=0)
+    ttl_seconds: Optional[int] = Field(
+        None,
+        description="Seconds before the units are released automatically",
+        gt=0,
+        le=settings.RESERVATION_MAX_TTL,
+    )
+
+
+class ReservationItem(BaseModel):
+    """One line of a batch reservation"""
+
+    product_id: str = Field(..., description="ID of the product to reserve")
+    quantity: int = Field(..., description="Number of units to reserve", gt=0)
+
+
+class ReservationBatchCreate(BaseModel):
+    """Schema for reserving several products at once, all or nothing"""
+
+    items: List[ReservationItem] = Field(
+        ..., description="Products and quantities to reserve", min_length=1
+    )
+    ttl_seconds: Optional[int] = Field(
+        None,
+        description="Seconds before the units are released automatically",
+        gt=0,
+        le=settings.RESERVATION_MAX_TTL,
+    )
+
+
+class ReservationRelease(BaseModel):
+    """Schema for releasing a single reservation"""
+
+    reservation_id: str = Field(..., description="ID of the reservation to release")
+
+
+class ReservationBatchRelease(BaseModel):
+    """Schema for releasing or committing several reservations"""
+
+    reservation_ids: List[str] = Field(
+        ..., description="IDs of the reservations", min_length=1
+    )
+
+
+class ReservationRead(BaseModel):
+    """Schema for reading/returning a reservation"""
+
+    id: PydanticObjectId = Field(
+        ..., description="Unique identifier of the reservation"
+    )
+    product_id: PydanticObjectId = Field(..., description="The reserved product")
+    quantity: int = Field(..., description="Number of units held")
+    status: ReservationStatus = Field(..., description="Reservation state")
+    expires_at: datetime = Field(
+        ..., description="When the held units go back to the product"
+    )
+
+    class Config:
+        json_encoders = {PydanticObjectId: str}
+        from_attributes = True
@@ -33,6 +33,34 @@ class Settings(BaseSettings):
 
     # Logging settings
     LOG_LEVEL: LogLevel = LogLevel.INFO
+    # JSON lines instead of text
+    LOG_JSON: bool = False
+    # Format and write records from a background thread, dropping records
+    # while LOG_QUEUE_SIZE of them are waiting
+    LOG_ENQUEUE: bool = True
+    LOG_QUEUE_SIZE: int = 10000
+    # Debug and info records let through per second and call site, with
+    # bursts of LOG_RATE_BURST (0 disables the limit)
+    LOG_RATE_LIMIT: float = 50.0
+    LOG_RATE_BURST: int = 100
+
+    # Tracing settings (TRACING_EXPORTER is none, console, file or otlp)
+    TRACING_EXPORTER: str = "none"
+    TRACING_SERVICE_NAME: str = "search-service"
+    TRACING_SAMPLE_RATIO: float = 1.0
+    TRACING_FILE_PATH: str = "/tmp/search-service-traces.jsonl"
+    TRACING_OTLP_ENDPOINT: str = "http://localhost:4318/v1/traces"
+
+    # Startup settings: each phase gets STARTUP_PHASE_TIMEOUT seconds per
+    # attempt and STARTUP_RETRIES more attempts, waiting STARTUP_RETRY_BACKOFF
+    # seconds before the first retry and twice as long before each next one,
+    # up to STARTUP_RETRY_BACKOFF_MAX
+    STARTUP_PHASE_TIMEOUT: float = 30.0
+    STARTUP_RETRIES: int = 5
+    STARTUP_RETRY_BACKOFF: float = 0.5
+    STARTUP_RETRY_BACKOFF_MAX: float = 10.0
+    # Seconds each /readyz dependency check may take
+    READINESS_TIMEOUT: float = 2.0
 
     # Elasticsearch settings
     ELASTICSEARCH_HOST: str = "http://localhost:9200"
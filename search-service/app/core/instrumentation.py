@@ -0,0 +1,39 @@
+"""
+Latency metrics for every hop a request makes past the HTTP layer.
+
+The metric names and the `observe` helper are the same in every service,
+so one dashboard breaks down the p99 of any of them; each service only
+carries the integrations for the clients it uses.
+"""
+
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+from prometheus_client import Histogram
+
+RABBITMQ_CONSUME_DURATION = Histogram(
+    "rabbitmq_consume_duration_seconds",
+    "Time to handle a consumed message, up to its ack, by operation and result.",
+    ["operation", "result"],
+)
+ELASTICSEARCH_REQUEST_DURATION = Histogram(
+    "elasticsearch_request_duration_seconds",
+    "Elasticsearch request latency by operation and result.",
+    ["operation", "result"],
+)
+
+
+@contextmanager
+def observe(histogram: Histogram, **labels: str) -> Iterator[None]:
+    """
+    Time the block into `histogram`, labelled with `labels` plus a `result`
+    of `ok` or `error`.
+    """
+    started = time.perf_counter()
+    result = "error"
+    try:
+        yield
+        result = "ok"
+    finally:
+        histogram.labels(**labels, result=result).observe(time.perf_counter() - started)
@@ -1,11 +1,26 @@
+import atexit
+import json
 import logging
 import sys
-from typing import Any, Union
+import threading
+import time
+import traceback
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Optional, TextIO, Tuple, Union
 
 from loguru import logger
+from prometheus_client import Counter
 
 from app.core.config import settings
 
+DROPPED_LOG_RECORDS = Counter(
+    "log_records_dropped_total",
+    "Log records dropped by the rate limit or a full queue.",
+    ["reason"],
+)
+
+WARNING_LEVEL = logger.level("WARNING").no
+
 
 class InterceptHandler(logging.Handler):
     """
@@ -41,11 +56,156 @@ class InterceptHandler(logging.Handler):
         )
 
 
+class RateLimitFilter:
+    """
+    Loguru filter letting through at most `rate` debug and info records per
+    second from each call site, with bursts of up to `burst` records.
+    Warnings and errors are never dropped.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self._rate = rate
+        self._burst = burst
+        # Call site to [tokens left, time of the last refill].
+        self._buckets: Dict[Tuple[str, int], list] = {}
+
+    def __call__(self, record: Dict[str, Any]) -> bool:
+        if self._rate <= 0 or record["level"].no >= WARNING_LEVEL:
+            return True
+
+        site = (record["name"], record["line"])
+        now = time.monotonic()
+        bucket = self._buckets.get(site)
+        if bucket is None:
+            self._buckets[site] = [self._burst - 1, now]
+            return True
+
+        tokens = min(self._burst, bucket[0] + (now - bucket[1]) * self._rate)
+        bucket[1] = now
+        if tokens < 1:
+            bucket[0] = tokens
+            DROPPED_LOG_RECORDS.labels(reason="rate_limited").inc()
+            return False
+        bucket[0] = tokens - 1
+        return True
+
+
+def _exception_text(record: Dict[str, Any]) -> str:
+    exception = record["exception"]
+    if exception is None:
+        return ""
+    return "".join(
+        traceback.format_exception(exception.type, exception.value, exception.traceback)
+    )
+
+
+def format_text(record: Dict[str, Any]) -> str:
+    """Format a record like the default loguru format, without colors."""
+    text = (
+        f"{record['time']:%Y-%m-%d %H:%M:%S}.{record['time'].microsecond // 1000:03d}"
+        f" | {record['level'].name: <8} | {record['name']}:{record['function']}:"
+        f"{record['line']} - {record['message']}\n"
+    )
+    return text + _exception_text(record)
+
+
+def format_json(record: Dict[str, Any]) -> str:
+    """Format a record as a JSON object on a single line."""
+    data = {
+        "time": record["time"].isoformat(),
+        "level": record["level"].name,
+        "logger": record["name"],
+        "function": record["function"],
+        "line": record["line"],
+        "message": record["message"],
+        "process": record["process"].id,
+        "thread": record["thread"].name,
+    }
+    if record["extra"]:
+        data["extra"] = record["extra"]
+    if record["exception"] is not None:
+        data["exception"] = _exception_text(record)
+    return json.dumps(data, default=str) + "\n"
+
+
+class LogSink:
+    """
+    Loguru sink formatting and writing records to a stream.
+
+    With `enqueue`, the caller only appends the record to a bounded buffer,
+    without taking any lock, and a background thread formats and writes the
+    buffered records in batches every `interval` seconds. While `max_size`
+    records are waiting, new ones are dropped rather than blocking the
+    caller on a slow stream.
+    """
+
+    def __init__(
+        self,
+        stream: TextIO,
+        formatter: Callable[[Dict[str, Any]], str],
+        enqueue: bool,
+        max_size: int,
+        interval: float = 0.05,
+    ):
+        self._stream = stream
+        self._formatter = formatter
+        self._max_size = max_size
+        self._interval = interval
+        self._buffer: Optional[Deque[Dict[str, Any]]] = None
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        if enqueue:
+            self._buffer = deque()
+            self._thread = threading.Thread(
+                target=self._run, name="log-writer", daemon=True
+            )
+            self._thread.start()
+
+    def write(self, message) -> None:
+        """Receive a message from loguru."""
+        if self._buffer is None:
+            self._stream.write(self._formatter(message.record))
+            self._stream.flush()
+        elif len(self._buffer) < self._max_size:
+            self._buffer.append(message.record)
+        else:
+            DROPPED_LOG_RECORDS.labels(reason="queue_full").inc()
+
+    def _flush(self) -> None:
+        lines = []
+        while self._buffer:
+            lines.append(self._formatter(self._buffer.popleft()))
+        if not lines:
+            return
+        try:
+            self._stream.write("".join(lines))
+            self._stream.flush()
+        except Exception:
+            DROPPED_LOG_RECORDS.labels(reason="write_failed").inc(len(lines))
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self._interval):
+            self._flush()
+        self._flush()
+
+    def close(self) -> None:
+        """Write the records still buffered and stop the writer thread."""
+        if self._thread is not None and self._thread.is_alive():
+            self._stopped.set()
+            self._thread.join(timeout=5)
+
+
+_sink: Optional[LogSink] = None
+
+
 def configure_logging() -> None:
     """Configures logging."""
+    global _sink
+
     intercept_handler = InterceptHandler()
 
-    logging.basicConfig(handlers=[intercept_handler], level=logging.NOTSET)
+    # Drop records below the level before the handler looks for their caller.
+    logging.basicConfig(handlers=[intercept_handler], level=settings.LOG_LEVEL.value)
 
     for name in logging.root.manager.loggerDict.keys():
         logging.getLogger(name).handlers = []
@@ -53,8 +213,31 @@ def configure_logging() -> None:
 
     # set logs output, level and format
     logger.remove()
-    logger.add(
+    if _sink is not None:
+        _sink.close()
+        _sink = None
+
+    rate_limit = RateLimitFilter(settings.LOG_RATE_LIMIT, settings.LOG_RATE_BURST)
+    if not settings.LOG_ENQUEUE and not settings.LOG_JSON:
+        logger.add(
+            sys.stderr,
+            colorize=True,
+            level=settings.LOG_LEVEL.value,
+            filter=rate_limit,
+        )
+        return
+
+    _sink = LogSink(
         sys.stderr,
-        colorize=True,
+        format_json if settings.LOG_JSON else format_text,
+        enqueue=settings.LOG_ENQUEUE,
+        max_size=settings.LOG_QUEUE_SIZE,
+    )
+    atexit.register(_sink.close)
+    logger.add(
+        _sink.write,
+        # The sink formats the records itself, off the caller's thread.
+        format=lambda record: "",
         level=settings.LOG_LEVEL.value,
+        filter=rate_limit,
     )
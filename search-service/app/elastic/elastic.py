@@ -3,6 +3,7 @@ from elasticsearch import AsyncElasticsearch
 from loguru import logger
 
 from app.core.config import settings
+from app.core.instrumentation import ELASTICSEARCH_REQUEST_DURATION, observe
 
 
 class ElasticClient:
@@ -54,7 +55,8 @@ class ElasticClient:
             raise ValueError("Elasticsearch client is not initialized.")
 
         try:
-            resp = await self.client.search(index=index, body=body)
+            with observe(ELASTICSEARCH_REQUEST_DURATION, operation="search"):
+                resp = await self.client.search(index=index, body=body)
             return resp
         except Exception as e:
             logger.error(f"Failed to perform search: {e}")
@@ -75,8 +77,9 @@ class ElasticClient:
             raise ValueError("Elasticsearch client is not initialized.")
 
         try:
-            resp = await self.client.index(index=index, id=id, body=document)
-            logger.info(f"Document indexed with ID: {id}")
+            with observe(ELASTICSEARCH_REQUEST_DURATION, operation="index"):
+                resp = await self.client.index(index=index, id=id, body=document)
+            logger.debug(f"Document indexed with ID: {id}")
             return resp
         except Exception as e:
             logger.error(f"Failed to index document: {e}")
@@ -97,8 +100,9 @@ class ElasticClient:
             raise ValueError("Elasticsearch client is not initialized.")
 
         try:
-            resp = await self.client.delete(index=index, id=id)
-            logger.info(f"Document deleted with ID: {id}")
+            with observe(ELASTICSEARCH_REQUEST_DURATION, operation="delete"):
+                resp = await self.client.delete(index=index, id=id)
+            logger.debug(f"Document deleted with ID: {id}")
             return resp
         except Exception as e:
             logger.error(f"Failed to delete document with ID {id}: {e}")
@@ -120,8 +124,11 @@ class ElasticClient:
             raise ValueError("Elasticsearch client is not initialized.")
 
         try:
-            resp = await self.client.update(index=index, id=id, body={"doc": document})
-            logger.info(f"Document updated with ID: {id}")
+            with observe(ELASTICSEARCH_REQUEST_DURATION, operation="update"):
+                resp = await self.client.update(
+                    index=index, id=id, body={"doc": document}
+                )
+            logger.debug(f"Document updated with ID: {id}")
             return resp
         except Exception as e:
             logger.error(f"Failed to update document with ID {id}: {e}")
@@ -11,10 +11,22 @@ async def init_elasticsearch(app: FastAPI):
     """
     es = get_elastic_client()
     app.state.elasticsearch = es
-    await es.connect()
+    try:
+        await es.connect()
+    except BaseException:
+        await es.close()
+        raise
     logger.info("Elasticsearch client initialized and connected.")
 
 
+async def check_elasticsearch(app: FastAPI):
+    """
+    Ping the Elasticsearch cluster.
+    """
+    if not await app.state.elasticsearch.client.ping():
+        raise ConnectionError("Elasticsearch did not answer the ping.")
+
+
 async def close_elasticsearch(app: FastAPI):
     """
     Close the Elasticsearch client.
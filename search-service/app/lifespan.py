@@ -2,8 +2,32 @@ from typing import AsyncGenerator
 from fastapi import FastAPI
 from contextlib import asynccontextmanager
 
-from app.elastic.lifespan import init_elasticsearch, close_elasticsearch
-from app.rabbitmq.lifespan import init_rabbitmq, close_rabbitmq
+from app.core.startup import Phase, close_phases, start_phases
+from app.elastic.lifespan import (
+    check_elasticsearch,
+    close_elasticsearch,
+    init_elasticsearch,
+)
+from app.rabbitmq.lifespan import check_rabbitmq, close_rabbitmq, init_rabbitmq
+
+PHASES = [
+    Phase(
+        "elasticsearch",
+        init_elasticsearch,
+        close_elasticsearch,
+        check=check_elasticsearch,
+    ),
+    # The consumer indexes the product events into Elasticsearch as soon as
+    # it connects. Searches are served without it, so it is not required.
+    Phase(
+        "rabbitmq",
+        init_rabbitmq,
+        close_rabbitmq,
+        depends_on=("elasticsearch",),
+        check=check_rabbitmq,
+        required=False,
+    ),
+]
 
 
 @asynccontextmanager
@@ -19,10 +43,8 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     Returns:
         function that actually performs actions.
     """
-    await init_elasticsearch(app)
-    await init_rabbitmq(app)
+    await start_phases(app, PHASES)
     try:
         yield
     finally:
-        await close_elasticsearch(app)
-        await close_rabbitmq(app)
+        await close_phases(app)
@@ -0,0 +1,162 @@
+import json
+from functools import lru_cache
+from datetime import datetime, timezone
+from typing import Iterable, NamedTuple, Optional
+
+from google.protobuf.message import DecodeError
+
+from app.proto import product_events_pb2
+
+PROTOBUF_CONTENT_TYPE = "application/x-protobuf"
+
+PRODUCT_FIELDS = (
+    "name",
+    "description",
+    "price",
+    "category",
+    "tags",
+    "quantity",
+    "images",
+    "updated_at",
+)
+
+# Routing key suffix to operation; the bare verbs are still accepted.
+OPERATIONS = {
+    "created": "create",
+    "updated": "update",
+    "deleted": "delete",
+    "create": "create",
+    "update": "update",
+    "delete": "delete",
+}
+
+MESSAGE_TYPES = {
+    message.DESCRIPTOR.full_name: message
+    for message in (
+        product_events_pb2.ProductCreated,
+        product_events_pb2.ProductUpdated,
+        product_events_pb2.ProductDeleted,
+    )
+}
+
+
+class ProductChange(NamedTuple):
+    """A decoded product event."""
+
+    op: str
+    product_id: str
+    document: dict
+
+
+@lru_cache(maxsize=4096)
+def _iso_second(seconds: int) -> str:
+    return datetime.fromtimestamp(seconds, timezone.utc).strftime("%Y-%m-%dT%H:%M:%S")
+
+
+def _timestamp(value) -> str:
+    """
+    ISO 8601 form of a protobuf Timestamp, like the JSON events carry.
+    Formatting dominates decoding, and events come in bursts sharing the
+    same second, so the second part is cached.
+    """
+    return f"{_iso_second(value.seconds)}.{value.nanos // 1000:06d}+00:00"
+
+
+def _field(product: product_events_pb2.Product, name: str):
+    if name in ("tags", "images"):
+        return list(getattr(product, name))
+    if not product.HasField(name):
+        return None
+    if name == "updated_at":
+        return _timestamp(product.updated_at)
+    return getattr(product, name)
+
+
+def _product_document(product: product_events_pb2.Product) -> dict:
+    """Turn a protobuf `Product` into a full index document."""
+    has = product.HasField
+    return {
+        "id": product.id,
+        "name": product.name if has("name") else None,
+        "description": product.description if has("description") else None,
+        "price": product.price if has("price") else None,
+        "category": product.category if has("category") else None,
+        "tags": list(product.tags),
+        "quantity": product.quantity if has("quantity") else None,
+        "images": list(product.images),
+        "updated_at": _timestamp(product.updated_at) if has("updated_at") else None,
+    }
+
+
+def _product_delta(product: product_events_pb2.Product, fields: Iterable[str]) -> dict:
+    """
+    Turn the changed fields of a protobuf `Product` into a partial index
+    document. Field names this version does not know are skipped.
+    """
+    document = {"id": product.id}
+    for name in fields:
+        if name in PRODUCT_FIELDS:
+            document[name] = _field(product, name)
+    return document
+
+
+def _decode_protobuf(
+    op: str, message_type: Optional[str], body: bytes
+) -> ProductChange:
+    message_class = MESSAGE_TYPES.get(message_type)
+    if message_class is None:
+        raise ValueError(f"Unsupported product event type: {message_type}")
+    try:
+        event = message_class.FromString(body)
+    except DecodeError as e:
+        raise ValueError(f"Malformed {message_type} event: {e}") from e
+
+    if message_class is product_events_pb2.ProductDeleted:
+        return ProductChange(op, event.id, {})
+    if message_class is product_events_pb2.ProductUpdated:
+        return ProductChange(
+            op, event.product.id, _product_delta(event.product, event.changed)
+        )
+    return ProductChange(op, event.product.id, _product_document(event.product))
+
+
+def decode_event(
+    routing_key: str,
+    content_type: Optional[str],
+    message_type: Optional[str],
+    body: bytes,
+) -> ProductChange:
+    """
+    Decode a product event from its AMQP routing key, properties and body.
+
+    Protobuf events are read according to their message type; anything else
+    is read as JSON, which is what producers without protobuf support send.
+    Either way, creates carry the full product, updates the changed fields
+    only, and deletes the product ID only.
+
+    Args:
+        routing_key (str): The routing key, e.g. `product.created`.
+        content_type (Optional[str]): The `content_type` property.
+        message_type (Optional[str]): The `type` property.
+        body (bytes): The message body.
+
+    Returns:
+        ProductChange: The operation, product ID and index document.
+
+    Raises:
+        ValueError: The event cannot be decoded.
+    """
+    op = OPERATIONS.get(routing_key.split(".")[-1])
+    if op is None:
+        raise ValueError(f"Unknown operation in routing key: {routing_key}")
+
+    if content_type == PROTOBUF_CONTENT_TYPE:
+        return _decode_protobuf(op, message_type, body)
+
+    document = json.loads(body)
+    if not isinstance(document, dict):
+        raise ValueError(
+            f"Malformed JSON product event: expected an object, got "
+            f"{type(document).__name__}"
+        )
+    return ProductChange(op, str(document["id"]), document)
@@ -8,10 +8,21 @@ async def init_rabbitmq(app: FastAPI):
     """Initialize RabbitMQ connection."""
     rabbitmq_client = get_rabbitmq_client()
     app.state.rabbitmq = rabbitmq_client
-    await rabbitmq_client.connect()
+    try:
+        await rabbitmq_client.connect()
+    except BaseException:
+        await rabbitmq_client.close()
+        raise
     logger.info("RabbitMQ client initialized and connected.")
 
 
+async def check_rabbitmq(app: FastAPI):
+    """Check the RabbitMQ connection is open."""
+    connection = app.state.rabbitmq.connection
+    if connection is None or connection.is_closed:
+        raise ConnectionError("RabbitMQ connection is closed.")
+
+
 async def close_rabbitmq(app: FastAPI):
     """Close RabbitMQ connection."""
     if hasattr(app.state, "rabbitmq"):
@@ -1,10 +1,13 @@
-import json
 from loguru import logger
+from opentelemetry.trace import SpanKind
 from functools import lru_cache
 from aio_pika import IncomingMessage, connect_robust, ExchangeType, Message, Queue
 
 from app.core.config import settings
+from app.core.instrumentation import RABBITMQ_CONSUME_DURATION, observe
+from app.core.tracing import message_context, tracer
 from app.elastic.elastic import get_elastic_client
+from app.rabbitmq.events import decode_event
 
 
 class RabbitMQConsumer:
@@ -37,33 +40,57 @@ class RabbitMQConsumer:
             self.queue = None
 
     async def on_message(self, message: IncomingMessage):
-        """Callback for processing incoming messages."""
-        # Ensure the message is processed correctly
+        """
+        Callback for processing incoming messages, in a consumer span
+        continuing the trace of the write that published them.
+        """
+        with tracer.start_as_current_span(
+            f"{message.routing_key} process",
+            context=message_context(message.headers),
+            kind=SpanKind.CONSUMER,
+            attributes={
+                "messaging.system": "rabbitmq",
+                "messaging.operation.type": "process",
+                "messaging.destination.name": self.exchange_name,
+                "messaging.rabbitmq.destination.routing_key": message.routing_key,
+            },
+        ):
+            await self.process_message(message)
+
+    async def process_message(self, message: IncomingMessage):
+        """Update the index from a product event."""
+        try:
+            change = decode_event(
+                message.routing_key,
+                message.content_type,
+                message.type,
+                message.body,
+            )
+        except (ValueError, KeyError) as e:
+            logger.error(f"Dropping undecodable product event: {e}")
+            await message.reject()
+            return
+
         es = get_elastic_client()
-        async with message.process():
-            product = json.loads(message.body.decode())
-            routing_key = message.routing_key
-            op = routing_key.split(".")[-1]
-            if op == "create":
-                resp = await es.index_product(
-                    index=settings.ELASTICSEARCH_INDEX,
-                    id=product["id"],
-                    document=product,
-                )
-            elif op == "update":
-                resp = await es.update_product(
-                    index=settings.ELASTICSEARCH_INDEX,
-                    id=product["id"],
-                    document=product,
-                )
-            elif op == "delete":
-                resp = await es.delete_product(
-                    index=settings.ELASTICSEARCH_INDEX,
-                    id=product["id"],
-                )
-            else:
-                message.reject()
-                logger.error(f"Unknown operation: {op}")
+        with observe(RABBITMQ_CONSUME_DURATION, operation=change.op):
+            async with message.process():
+                if change.op == "create":
+                    resp = await es.index_product(
+                        index=settings.ELASTICSEARCH_INDEX,
+                        id=change.product_id,
+                        document=change.document,
+                    )
+                elif change.op == "update":
+                    resp = await es.update_product(
+                        index=settings.ELASTICSEARCH_INDEX,
+                        id=change.product_id,
+                        document=change.document,
+                    )
+                else:
+                    resp = await es.delete_product(
+                        index=settings.ELASTICSEARCH_INDEX,
+                        id=change.product_id,
+                    )
 
 
 @lru_cache
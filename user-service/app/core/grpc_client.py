@@ -1,8 +1,11 @@
 import grpc
+from fastapi import FastAPI
 from loguru import logger
 from functools import lru_cache
 
 from app.core.config import settings
+from app.core.instrumentation import GrpcClientMetricsInterceptor
+from app.core.tracing import GrpcClientTracingInterceptor
 from app.proto import notification_pb2_grpc, notification_pb2
 
 
@@ -11,7 +14,11 @@ class GrpcClient:
 
     def __init__(self):
         self._channel = grpc.aio.insecure_channel(
-            f"{settings.NOTIFICATION_SERVICE_GRPC_HOST}:{settings.NOTIFICATION_SERVICE_GRPC_PORT}"
+            f"{settings.NOTIFICATION_SERVICE_GRPC_HOST}:{settings.NOTIFICATION_SERVICE_GRPC_PORT}",
+            interceptors=[
+                GrpcClientTracingInterceptor(),
+                GrpcClientMetricsInterceptor(),
+            ],
         )
         self._notification_stub = notification_pb2_grpc.NotificationServiceStub(
             self._channel
@@ -23,7 +30,7 @@ class GrpcClient:
         try:
             response = await self._notification_stub.SendEmail(email_request)
             if response.success:
-                logger.info(f"Email sent successfully to {email_request.to}.")
+                logger.debug(f"Email sent successfully to {email_request.to}.")
             else:
                 logger.error(f"Failed to send email: {response.error}")
             return response
@@ -34,6 +41,10 @@ class GrpcClient:
             logger.error(f"Unexpected error while sending email: {e}")
             return notification_pb2.SendEmailResponse(success=False, error=str(e))
 
+    async def wait_until_ready(self):
+        """Wait until the GRPC channel is connected, connecting if needed."""
+        await self._channel.channel_ready()
+
     async def close(self):
         """Close the GRPC channel."""
         await self._channel.close()
@@ -43,3 +54,33 @@ class GrpcClient:
 def get_grpc_client() -> GrpcClient:
     """Get a singleton instance of the GRPC client."""
     return GrpcClient()
+
+
+async def init_grpc_client(app: FastAPI) -> None:
+    """
+    Create the GRPC client. The channel connects on first use.
+
+    Args:
+        app (FastAPI): FastAPI application instance.
+    """
+    get_grpc_client()
+
+
+async def check_grpc_client(app: FastAPI) -> None:
+    """
+    Wait until the GRPC channel is connected.
+
+    Args:
+        app (FastAPI): FastAPI application instance.
+    """
+    await get_grpc_client().wait_until_ready()
+
+
+async def close_grpc_client(app: FastAPI) -> None:
+    """
+    Close the GRPC channel.
+
+    Args:
+        app (FastAPI): FastAPI application instance.
+    """
+    await get_grpc_client().close()
@@ -0,0 +1,239 @@
+"""
+Dependency-aware startup, shutdown and readiness checks.
+
+Each dependency of the service is a `Phase`: how to set it up, how to tear
+it down, which phases it needs first and how to check it is reachable.
+`start_phases` runs the phases concurrently, each as soon as the phases it
+depends on are up, retrying failed attempts with exponential backoff, and
+`close_phases` tears them down in the reverse order. `check_readiness` runs
+the checks for `/readyz`.
+
+A phase that is not required, or that depends on one, does not fail the
+startup: once its retries are spent, it keeps being retried in the
+background, and the phases depending on it start as soon as it is up.
+"""
+
+import asyncio
+import random
+import time
+from typing import Awaitable, Callable, Dict, List, NamedTuple, Optional, Set, Tuple
+
+from fastapi import FastAPI
+from loguru import logger
+from prometheus_client import Counter, Gauge
+
+from app.core.config import settings
+
+STARTUP_DURATION = Gauge(
+    "startup_duration_seconds",
+    "Time from the start of the lifespan until every phase is up.",
+)
+STARTUP_PHASE_DURATION = Gauge(
+    "startup_phase_duration_seconds",
+    "Time each startup phase took once its dependencies were up, retries included.",
+    ["phase"],
+)
+STARTUP_PHASE_ATTEMPTS = Counter(
+    "startup_phase_attempts_total",
+    "Startup phase attempts by result.",
+    ["phase", "result"],
+)
+
+Hook = Callable[[FastAPI], Awaitable[None]]
+
+
+class Phase(NamedTuple):
+    """
+    A dependency set up at startup.
+
+    `check` raises when the dependency is unreachable. When the phase is
+    not `required`, a failing check is reported by `/readyz` without
+    taking the service out of rotation, and the service starts without it
+    if it cannot be set up in time.
+    """
+
+    name: str
+    init: Hook
+    close: Hook
+    depends_on: Tuple[str, ...] = ()
+    check: Optional[Hook] = None
+    required: bool = True
+
+
+async def _init_with_retries(
+    app: FastAPI, phase: Phase, retries: Optional[int]
+) -> None:
+    """Set up a phase, retrying up to `retries` times, or forever if None."""
+    delay = settings.STARTUP_RETRY_BACKOFF
+    attempt = 1
+    while True:
+        try:
+            await asyncio.wait_for(phase.init(app), settings.STARTUP_PHASE_TIMEOUT)
+        except Exception as e:
+            STARTUP_PHASE_ATTEMPTS.labels(phase=phase.name, result="error").inc()
+            if retries is not None and attempt > retries:
+                raise
+            logger.warning(
+                f"Starting {phase.name} failed (attempt {attempt}): {e!r}. "
+                f"Retrying in {delay:.1f}s."
+            )
+            # Jitter keeps replicas started together from retrying in lockstep.
+            await asyncio.sleep(delay * random.uniform(0.5, 1))
+            delay = min(delay * 2, settings.STARTUP_RETRY_BACKOFF_MAX)
+            attempt += 1
+        else:
+            STARTUP_PHASE_ATTEMPTS.labels(phase=phase.name, result="ok").inc()
+            return
+
+
+async def start_phases(app: FastAPI, phases: List[Phase]) -> None:
+    """
+    Start the phases concurrently, each once the phases it depends on are up.
+
+    If a required phase still fails after its retries, the other phases are
+    cancelled, those already up are closed and the error is raised. A phase
+    that is not required, or depends on one, is left to start in the
+    background instead, and so are the phases depending on it.
+
+    Args:
+        app (FastAPI): FastAPI application instance.
+        phases (List[Phase]): The phases, each listed after its dependencies.
+    """
+    started_at = time.perf_counter()
+    app.state.phases = phases
+    app.state.started_phases = []
+    app.state.startup_tasks = []
+    app.state.ready = False
+
+    optional: Set[str] = set()
+    up: Dict[str, asyncio.Event] = {}
+    for phase in phases:
+        unknown = [name for name in phase.depends_on if name not in up]
+        if unknown:
+            raise ValueError(
+                f"Phase {phase.name} depends on {', '.join(unknown)}, "
+                f"which must be listed before it."
+            )
+        up[phase.name] = asyncio.Event()
+        if not phase.required or optional.intersection(phase.depends_on):
+            optional.add(phase.name)
+
+    # Set once every phase is up or left to the background, or to the error
+    # of a required phase.
+    startup = asyncio.get_running_loop().create_future()
+    settled: Set[str] = set()
+
+    def settle(*names: str) -> None:
+        settled.update(names)
+        if len(settled) == len(phases) and not startup.done():
+            startup.set_result(None)
+
+    def defer(phase: Phase) -> None:
+        """Leave a phase, and every phase depending on it, to the background."""
+        deferred = {phase.name}
+        for other in phases:
+            if deferred.intersection(other.depends_on):
+                deferred.add(other.name)
+        settle(*deferred)
+
+    async def start(phase: Phase) -> None:
+        for name in phase.depends_on:
+            await up[name].wait()
+        phase_started_at = time.perf_counter()
+        try:
+            # Once the startup went on without it, retry for as long as it takes.
+            await _init_with_retries(
+                app,
+                phase,
+                None if phase.name in settled else settings.STARTUP_RETRIES,
+            )
+        except Exception as e:
+            if phase.name not in optional:
+                logger.error(f"Could not start {phase.name}: {e!r}")
+                raise
+            logger.warning(
+                f"Could not start {phase.name}: {e!r}. Starting without it and "
+                f"retrying in the background."
+            )
+            defer(phase)
+            await _init_with_retries(app, phase, None)
+        duration = time.perf_counter() - phase_started_at
+        STARTUP_PHASE_DURATION.labels(phase=phase.name).set(duration)
+        app.state.started_phases.append(phase)
+        up[phase.name].set()
+        logger.info(f"Started {phase.name} in {duration:.2f}s.")
+        settle(phase.name)
+
+    async def run(phase: Phase) -> None:
+        try:
+            await start(phase)
+        except Exception as e:
+            if not startup.done():
+                startup.set_exception(e)
+            raise
+
+    app.state.startup_tasks = [asyncio.create_task(run(phase)) for phase in phases]
+
+    try:
+        await startup
+    except BaseException:
+        await close_phases(app)
+        raise
+
+    duration = time.perf_counter() - started_at
+    STARTUP_DURATION.set(duration)
+    app.state.ready = True
+    logger.info(f"Started in {duration:.2f}s.")
+
+
+async def close_phases(app: FastAPI) -> None:
+    """
+    Stop the phases still starting, then close the started phases, each
+    before the phases it depends on. A phase failing to close is logged and
+    does not keep the others open.
+
+    Args:
+        app (FastAPI): FastAPI application instance.
+    """
+    app.state.ready = False
+    for task in app.state.startup_tasks:
+        task.cancel()
+    await asyncio.gather(*app.state.startup_tasks, return_exceptions=True)
+    while app.state.started_phases:
+        phase = app.state.started_phases.pop()
+        try:
+            await phase.close(app)
+        except Exception:
+            logger.exception(f"Could not close {phase.name}.")
+
+
+async def _check(app: FastAPI, phase: Phase) -> str:
+    try:
+        await asyncio.wait_for(phase.check(app), settings.READINESS_TIMEOUT)
+    except asyncio.TimeoutError:
+        return "timeout"
+    except Exception as e:
+        return f"error: {e}"
+    return "ok"
+
+
+async def check_readiness(app: FastAPI) -> Tuple[bool, Dict[str, str]]:
+    """
+    Check every dependency concurrently.
+
+    Args:
+        app (FastAPI): FastAPI application instance.
+
+    Returns:
+        Tuple[bool, Dict[str, str]]: Whether the service can take traffic,
+            and the result of each check.
+    """
+    phases = [
+        phase for phase in getattr(app.state, "phases", []) if phase.check is not None
+    ]
+    results = await asyncio.gather(*(_check(app, phase) for phase in phases))
+    checks = {phase.name: result for phase, result in zip(phases, results)}
+    ready = getattr(app.state, "ready", False) and all(
+        result == "ok" for phase, result in zip(phases, results) if phase.required
+    )
+    return ready, checks
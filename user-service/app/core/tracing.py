@@ -0,0 +1,184 @@
+"""
+Distributed tracing with OpenTelemetry.
+
+Trace context travels between services as W3C `traceparent` headers, in
+HTTP requests and gRPC metadata. Spans go to the exporter named by
+`TRACING_EXPORTER`; with `none`, spans are not recorded but incoming trace
+context is still passed on.
+"""
+
+import threading
+from typing import Callable, Dict, Optional, Sequence
+
+import grpc
+from opentelemetry import propagate, trace
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import ReadableSpan, TracerProvider
+from opentelemetry.sdk.trace.export import (
+    BatchSpanProcessor,
+    ConsoleSpanExporter,
+    SpanExporter,
+    SpanExportResult,
+)
+from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+from opentelemetry.trace import SpanKind, Status, StatusCode
+
+from app.core.config import settings
+
+tracer = trace.get_tracer("user-service")
+
+
+class FileSpanExporter(SpanExporter):
+    """
+    Writes finished spans to a file, one JSON object per line. Stands in for
+    a collector in local runs and tests.
+    """
+
+    def __init__(self, path: str):
+        self._file = open(path, "a", encoding="utf-8")
+        self._lock = threading.Lock()
+
+    def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
+        lines = "".join(span.to_json(indent=None) + "\n" for span in spans)
+        with self._lock:
+            self._file.write(lines)
+            self._file.flush()
+        return SpanExportResult.SUCCESS
+
+    def shutdown(self) -> None:
+        with self._lock:
+            self._file.close()
+
+
+def _otlp_exporter() -> SpanExporter:
+    from opentelemetry.exporter.otlp.proto.http.trace_exporter import (
+        OTLPSpanExporter,
+    )
+
+    return OTLPSpanExporter(endpoint=settings.TRACING_OTLP_ENDPOINT)
+
+
+SPAN_EXPORTERS: Dict[str, Callable[[], SpanExporter]] = {
+    "console": ConsoleSpanExporter,
+    "file": lambda: FileSpanExporter(settings.TRACING_FILE_PATH),
+    "otlp": _otlp_exporter,
+}
+
+
+def register_span_exporter(name: str, factory: Callable[[], SpanExporter]) -> None:
+    """
+    Make an exporter selectable with `TRACING_EXPORTER=<name>`. Call it
+    before `configure_tracing`.
+
+    Args:
+        name (str): The exporter name.
+        factory (Callable[[], SpanExporter]): Creates the exporter.
+    """
+    SPAN_EXPORTERS[name] = factory
+
+
+def configure_tracing() -> Optional[TracerProvider]:
+    """
+    Install the tracer provider exporting to `TRACING_EXPORTER`, unless it
+    is `none`. Spans still buffered are flushed at exit.
+
+    Returns:
+        Optional[TracerProvider]: The provider, if tracing is enabled.
+    """
+    if settings.TRACING_EXPORTER == "none":
+        return None
+    if settings.TRACING_EXPORTER not in SPAN_EXPORTERS:
+        raise ValueError(f"Unknown span exporter: {settings.TRACING_EXPORTER}")
+
+    provider = TracerProvider(
+        resource=Resource.create({"service.name": settings.TRACING_SERVICE_NAME}),
+        sampler=ParentBased(TraceIdRatioBased(settings.TRACING_SAMPLE_RATIO)),
+    )
+    provider.add_span_processor(
+        BatchSpanProcessor(SPAN_EXPORTERS[settings.TRACING_EXPORTER]())
+    )
+    trace.set_tracer_provider(provider)
+    return provider
+
+
+def trace_headers() -> Dict[str, str]:
+    """The trace context of the current span, as headers to send along."""
+    headers: Dict[str, str] = {}
+    propagate.inject(headers)
+    return headers
+
+
+class TracingMiddleware:
+    """
+    ASGI middleware running each HTTP request in a server span, continuing
+    the trace of the caller when it sent one.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        carrier = {
+            key.decode("latin-1"): value.decode("latin-1")
+            for key, value in scope["headers"]
+        }
+        method = scope["method"]
+        with tracer.start_as_current_span(
+            method,
+            context=propagate.extract(carrier),
+            kind=SpanKind.SERVER,
+            attributes={"http.request.method": method, "url.path": scope["path"]},
+        ) as span:
+
+            async def send_traced(message):
+                if message["type"] == "http.response.start":
+                    status = message["status"]
+                    span.set_attribute("http.response.status_code", status)
+                    if status >= 500:
+                        span.set_status(Status(StatusCode.ERROR))
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_traced)
+            finally:
+                route = scope.get("route")
+                if route is not None:
+                    span.update_name(f"{method} {route.path}")
+                    span.set_attribute("http.route", route.path)
+
+
+class GrpcClientTracingInterceptor(grpc.aio.UnaryUnaryClientInterceptor):
+    """
+    Runs each unary call made on the channel in a client span, and sends its
+    trace context along in the call metadata.
+    """
+
+    async def intercept_unary_unary(self, continuation, client_call_details, request):
+        method = client_call_details.method
+        if isinstance(method, bytes):
+            method = method.decode()
+        service, _, name = method.lstrip("/").rpartition("/")
+        with tracer.start_as_current_span(
+            method.lstrip("/"),
+            kind=SpanKind.CLIENT,
+            attributes={
+                "rpc.system": "grpc",
+                "rpc.service": service,
+                "rpc.method": name,
+            },
+        ) as span:
+            metadata = grpc.aio.Metadata(
+                *(client_call_details.metadata or ()), *trace_headers().items()
+            )
+            call = await continuation(
+                client_call_details._replace(metadata=metadata), request
+            )
+            code = await call.code()
+            span.set_attribute("rpc.grpc.status_code", code.value[0])
+            if code != grpc.StatusCode.OK:
+                span.set_status(Status(StatusCode.ERROR, await call.details()))
+            return call
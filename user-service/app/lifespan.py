@@ -2,8 +2,21 @@ from typing import AsyncGenerator
 from fastapi import FastAPI
 from contextlib import asynccontextmanager
 
-from app.core.database import close_db, init_db
-from app.core.grpc_client import get_grpc_client
+from app.core.database import check_db, close_db, init_db
+from app.core.grpc_client import check_grpc_client, close_grpc_client, init_grpc_client
+from app.core.startup import Phase, close_phases, start_phases
+
+PHASES = [
+    Phase("mongodb", init_db, close_db, check=check_db),
+    # Users can sign up and log in without the notification service, so it is not required.
+    Phase(
+        "notification service",
+        init_grpc_client,
+        close_grpc_client,
+        check=check_grpc_client,
+        required=False,
+    ),
+]
 
 
 @asynccontextmanager
@@ -19,10 +32,8 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     Returns:
         function that actually performs actions.
     """
-    await init_db(app)
-    get_grpc_client()
+    await start_phases(app, PHASES)
     try:
         yield
     finally:
-        await close_db(app)
-        await get_grpc_client().close()
+        await close_phases(app)
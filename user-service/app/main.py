@@ -1,15 +1,18 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, Response, status
 from fastapi.middleware.cors import CORSMiddleware
 from prometheus_fastapi_instrumentator import Instrumentator
 
 from app.core.config import settings
 from app.core.logger import configure_logging
+from app.core.startup import check_readiness
+from app.core.tracing import TracingMiddleware, configure_tracing
 from app.lifespan import lifespan
 from app.api.router import v1_router
 
 
 def get_app() -> FastAPI:
     configure_logging()
+    configure_tracing()
 
     app = FastAPI(
         title=settings.PROJECT_NAME,
@@ -26,6 +29,7 @@ def get_app() -> FastAPI:
         allow_methods=["*"],
         allow_headers=["*"],
     )
+    app.add_middleware(TracingMiddleware)
 
     app.include_router(v1_router, prefix=settings.API_V1_STR)
     return app
@@ -48,3 +52,24 @@ async def health_check():
     Health check endpoint.
     """
     return {"status": "healthy"}
+
+
+@app.get("/livez")
+async def liveness_check():
+    """
+    Liveness probe. Does not check the dependencies, so that their outages
+    do not get the service restarted.
+    """
+    return {"status": "alive"}
+
+
+@app.get("/readyz")
+async def readiness_check(request: Request, response: Response):
+    """
+    Readiness probe. Checks every dependency and answers 503 while a
+    required one is unreachable, and while the service starts or stops.
+    """
+    ready, checks = await check_readiness(request.app)
+    if not ready:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return {"status": "ready" if ready else "unavailable", "checks": checks}